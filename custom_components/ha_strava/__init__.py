@@ -2,6 +2,7 @@
 
 import json
 import logging
+import shutil
 from http import HTTPStatus
 from urllib.parse import urlparse
 
@@ -26,17 +27,47 @@ from homeassistant.helpers.entity_registry import async_get as er_async_get
 from homeassistant.helpers.network import NoURLAvailableError, get_url
 
 from .const import (
+    CONF_ACTIVITY_TYPES_TO_TRACK,
+    CONF_ATTR_KOM_SEGMENTS,
     CONF_ATTR_POLYLINE,
+    CONF_ATTR_PR_SEGMENTS,
+    CONF_ATTRIBUTE_SENSORS_TO_CREATE,
     CONF_CALLBACK_URL,
+    CONF_COMPACT_SENSORS,
+    CONF_CURVES,
+    CONF_DISTANCE_UNIT_OVERRIDE,
+    CONF_FIND_NEAR_LIMIT_DEFAULT,
+    CONF_FIND_NEAR_LIMIT_MAX,
+    CONF_FIND_NEAR_RADIUS_DEFAULT,
+    CONF_FIND_NEAR_RADIUS_MAX,
+    CONF_GEAR_ENABLED,
+    CONF_NUM_GEAR_SENSORS,
+    CONF_NUM_RECENT_ACTIVITIES,
+    CONF_PHOTOS,
+    CONF_SENSOR_DATE,
     CONF_SENSOR_ID,
+    CONF_STREAMS_MAX_POINTS_DEFAULT,
+    CONF_STREAMS_MAX_POINTS_MAX,
     DOMAIN,
+    IMAGE_CACHE_DIR,
+    SERVICE_FIND_ACTIVITIES_NEAR,
+    SERVICE_GET_ACTIVITY_DETAILS,
     SERVICE_GET_ACTIVITY_ROUTE,
+    SERVICE_GET_ACTIVITY_STREAMS,
     SERVICE_UPDATE_ACTIVITY,
+    SPATIAL_POINT_ANY,
+    SPATIAL_POINT_END,
+    SPATIAL_POINT_START,
+    STREAM_TYPES,
+    STREAMS_CACHE_DIR,
     SUPPORTED_ACTIVITY_TYPES,
     WEBHOOK_SUBSCRIPTION_URL,
 )
 from .coordinator import StravaDataUpdateCoordinator
+from .entity_sync import async_sync_entities
+from .library import async_remove_library, async_setup_library
 from .polyline import decode_polyline
+from .streams import downsample
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -66,7 +97,33 @@ def _peer_entry_for_client_id(
     return None
 
 
-PLATFORMS = ["sensor", "camera", "button"]
+def _find_tracked_activity(hass: HomeAssistant, activity_id: str) -> dict:
+    """Return a tracked activity from any athlete's recent activities."""
+    for coord in hass.data[DOMAIN].values():
+        for activity in (coord.data or {}).get("activities") or []:
+            if str(activity.get(CONF_SENSOR_ID)) == str(activity_id):
+                return activity
+
+    raise ServiceValidationError(
+        "Activity not found in any tracked athlete's recent activities. "
+        "Trigger a refresh first or check the activity ID."
+    )
+
+
+PLATFORMS = ["sensor", "camera", "button", "image"]
+
+# Options applied without reloading the entry; the rest set up the camera
+# and photo library and need a reload
+LIVE_OPTIONS = {
+    CONF_ACTIVITY_TYPES_TO_TRACK,
+    CONF_ATTRIBUTE_SENSORS_TO_CREATE,
+    CONF_COMPACT_SENSORS,
+    CONF_CURVES,
+    CONF_DISTANCE_UNIT_OVERRIDE,
+    CONF_GEAR_ENABLED,
+    CONF_NUM_GEAR_SENSORS,
+    CONF_NUM_RECENT_ACTIVITIES,
+}
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
@@ -120,6 +177,14 @@ class StravaWebhookView(HomeAssistantView):
                 coordinator: StravaDataUpdateCoordinator = self.hass.data[DOMAIN][
                     entry.entry_id
                 ]
+                coordinator.invalidate_for_event(data)
+                if (
+                    data.get("object_type") == "activity"
+                    and data.get("aspect_type") == "delete"
+                ):
+                    coordinator.spatial_index.remove(data.get("object_id"))
+                    await coordinator.curves.async_load()
+                    coordinator.curves.remove(data.get("object_id"))
                 self.hass.async_create_task(coordinator.async_request_refresh())
                 break
         else:
@@ -414,6 +479,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if entry.options.get(CONF_PHOTOS, False):
+        entry.async_on_unload(await async_setup_library(hass, coordinator))
+
     # Register the update_activity service once per domain (not per entry)
     if not hass.services.has_service(DOMAIN, SERVICE_UPDATE_ACTIVITY):
 
@@ -481,22 +549,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         async def async_handle_get_activity_route(call: ServiceCall) -> ServiceResponse:
             """Handle the get_activity_route service call."""
             activity_id = call.data["activity_id"]
-
-            target_activity = None
-            for coord in hass.data[DOMAIN].values():
-                current_data = coord.data or {}
-                for activity in current_data.get("activities") or []:
-                    if str(activity.get(CONF_SENSOR_ID)) == str(activity_id):
-                        target_activity = activity
-                        break
-                if target_activity:
-                    break
-
-            if target_activity is None:
-                raise ServiceValidationError(
-                    "Activity not found in any tracked athlete's recent activities. "
-                    "Trigger a refresh first or check the activity ID."
-                )
+            target_activity = _find_tracked_activity(hass, activity_id)
 
             encoded_polyline = target_activity.get(CONF_ATTR_POLYLINE)
             if not encoded_polyline:
@@ -516,8 +569,163 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             supports_response=SupportsResponse.ONLY,
         )
 
+    # Register the get_activity_details service once per domain (not per entry)
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_ACTIVITY_DETAILS):
+
+        async def async_handle_get_activity_details(
+            call: ServiceCall,
+        ) -> ServiceResponse:
+            """Handle the get_activity_details service call."""
+            activity = _find_tracked_activity(hass, call.data["activity_id"])
+
+            return {
+                CONF_ATTR_POLYLINE: activity.get(CONF_ATTR_POLYLINE),
+                CONF_ATTR_PR_SEGMENTS: activity.get(CONF_ATTR_PR_SEGMENTS, []),
+                CONF_ATTR_KOM_SEGMENTS: activity.get(CONF_ATTR_KOM_SEGMENTS, []),
+            }
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_ACTIVITY_DETAILS,
+            async_handle_get_activity_details,
+            schema=vol.Schema({vol.Required("activity_id"): vol.Coerce(str)}),
+            supports_response=SupportsResponse.ONLY,
+        )
+
+    # Register the find_activities_near service once per domain (not per entry)
+    if not hass.services.has_service(DOMAIN, SERVICE_FIND_ACTIVITIES_NEAR):
+
+        async def async_handle_find_activities_near(
+            call: ServiceCall,
+        ) -> ServiceResponse:
+            """Handle the find_activities_near service call."""
+            matches = []
+            for coord in hass.data[DOMAIN].values():
+                matches.extend(
+                    coord.spatial_index.query(
+                        call.data["latitude"],
+                        call.data["longitude"],
+                        call.data["radius"],
+                        point=call.data["point"],
+                    )
+                )
+
+            matches.sort(key=lambda match: match["distance_m"])
+
+            activities = []
+            for match in matches[: call.data["limit"]]:
+                date = match.get(CONF_SENSOR_DATE)
+                activities.append(
+                    {
+                        **match,
+                        "activity_id": str(match["activity_id"]),
+                        "distance_m": round(match["distance_m"], 1),
+                        CONF_SENSOR_DATE: date.isoformat() if date else None,
+                    }
+                )
+
+            return {"activities": activities}
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_FIND_ACTIVITIES_NEAR,
+            async_handle_find_activities_near,
+            schema=vol.Schema(
+                {
+                    vol.Required("latitude"): cv.latitude,
+                    vol.Required("longitude"): cv.longitude,
+                    vol.Optional(
+                        "radius", default=CONF_FIND_NEAR_RADIUS_DEFAULT
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=1, max=CONF_FIND_NEAR_RADIUS_MAX),
+                    ),
+                    vol.Optional("point", default=SPATIAL_POINT_START): vol.In(
+                        [SPATIAL_POINT_START, SPATIAL_POINT_END, SPATIAL_POINT_ANY]
+                    ),
+                    vol.Optional(
+                        "limit", default=CONF_FIND_NEAR_LIMIT_DEFAULT
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=CONF_FIND_NEAR_LIMIT_MAX),
+                    ),
+                }
+            ),
+            supports_response=SupportsResponse.ONLY,
+        )
+
+    # Register the get_activity_streams service once per domain (not per entry)
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_ACTIVITY_STREAMS):
+
+        async def async_handle_get_activity_streams(
+            call: ServiceCall,
+        ) -> ServiceResponse:
+            """Handle the get_activity_streams service call."""
+            activity_id = call.data["activity_id"]
+            coordinators = list(hass.data[DOMAIN].values())
+
+            # Prefer the athlete that owns the activity; older activities are
+            # still known through the spatial index after they leave the
+            # recent window. With a single athlete there is nothing to choose.
+            target_coordinator = None
+            for coord in coordinators:
+                current_data = coord.data or {}
+                if (
+                    any(
+                        str(activity.get(CONF_SENSOR_ID)) == str(activity_id)
+                        for activity in current_data.get("activities") or []
+                    )
+                    or activity_id in coord.spatial_index
+                ):
+                    target_coordinator = coord
+                    break
+            if target_coordinator is None and len(coordinators) == 1:
+                target_coordinator = coordinators[0]
+
+            if target_coordinator is None:
+                raise ServiceValidationError(
+                    "Activity not found in any tracked athlete's activities. "
+                    "Trigger a refresh first or check the activity ID."
+                )
+
+            streams = await target_coordinator.async_get_activity_streams(
+                activity_id, call.data.get("keys")
+            )
+            if not streams:
+                raise ServiceValidationError(
+                    f"Activity {activity_id} has no stream data available."
+                )
+
+            original_points = max(len(values) for values in streams.values())
+            return {
+                "activity_id": str(activity_id),
+                "original_points": original_points,
+                "streams": downsample(streams, call.data["max_points"]),
+            }
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_ACTIVITY_STREAMS,
+            async_handle_get_activity_streams,
+            schema=vol.Schema(
+                {
+                    vol.Required("activity_id"): cv.positive_int,
+                    vol.Optional("keys"): vol.All(
+                        cv.ensure_list, [vol.In(STREAM_TYPES)]
+                    ),
+                    vol.Optional(
+                        "max_points", default=CONF_STREAMS_MAX_POINTS_DEFAULT
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=CONF_STREAMS_MAX_POINTS_MAX),
+                    ),
+                }
+            ),
+            supports_response=SupportsResponse.ONLY,
+        )
+
     # Register update listener for options changes
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
@@ -558,10 +766,42 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
         if not hass.data[DOMAIN]:
             hass.services.async_remove(DOMAIN, SERVICE_UPDATE_ACTIVITY)
             hass.services.async_remove(DOMAIN, SERVICE_GET_ACTIVITY_ROUTE)
+            hass.services.async_remove(DOMAIN, SERVICE_GET_ACTIVITY_DETAILS)
+            hass.services.async_remove(DOMAIN, SERVICE_FIND_ACTIVITIES_NEAR)
+            hass.services.async_remove(DOMAIN, SERVICE_GET_ACTIVITY_STREAMS)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the entry's cached activity streams and photos when it is removed."""
+    await hass.async_add_executor_job(
+        shutil.rmtree, hass.config.path(STREAMS_CACHE_DIR, entry.entry_id), True
+    )
+    if entry.unique_id:
+        await hass.async_add_executor_job(
+            shutil.rmtree, hass.config.path(IMAGE_CACHE_DIR, entry.unique_id), True
+        )
+        await async_remove_library(hass, entry.unique_id)
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
+    """Apply updated options in place, reloading only for those that need it."""
+    coordinator: StravaDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    previous = coordinator.applied_options
+    changed = {
+        key
+        for key in previous.keys() | entry.options.keys()
+        if previous.get(key) != entry.options.get(key)
+    }
+    if changed - LIVE_OPTIONS:
+        await async_reload_entry(hass, entry)
+        return
+
+    await coordinator.async_apply_options()
+    await async_sync_entities(hass, entry)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
-    """Reload the config entry when options are updated."""
+    """Reload the config entry."""
     await hass.config_entries.async_reload(entry.entry_id)
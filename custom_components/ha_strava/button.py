@@ -1,6 +1,7 @@
 """Button platform for HA Strava."""
 
 import logging
+from functools import partial
 from typing import Any
 
 from homeassistant.components.button import ButtonEntity
@@ -24,6 +25,7 @@ from .const import (
     normalize_activity_type,
 )
 from .coordinator import StravaDataUpdateCoordinator
+from .entity_sync import async_discover_entities, async_track_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +36,29 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator: StravaDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    sync = async_track_entities(
+        hass, entry, async_add_entities, partial(_build_buttons, coordinator, entry)
+    )
+    # Sport types first recorded after setup get their button on that update
+    async_discover_entities(
+        entry, coordinator, sync, partial(_sport_types, coordinator)
+    )
+
+
+def _sport_types(coordinator: StravaDataUpdateCoordinator) -> set[str]:
+    """Return the normalized sport types of the coordinator's activities."""
+    activities = (coordinator.data or {}).get("activities") or []
+    return {
+        normalize_activity_type(activity[CONF_ATTR_SPORT_TYPE])
+        for activity in activities
+        if activity.get(CONF_ATTR_SPORT_TYPE)
+    }
+
+
+def _build_buttons(
+    coordinator: StravaDataUpdateCoordinator, entry: ConfigEntry
+) -> list[ButtonEntity]:
+    """Build the refresh buttons for the tracked activities and recent slots."""
     athlete_id = entry.unique_id
     athlete_name = get_athlete_name_from_title(entry.title)
 
@@ -78,8 +103,7 @@ async def async_setup_entry(
             )
         )
 
-    if buttons:
-        async_add_entities(buttons)
+    return buttons
 
 
 class StravaActivityRefreshButton(CoordinatorEntity, ButtonEntity):
@@ -2,42 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from hashlib import md5
+from time import monotonic
 
 import aiohttp
 from homeassistant.components.camera import Camera
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    CONF_IMAGE_MEMORY_CACHE_SIZE,
+    CONF_IMAGE_RETRY_BACKOFF_MAX_SECONDS,
+    CONF_IMAGE_RETRY_BACKOFF_SECONDS,
+    CONF_IMG_PREFETCH_LOOKAHEAD,
+    CONF_IMG_PREFETCH_LOOKAHEAD_DEFAULT,
     CONF_IMG_UPDATE_INTERVAL_SECONDS,
     CONF_IMG_UPDATE_INTERVAL_SECONDS_DEFAULT,
-    CONF_MAX_NB_IMAGES,
     CONF_PHOTOS,
     CONF_SENSOR_DATE,
     CONF_SENSOR_ID,
     CONFIG_URL_DUMP_FILENAME,
     DOMAIN,
+    HTTP_TIMEOUT_SECONDS,
+    IMAGE_CACHE_DIR,
     MAX_NB_ACTIVITIES,
+    PHOTO_URLS_STORAGE_KEY,
     generate_device_id,
     generate_device_name,
     get_athlete_name_from_title,
 )
 from .coordinator import StravaDataUpdateCoordinator
+from .image_cache import ImageCache, scaled_size
+from .playlist import PhotoPlaylist
 
 STORAGE_VERSION = 1
-STORAGE_KEY = f"{DOMAIN}_photo_urls"
+STORAGE_KEY = PHOTO_URLS_STORAGE_KEY
+STORAGE_SAVE_DELAY_SECONDS = 30
+
+# Cameras by config entry id, for diagnostics
+DATA_CAMERAS = f"{DOMAIN}_cameras"
+DATA_PLACEHOLDER = f"{DOMAIN}_placeholder"
 
 _LOGGER = logging.getLogger(__name__)
 
-_DEFAULT_IMAGE_URL = (
-    "https://upload.wikimedia.org/wikipedia/commons/thumb/1/15/"
-    "No_image_available_600_x_450.svg/1280px-No_image_available_600_x_450.svg.png"
-)
+_PLACEHOLDER_PATH = os.path.join(os.path.dirname(__file__), "placeholder.jpg")
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
@@ -60,30 +74,38 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     if not photos_enabled:
         return
 
-    url_cam = UrlCam(coordinator, hass, default_enabled=True, athlete_id=athlete_id)
+    url_cam = UrlCam(
+        coordinator,
+        hass,
+        default_enabled=True,
+        athlete_id=athlete_id,
+        prefetch_lookahead=int(
+            config_entry.options.get(
+                CONF_IMG_PREFETCH_LOOKAHEAD, CONF_IMG_PREFETCH_LOOKAHEAD_DEFAULT
+            )
+        ),
+        rotate_interval=int(
+            config_entry.options.get(
+                CONF_IMG_UPDATE_INTERVAL_SECONDS,
+                CONF_IMG_UPDATE_INTERVAL_SECONDS_DEFAULT,
+            )
+        ),
+    )
     await url_cam.async_load_storage()
     async_add_entities([url_cam])
 
-    async def image_update_listener(_):
-        await url_cam.rotate_img()
-
-    img_update_interval_seconds = int(
-        config_entry.options.get(
-            CONF_IMG_UPDATE_INTERVAL_SECONDS,
-            CONF_IMG_UPDATE_INTERVAL_SECONDS_DEFAULT,
-        )
-    )
-
-    async_track_time_interval(
-        hass, image_update_listener, timedelta(seconds=img_update_interval_seconds)
-    )
-
 
 class UrlCam(CoordinatorEntity, Camera):
-    """A camera that cycles through a list of image URLs."""
+    """A camera that cycles through a list of image URLs.
+
+    The photo advances when a frame is requested at least rotate_interval
+    seconds after the last rotation, so nothing happens while nobody is
+    watching and rotating never writes a state.
+    """
 
     _attr_has_entity_name = True
     _attr_should_poll = False
+    _unrecorded_attributes = frozenset({"img_url"})
 
     def __init__(
         self,
@@ -91,6 +113,8 @@ class UrlCam(CoordinatorEntity, Camera):
         hass,
         athlete_id: str,
         default_enabled=True,
+        prefetch_lookahead: int = CONF_IMG_PREFETCH_LOOKAHEAD_DEFAULT,
+        rotate_interval: float = CONF_IMG_UPDATE_INTERVAL_SECONDS_DEFAULT,
     ):
         """Initialize the camera."""
         super().__init__(coordinator)
@@ -112,8 +136,21 @@ class UrlCam(CoordinatorEntity, Camera):
             os.path.dirname(os.path.abspath(__file__)),
             f"{self._athlete_id}_{CONFIG_URL_DUMP_FILENAME}",
         )
-        self._urls = {}
-        self._url_index = 0
+        self._urls = PhotoPlaylist()
+        self._prefetch_lookahead = prefetch_lookahead
+        # Room in memory for the current frame plus everything prefetched
+        self._image_cache = ImageCache(
+            hass,
+            hass.config.path(IMAGE_CACHE_DIR, athlete_id),
+            memory_items=max(CONF_IMAGE_MEMORY_CACHE_SIZE, prefetch_lookahead + 2),
+        )
+        self._downloads: dict[str, asyncio.Task] = {}
+        self._rotate_interval = rotate_interval
+        self._rotated_at = monotonic()
+        self._rotated = False
+        # Photo key -> (monotonic time to retry at, current back-off seconds)
+        self._failed: dict[str, tuple[float, float]] = {}
+        self._prefetch_stats = {"prefetched": 0, "hits": 0, "misses": 0}
         self._attr_entity_registry_enabled_default = default_enabled
 
     @staticmethod
@@ -144,10 +181,10 @@ class UrlCam(CoordinatorEntity, Camera):
                                 f"Invalid date format in stored data: {value.get('date')}"
                             )
                             continue
-                self._urls = stored_data
+                self._urls = PhotoPlaylist(stored_data)
         except (OSError, ValueError, TypeError) as err:
             _LOGGER.error(f"Error loading stored URLs: {err}")
-            self._urls = {}
+            self._urls = PhotoPlaylist()
 
     async def _migrate_from_pickle(self):
         """Migrate from old pickle file to Home Assistant storage."""
@@ -164,7 +201,7 @@ class UrlCam(CoordinatorEntity, Camera):
                 pickled_data = pickle.load(io.BytesIO(await file.read()))
 
             if pickled_data and isinstance(pickled_data, dict):
-                self._urls = pickled_data
+                self._urls = PhotoPlaylist(pickled_data)
                 await self._async_save_storage()
                 _LOGGER.info(f"Successfully migrated {len(self._urls)} photo URLs")
 
@@ -176,47 +213,128 @@ class UrlCam(CoordinatorEntity, Camera):
                     _LOGGER.warning(f"Could not remove old pickle file: {err}")
         except (OSError, ImportError, ValueError, TypeError) as err:
             _LOGGER.error(f"Error migrating from pickle file: {err}")
-            self._urls = {}
+            self._urls = PhotoPlaylist()
+
+    def _data_to_save(self) -> dict:
+        return dict(self._urls)
 
     async def _async_save_storage(self):
         """Save image URLs to Home Assistant storage."""
         try:
-            await self._store.async_save(self._urls)
+            await self._store.async_save(self._data_to_save())
         except (OSError, ValueError, TypeError) as err:
             _LOGGER.error(f"Error saving URLs to storage: {err}")
 
     async def async_camera_image(
         self,
         width: int | None = None,
-        height: int | None = None,  # pylint: disable=unused-argument
+        height: int | None = None,
     ) -> bytes | None:
-        """Return the image for the current URL."""
-        if not self._urls:
-            return await _return_default_img()
-
-        url = list(self._urls.values())[self._url_index]["url"]
+        """Return the image for the current URL, scaled down to the requested size."""
+        if monotonic() - self._rotated_at >= self._rotate_interval:
+            await self.rotate_img()
+        if (current := self._urls.peek()) is None:
+            return await _return_default_img(self.hass)
+
+        key, img = current
+        size = scaled_size(width, height)
+        # Only the first frame after a rotation tells whether prefetch kept up
+        rotated, self._rotated = self._rotated, False
+
+        scaled = self._image_cache.get_scaled(key, size) if size else None
+        if scaled is not None:
+            image = scaled
+        else:
+            image = await self._image_cache.async_get(key)
+        if rotated:
+            self._prefetch_stats["hits" if image is not None else "misses"] += 1
+
+        if image is None:
+            if self._backing_off(key):
+                return await _return_default_img(self.hass)
+            # Shield the shared download so a client disconnect doesn't cancel
+            # it for everyone else waiting on the same photo.
+            image = await asyncio.shield(self._async_download(key, img["url"]))
+            if image is None:
+                return await _return_default_img(self.hass)
+
+        if size and scaled is None:
+            return await self._image_cache.async_scale(key, image, size)
+        return image
+
+    def _async_download(self, key: str, url: str) -> asyncio.Task:
+        """Return the download task for a photo, starting one if none is running."""
+        if (task := self._downloads.get(key)) is None:
+            task = self.hass.async_create_task(self._async_fetch_image(key, url))
+            self._downloads[key] = task
+            task.add_done_callback(lambda _: self._downloads.pop(key, None))
+        return task
+
+    async def _async_fetch_image(self, key: str, url: str) -> bytes | None:
+        """Download a photo into the image cache."""
         try:
-            async with aiohttp.ClientSession() as session, session.get(
-                url=url, timeout=10
+            async with async_get_clientsession(self.hass).get(
+                url=url, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
             ) as response:
                 if response.status == 200:
-                    return await response.read()
-        except aiohttp.ClientError as err:
+                    image = await response.read()
+                    self._failed.pop(key, None)
+                    await self._image_cache.async_put(key, image)
+                    return image
+                _LOGGER.warning(
+                    f"Error fetching image from {url}: HTTP {response.status}"
+                )
+        except (aiohttp.ClientError, TimeoutError) as err:
             _LOGGER.error(f"Error fetching image from {url}: {err}")
-        return await _return_default_img()
+
+        _, backoff = self._failed.get(key, (0, CONF_IMAGE_RETRY_BACKOFF_SECONDS / 2))
+        backoff = min(backoff * 2, CONF_IMAGE_RETRY_BACKOFF_MAX_SECONDS)
+        self._failed[key] = (monotonic() + backoff, backoff)
+        return None
+
+    def _backing_off(self, key: str) -> bool:
+        """Return True while a photo that failed to download shouldn't be retried."""
+        failure = self._failed.get(key)
+        return failure is not None and monotonic() < failure[0]
+
+    async def _async_prefetch(self):
+        """Warm the cache with the photos that are next in the rotation."""
+        for offset in range(1, min(self._prefetch_lookahead, len(self._urls) - 1) + 1):
+            key, img = self._urls.peek(offset)
+            if key in self._downloads or self._backing_off(key):
+                continue
+            if await self._image_cache.async_get(key) is None:
+                self._prefetch_stats["prefetched"] += 1
+                self._async_download(key, img["url"])
 
     async def rotate_img(self):
         """Rotate to the next image."""
         if self._urls:
-            self._url_index = (self._url_index + 1) % len(self._urls)
-            self.async_write_ha_state()
+            self._urls.advance()
+            self._rotated_at = monotonic()
+            self._rotated = True
+            if self._prefetch_lookahead:
+                self.hass.async_create_task(self._async_prefetch())
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return prefetch statistics for config entry diagnostics."""
+        stats = self._prefetch_stats
+        rotations = stats["hits"] + stats["misses"]
+        return {
+            "photos": len(self._urls),
+            "failing_photos": len(self._failed),
+            "prefetch_lookahead": self._prefetch_lookahead,
+            **stats,
+            "hit_rate": round(stats["hits"] / rotations, 3) if rotations else None,
+        }
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        if not self._urls:
-            return {"img_url": _DEFAULT_IMAGE_URL}
-        return {"img_url": list(self._urls.values())[self._url_index]["url"]}
+        if (current := self._urls.peek()) is None:
+            return {"img_url": None}
+        return {"img_url": current[1]["url"]}
 
     @property
     def device_info(self):
@@ -229,10 +347,11 @@ class UrlCam(CoordinatorEntity, Camera):
             "configuration_url": f"https://www.strava.com/dashboard/{self._athlete_id}",
         }
 
-    async def _update_urls(self):
-        if self.coordinator.data and self.coordinator.data.get("images"):
+    async def _update_urls(self, images: list[dict]):
+        """Add newly discovered photos to the rotation."""
+        if images:
             # Get the 30 most recent activities
-            activities = self.coordinator.data.get("activities", [])
+            activities = (self.coordinator.data or {}).get("activities", [])
             recent_activity_ids = set()
 
             if activities:
@@ -247,39 +366,49 @@ class UrlCam(CoordinatorEntity, Camera):
                     activity[CONF_SENSOR_ID] for activity in sorted_activities
                 }
 
-            # Filter images to only include those from recent activities
-            for img_url in self.coordinator.data["images"]:
+            # Filter images to only include those from recent activities; the
+            # playlist keeps the newest CONF_MAX_NB_IMAGES of them.
+            changed = False
+            for img_url in images:
                 if img_url.get("activity_id") in recent_activity_ids:
-                    self._urls[md5(img_url["url"].encode()).hexdigest()] = img_url
-
-            # Sort by date and limit to max number of images
-            self._urls = dict(
-                sorted(self._urls.items(), key=lambda item: item[1]["date"])[
-                    -CONF_MAX_NB_IMAGES:
-                ]
-            )
-            await self._async_save_storage()
+                    key = md5(img_url["url"].encode()).hexdigest()
+                    changed |= self._urls.add(key, img_url)
+            if not changed:
+                return
+
+            await self._image_cache.async_retain(self._urls)
+            self._failed = {
+                key: failure
+                for key, failure in self._failed.items()
+                if key in self._urls
+            }
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY_SECONDS)
+            self.async_write_ha_state()
 
     async def async_added_to_hass(self):
         """Handle entity being added to Home Assistant."""
         await super().async_added_to_hass()
+        cameras = self.hass.data.setdefault(DATA_CAMERAS, {})
+        cameras[self.coordinator.entry.entry_id] = self
+        self.async_on_remove(lambda: cameras.pop(self.coordinator.entry.entry_id, None))
+        # Photos arrive from the background discovery worker, not the refresh
         self.async_on_remove(
-            self.coordinator.async_add_listener(self._handle_coordinator_update)
+            self.coordinator.photo_discovery.async_add_listener(self._handle_new_photos)
         )
-        await self._update_urls()
-
-    def _handle_coordinator_update(self) -> None:
-        self.hass.async_create_task(self._update_urls())
-        self.async_write_ha_state()
-
-
-async def _return_default_img():
-    try:
-        async with aiohttp.ClientSession() as session, session.get(
-            url=_DEFAULT_IMAGE_URL, timeout=10
-        ) as img_response:
-            if img_response.status == 200:
-                return await img_response.read()
-    except aiohttp.ClientError as err:
-        _LOGGER.error(f"Error fetching default image: {err}")
-    return None
+
+    @callback
+    def _handle_new_photos(self, images: list[dict]) -> None:
+        self.hass.async_create_task(self._update_urls(images))
+
+
+def _read_placeholder() -> bytes:
+    with open(_PLACEHOLDER_PATH, "rb") as file:
+        return file.read()
+
+
+async def _return_default_img(hass):
+    """Return the bundled placeholder image, read from disk only once."""
+    if (placeholder := hass.data.get(DATA_PLACEHOLDER)) is None:
+        placeholder = await hass.async_add_executor_job(_read_placeholder)
+        hass.data[DATA_PLACEHOLDER] = placeholder
+    return placeholder
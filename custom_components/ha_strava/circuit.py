@@ -0,0 +1,171 @@
+"""Circuit breaker for the Strava API.
+
+While Strava is down or answering with server errors, every webhook, button
+press and service call would otherwise wait out its own retries. After
+failure_threshold consecutive failures the circuit opens and requests fail
+fast with CircuitOpenError, so callers fall back on the data they hold. Once
+the cooldown has passed a single probe request is let through (half-open):
+if it succeeds the circuit closes, otherwise it opens again for twice as long,
+up to max_cooldown_seconds. Given hass, the circuit turns half-open when the
+cooldown ends, so listeners hear about it without waiting for a request.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONF_CIRCUIT_COOLDOWN_SECONDS,
+    CONF_CIRCUIT_FAILURE_THRESHOLD,
+    CONF_CIRCUIT_MAX_COOLDOWN_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+CIRCUIT_STATES = [CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN]
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop calling the Strava API while it keeps failing."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant | None = None,
+        failure_threshold: int = CONF_CIRCUIT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = CONF_CIRCUIT_COOLDOWN_SECONDS,
+        max_cooldown_seconds: float = CONF_CIRCUIT_MAX_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize closed, with no failures counted."""
+        self._hass = hass
+        self._failure_threshold = failure_threshold
+        self._base_cooldown = cooldown_seconds
+        self._max_cooldown = max_cooldown_seconds
+        self._clock = clock
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._cooldown = cooldown_seconds
+        self._opened_at = 0.0
+        self._probing = False
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_cooldown: CALLBACK_TYPE | None = None
+
+    @property
+    def state(self) -> str:
+        """Return whether the circuit is closed, open or half-open."""
+        if self._state == CIRCUIT_OPEN and self.retry_in() == 0:
+            return CIRCUIT_HALF_OPEN
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        """Return the number of consecutive failures."""
+        return self._failures
+
+    def retry_in(self) -> float:
+        """Return the seconds until a probe request is let through."""
+        if self._state != CIRCUIT_OPEN:
+            return 0.0
+        return max(self._opened_at + self._cooldown - self._clock(), 0.0)
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return True
+        if state == CIRCUIT_OPEN or self._probing:
+            return False
+        # Half-open: let a single probe through
+        self._probing = True
+        self._set_state(CIRCUIT_HALF_OPEN)
+        return True
+
+    def record_success(self) -> None:
+        """Record a request Strava answered, closing the circuit."""
+        self._failures = 0
+        self._probing = False
+        self._cooldown = self._base_cooldown
+        self._set_state(CIRCUIT_CLOSED)
+
+    def release_probe(self) -> None:
+        """Let another probe through if this one ended without an answer."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if there were too many."""
+        self._failures += 1
+        if self._state == CIRCUIT_HALF_OPEN:
+            # The probe failed
+            self._probing = False
+            self._cooldown = min(self._cooldown * 2, self._max_cooldown)
+            self._open()
+        elif (
+            self._state == CIRCUIT_CLOSED and self._failures >= self._failure_threshold
+        ):
+            self._open()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for state changes; returns a function to stop listening."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the end of a pending cooldown."""
+        if self._unsub_cooldown is not None:
+            self._unsub_cooldown()
+            self._unsub_cooldown = None
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the circuit's state for config entry diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self._failures,
+            "retry_in_seconds": round(self.retry_in()),
+        }
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        _LOGGER.warning(
+            f"Strava API failing, pausing requests for {self._cooldown:.0f} seconds"
+        )
+        self._set_state(CIRCUIT_OPEN)
+        if self._hass is not None:
+            self.async_shutdown()
+            self._unsub_cooldown = async_call_later(
+                self._hass, self._cooldown, self._async_cooldown_over
+            )
+
+    @callback
+    def _async_cooldown_over(self, _now: datetime) -> None:
+        self._unsub_cooldown = None
+        if self._state == CIRCUIT_OPEN:
+            self._set_state(CIRCUIT_HALF_OPEN)
+
+    def _set_state(self, state: str) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        for update_callback in list(self._listeners):
+            update_callback()
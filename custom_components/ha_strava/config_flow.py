@@ -15,6 +15,7 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_entry_oauth2_flow
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity_registry import (
     RegistryEntryDisabler,
     async_entries_for_config_entry,
@@ -25,12 +26,19 @@ from homeassistant.helpers.network import NoURLAvailableError, get_url
 # custom module imports
 from .const import (
     CONF_ACTIVITY_TYPES_TO_TRACK,
+    CONF_ATTRIBUTE_SENSOR_TYPES,
+    CONF_ATTRIBUTE_SENSORS_TO_CREATE,
     CONF_CALLBACK_URL,
+    CONF_COMPACT_SENSORS,
+    CONF_CURVES,
     CONF_DISTANCE_UNIT_OVERRIDE,
     CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT,
     CONF_DISTANCE_UNIT_OVERRIDE_IMPERIAL,
     CONF_DISTANCE_UNIT_OVERRIDE_METRIC,
     CONF_GEAR_ENABLED,
+    CONF_IMG_PREFETCH_LOOKAHEAD,
+    CONF_IMG_PREFETCH_LOOKAHEAD_DEFAULT,
+    CONF_IMG_PREFETCH_LOOKAHEAD_MAX,
     CONF_IMG_UPDATE_INTERVAL_SECONDS,
     CONF_IMG_UPDATE_INTERVAL_SECONDS_DEFAULT,
     CONF_NUM_GEAR_SENSORS,
@@ -39,21 +47,45 @@ from .const import (
     CONF_NUM_RECENT_ACTIVITIES_DEFAULT,
     CONF_NUM_RECENT_ACTIVITIES_MAX,
     CONF_PHOTOS,
+    CONF_SENSOR_GEAR_NAME,
     CONF_STRAVA_APP_MODE,
     DEFAULT_ACTIVITY_TYPES,
     DOMAIN,
+    HTTP_TIMEOUT_SECONDS,
     OAUTH2_AUTHORIZE,
     OAUTH2_SCOPES,
     OAUTH2_TOKEN,
     STRAVA_APP_MODE_SHARED,
     STRAVA_APP_MODE_SOLO,
     SUPPORTED_ACTIVITY_TYPES,
+    generate_recent_activity_sensor_id,
+    generate_sensor_id,
+    generate_sensor_name,
     normalize_activity_type,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _attribute_sensor_unique_ids(athlete_id: str, attribute_types) -> set[str]:
+    """Return the unique_ids of the given attribute sensors on any device."""
+    unique_ids = set()
+    for attribute_type in attribute_types:
+        for activity_type in SUPPORTED_ACTIVITY_TYPES:
+            unique_ids.add(
+                generate_sensor_id(
+                    athlete_id, normalize_activity_type(activity_type), attribute_type
+                )
+            )
+        for activity_index in range(CONF_NUM_RECENT_ACTIVITIES_MAX):
+            unique_ids.add(
+                generate_recent_activity_sensor_id(
+                    athlete_id, attribute_type, activity_index
+                )
+            )
+    return unique_ids
+
+
 def _find_entries_with_client_id(hass, client_id: str) -> list:
     """Return all loaded config entries that share the given client_id."""
     return [
@@ -102,6 +134,28 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         cv.multi_select(SUPPORTED_ACTIVITY_TYPES),
                         vol.Length(min=1, msg="Select at least one activity type"),
                     ),
+                    vol.Required(
+                        CONF_ATTRIBUTE_SENSORS_TO_CREATE,
+                        default=self.config_entry.options.get(
+                            CONF_ATTRIBUTE_SENSORS_TO_CREATE,
+                            CONF_ATTRIBUTE_SENSOR_TYPES,
+                        ),
+                    ): cv.multi_select(
+                        {
+                            attribute_type: generate_sensor_name(attribute_type)
+                            for attribute_type in CONF_ATTRIBUTE_SENSOR_TYPES
+                        }
+                    ),
+                    vol.Required(
+                        CONF_COMPACT_SENSORS,
+                        default=self.config_entry.options.get(
+                            CONF_COMPACT_SENSORS, False
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_CURVES,
+                        default=self.config_entry.options.get(CONF_CURVES, False),
+                    ): bool,
                     vol.Required(
                         CONF_IMG_UPDATE_INTERVAL_SECONDS,
                         default=self.config_entry.options.get(
@@ -116,6 +170,20 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             msg=f"max = 60 seconds",
                         ),
                     ),
+                    vol.Required(
+                        CONF_IMG_PREFETCH_LOOKAHEAD,
+                        default=self.config_entry.options.get(
+                            CONF_IMG_PREFETCH_LOOKAHEAD,
+                            CONF_IMG_PREFETCH_LOOKAHEAD_DEFAULT,
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(
+                            min=0,
+                            max=CONF_IMG_PREFETCH_LOOKAHEAD_MAX,
+                            msg=f"Must be between 0 and {CONF_IMG_PREFETCH_LOOKAHEAD_MAX}",
+                        ),
+                    ),
                     vol.Required(
                         CONF_PHOTOS,
                         default=self.config_entry.options.get(
@@ -212,6 +280,21 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 )
 
             athlete_id = self.config_entry.unique_id
+            selected_attribute_sensors = user_input.get(
+                CONF_ATTRIBUTE_SENSORS_TO_CREATE, CONF_ATTRIBUTE_SENSOR_TYPES
+            )
+            compact_sensors = user_input.get(CONF_COMPACT_SENSORS, False)
+            # Compact mode folds every attribute and gear sensor into the
+            # main activity sensors
+            deselected_attribute_sensor_ids = _attribute_sensor_unique_ids(
+                athlete_id,
+                (
+                    {*CONF_ATTRIBUTE_SENSOR_TYPES, CONF_SENSOR_GEAR_NAME}
+                    if compact_sensors
+                    else set(CONF_ATTRIBUTE_SENSOR_TYPES)
+                    - set(selected_attribute_sensors)
+                ),
+            )
             normalized_selected_types = {
                 normalize_activity_type(t)
                 for t in selected_activity_types
@@ -320,6 +403,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             # (these are not device-based)
             if _entity_registry is not None:
                 for entity in entities:
+                    # Attribute sensors no longer selected are not created, so
+                    # their registry entries are removed rather than disabled
+                    if entity.unique_id in deselected_attribute_sensor_ids:
+                        _entity_registry.async_remove(entity.entity_id)
+                        continue
                     try:
                         # Enable/disable activity type sensors based on activity type selection
                         # Activity type sensors have unique_ids like: strava_{athlete_id}_{normalized_activity_type}
@@ -492,9 +580,17 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             ha_strava_options[CONF_ACTIVITY_TYPES_TO_TRACK] = (
                 self._selected_activity_types
             )
+            ha_strava_options[CONF_ATTRIBUTE_SENSORS_TO_CREATE] = (
+                selected_attribute_sensors
+            )
+            ha_strava_options[CONF_COMPACT_SENSORS] = compact_sensors
+            ha_strava_options[CONF_CURVES] = user_input.get(CONF_CURVES, False)
             ha_strava_options[CONF_IMG_UPDATE_INTERVAL_SECONDS] = (
                 self._img_update_interval_seconds
             )
+            ha_strava_options[CONF_IMG_PREFETCH_LOOKAHEAD] = user_input.get(
+                CONF_IMG_PREFETCH_LOOKAHEAD, CONF_IMG_PREFETCH_LOOKAHEAD_DEFAULT
+            )
             ha_strava_options[CONF_PHOTOS] = self._import_strava_images
             ha_strava_options[CONF_DISTANCE_UNIT_OVERRIDE] = (
                 self._config_distance_unit_override
@@ -660,8 +756,10 @@ class OAuth2FlowHandler(
         headers = {
             "Authorization": f"Bearer {data['token']['access_token']}",
         }
-        async with aiohttp.ClientSession() as session, session.get(
-            "https://www.strava.com/api/v3/athlete", headers=headers
+        async with async_get_clientsession(self.hass).get(
+            "https://www.strava.com/api/v3/athlete",
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
         ) as response:
             if response.status != 200:
                 return self.async_abort(reason="cannot_connect")
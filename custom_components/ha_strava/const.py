@@ -14,6 +14,62 @@ OAUTH2_SCOPES = "activity:read_all,profile:read_all,activity:write"
 # Services
 SERVICE_UPDATE_ACTIVITY = "update_activity"
 SERVICE_GET_ACTIVITY_ROUTE = "get_activity_route"
+SERVICE_GET_ACTIVITY_DETAILS = "get_activity_details"
+SERVICE_FIND_ACTIVITIES_NEAR = "find_activities_near"
+SERVICE_GET_ACTIVITY_STREAMS = "get_activity_streams"
+
+# Spatial Index Config
+# ~1.1 km cells at the equator; small enough that a typical "near home"
+# query only touches a handful of cells.
+SPATIAL_INDEX_CELL_DEGREES = 0.01
+SPATIAL_POINT_START = "start"
+SPATIAL_POINT_END = "end"
+SPATIAL_POINT_ANY = "any"
+CONF_FIND_NEAR_RADIUS_DEFAULT = 500
+CONF_FIND_NEAR_RADIUS_MAX = 100000
+CONF_FIND_NEAR_LIMIT_DEFAULT = 20
+CONF_FIND_NEAR_LIMIT_MAX = 200
+
+# Activity Streams
+STREAM_TYPES = (
+    "time",
+    "distance",
+    "latlng",
+    "altitude",
+    "heartrate",
+    "watts",
+    "cadence",
+)
+STREAMS_CACHE_DIR = "ha_strava_streams"
+CONF_STREAMS_CACHE_MAX_BYTES = 50 * 1024 * 1024
+CONF_STREAMS_MAX_POINTS_DEFAULT = 500
+CONF_STREAMS_MAX_POINTS_MAX = 10000
+
+# Power/Heart Rate Curves & Best Efforts
+CURVE_POWER = "power"
+CURVE_HEARTRATE = "heartrate"
+CURVE_PACE = "pace"
+CURVE_BEST_EFFORTS = "best_efforts"
+# Window lengths in seconds for the mean-maximal power and heart rate curves
+CURVE_DURATIONS = (5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+# Distances in meters for running best efforts
+CURVE_BEST_EFFORT_DISTANCES = {
+    "400m": 400,
+    "1k": 1000,
+    "1_mile": 1609.344,
+    "5k": 5000,
+    "10k": 10000,
+    "half_marathon": 21097.5,
+    "marathon": 42195,
+}
+CURVE_HEADLINE_DURATION = 1200
+CURVE_HEADLINE_DISTANCE = "5k"
+# Curves need every activity's streams, so they're only computed when enabled,
+# in the background and paced by the rate limit
+CONF_CURVES = "curves_enabled"
+# New activities whose streams are fetched per backfill run; the rest are
+# picked up on later runs so a first setup doesn't burn the API quota.
+CONF_CURVES_FETCH_LIMIT = 10
 
 # Camera Config
 CONF_PHOTOS = "conf_photos"
@@ -22,15 +78,53 @@ CONFIG_IMG_SIZE = 512
 CONFIG_URL_DUMP_FILENAME = "strava_img_urls.pickle"
 CONF_IMG_UPDATE_INTERVAL_SECONDS = "img_update_interval_seconds"
 CONF_IMG_UPDATE_INTERVAL_SECONDS_DEFAULT = 15
+CONF_IMG_PREFETCH_LOOKAHEAD = "img_prefetch_lookahead"
+CONF_IMG_PREFETCH_LOOKAHEAD_DEFAULT = 2
+CONF_IMG_PREFETCH_LOOKAHEAD_MAX = 5
 CONF_MAX_NB_IMAGES = 30
+# The camera's rotation, kept in storage; the photo library is seeded from it
+PHOTO_URLS_STORAGE_KEY = f"{DOMAIN}_photo_urls"
+# Photo bytes cache: a few frames in memory, every rotating photo on disk
+IMAGE_CACHE_DIR = "ha_strava_images"
+CONF_IMAGE_MEMORY_CACHE_SIZE = 4
+CONF_IMAGE_DISK_CACHE_MAX_BYTES = 20 * 1024 * 1024
+# Resized frames for dashboard tiles, memory only; requested sizes are rounded
+# up to the step so similar tiles share an entry.
+CONF_IMAGE_SCALED_CACHE_SIZE = 16
+CONF_IMAGE_SIZE_STEP = 64
+CONF_IMAGE_JPEG_QUALITY = 85
+# Failing photo URLs are skipped for a back-off period that doubles per failure
+CONF_IMAGE_RETRY_BACKOFF_SECONDS = 60
+CONF_IMAGE_RETRY_BACKOFF_MAX_SECONDS = 3600
+# Photo library browsable through the media browser, one copy per photo
+MEDIA_DIR = "ha_strava_media"
+CONF_MEDIA_THUMBNAIL_SIZE = 256
+# How long the signed photo and thumbnail URLs handed to the media browser work
+CONF_MEDIA_URL_EXPIRY_SECONDS = 24 * 60 * 60
 MAX_NB_ACTIVITIES = 30
 
+# Timeout of requests through Home Assistant's shared HTTP session (photos,
+# default image, config flow)
+HTTP_TIMEOUT_SECONDS = 10
+
 # Rate Limiting Config
-CONF_PHOTO_FETCH_DELAY_SECONDS = 0.75
+CONF_PHOTO_FETCH_CONCURRENCY = 4
 CONF_PHOTO_FETCH_INITIAL_LIMIT = 15
 CONF_PHOTO_CACHE_HOURS = 24
+CONF_PHOTO_DISCOVERY_INTERVAL_MINUTES = 60
+CONF_PHOTO_FETCH_LOG_MAX_ENTRIES = 200
 CONF_API_RETRY_MAX_ATTEMPTS = 3
 CONF_API_RETRY_BASE_DELAY_SECONDS = 1
+# Background requests go unpaced below this share of a limit, and leave this
+# share of it for the coordinator's own refreshes
+CONF_RATE_LIMIT_FREE_FRACTION = 0.5
+CONF_RATE_LIMIT_RESERVE_FRACTION = 0.1
+RATE_LIMIT_SHORT_WINDOW_SECONDS = 900
+# Requests fail fast after this many consecutive API failures, until a probe
+# after the cooldown succeeds; the cooldown doubles with every failed probe
+CONF_CIRCUIT_FAILURE_THRESHOLD = 5
+CONF_CIRCUIT_COOLDOWN_SECONDS = 60
+CONF_CIRCUIT_MAX_COOLDOWN_SECONDS = 900
 
 # Weekly Summary Sensors
 WEEKLY_SUMMARY_ACTIVITY_TYPES = ("Run", "Ride", "Swim")
@@ -76,10 +170,27 @@ CONF_NUM_RECENT_ACTIVITIES = "num_recent_activities"
 CONF_NUM_RECENT_ACTIVITIES_DEFAULT = 1
 CONF_NUM_RECENT_ACTIVITIES_MAX = 10
 
+# Attribute Sensor Selection; every CONF_ATTRIBUTE_SENSOR_TYPES entry if unset
+CONF_ATTRIBUTE_SENSORS_TO_CREATE = "attribute_sensors_to_create"
+
+# Compact mode: one sensor per activity type and recent activity, with the
+# attribute sensor values in a single "metrics" attribute
+CONF_COMPACT_SENSORS = "compact_sensors"
+
 # Gear Sensor Configuration
 CONF_GEAR_ENABLED = "gear_enabled"
 CONF_NUM_GEAR_SENSORS = "num_gear_sensors"
 CONF_NUM_GEAR_SENSORS_DEFAULT = 3
+# Gear details are fetched again after this long; distances follow the
+# activities in between
+CONF_GEAR_DETAILS_CACHE_HOURS = 24
+
+# Summary stats and weekly totals are fetched again after this long even
+# without a webhook event invalidating them
+CONF_SUMMARY_STATS_CACHE_HOURS = 12
+CONF_WEEKLY_TOTALS_CACHE_HOURS = 6
+# Sources that failed to fetch are tried again on their own after this long
+CONF_SOURCE_RETRY_SECONDS = 300
 
 STRAVA_ACTIVITY_BASE_URL = "https://www.strava.com/activities/"
 STRAVA_ACTHLETE_BASE_URL = "https://www.strava.com/dashboard"
@@ -528,6 +639,8 @@ CONF_ATTR_PRIVATE = "private"
 CONF_ATTR_POLYLINE = "polyline"
 CONF_ATTR_PR_SEGMENTS = "pr_segments"
 CONF_ATTR_KOM_SEGMENTS = "kom_segments"
+CONF_ATTR_METRICS = "metrics"
+CONF_ATTR_PHOTO_COUNT = "total_photo_count"
 
 # Device Source Tracking
 CONF_ATTR_DEVICE_NAME = "device_name"
@@ -720,3 +833,18 @@ def format_seconds_to_human_readable(seconds) -> str:
         parts.append(f"{remaining_seconds}sec")
 
     return " ".join(parts)
+
+
+def format_curve_duration(seconds: int) -> str:
+    """Format a curve window length as a short attribute label.
+
+    Examples:
+        5 → "5s"
+        300 → "5min"
+        3600 → "1h"
+    """
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600}h"
+    return f"{seconds // 60}min"
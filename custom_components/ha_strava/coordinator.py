@@ -3,15 +3,20 @@
 import asyncio
 import json
 import logging
+from collections.abc import Awaitable, Callable, Mapping
 from datetime import datetime as dt
 from datetime import timedelta
-from typing import Tuple
+from functools import cached_property
+from typing import Any, Tuple
 from zoneinfo import ZoneInfo
 
 import aiohttp
 from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import CALLBACK_TYPE
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import config_entry_oauth2_flow
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
@@ -22,18 +27,21 @@ from .const import (
     CONF_ATTR_COMMUTE,
     CONF_ATTR_END_LATLONG,
     CONF_ATTR_KOM_SEGMENTS,
+    CONF_ATTR_PHOTO_COUNT,
     CONF_ATTR_POLYLINE,
     CONF_ATTR_PR_SEGMENTS,
     CONF_ATTR_PRIVATE,
     CONF_ATTR_SPORT_TYPE,
     CONF_ATTR_START_LATLONG,
+    CONF_CURVES,
+    CONF_CURVES_FETCH_LIMIT,
     CONF_GEAR_ENABLED,
     CONF_NUM_GEAR_SENSORS,
     CONF_NUM_GEAR_SENSORS_DEFAULT,
     CONF_NUM_RECENT_ACTIVITIES,
     CONF_NUM_RECENT_ACTIVITIES_DEFAULT,
     CONF_PHOTO_CACHE_HOURS,
-    CONF_PHOTO_FETCH_DELAY_SECONDS,
+    CONF_PHOTO_FETCH_CONCURRENCY,
     CONF_PHOTO_FETCH_INITIAL_LIMIT,
     CONF_PHOTOS,
     CONF_SENSOR_ACTIVITY_TYPE,
@@ -64,10 +72,13 @@ from .const import (
     CONF_SENSOR_PR_COUNT,
     CONF_SENSOR_TITLE,
     CONF_SENSOR_TROPHIES,
+    CONF_SOURCE_RETRY_SECONDS,
     CONFIG_IMG_SIZE,
     DOMAIN,
     OAUTH2_AUTHORIZE,
     OAUTH2_TOKEN,
+    STREAM_TYPES,
+    STREAMS_CACHE_DIR,
     SUPPORTED_ACTIVITY_TYPES,
     WEEKLY_ACTIVITIES_MAX_PAGES,
     WEEKLY_ACTIVITIES_PER_PAGE,
@@ -75,13 +86,35 @@ from .const import (
     WEEKLY_SUMMARY_ACTIVITY_TYPES,
     normalize_activity_type,
 )
+from .circuit import CIRCUIT_HALF_OPEN, CircuitBreaker, CircuitOpenError
+from .curves import ActivityCurves, compute_activity_curves
+from .freshness import (
+    MISSING,
+    SOURCE_ACTIVITIES,
+    SOURCE_GEAR,
+    SOURCE_SUMMARY_STATS,
+    SOURCE_WEEKLY_TOTALS,
+    STALE,
+    SourceFreshness,
+)
+from .gear import GearMileage
+from .photos import PhotoDiscovery, PhotoFetchLog
+from .ratelimit import RateLimitThrottle
+from .spatial import ActivitySpatialIndex
+from .streams import StreamCache
 
 _LOGGER = logging.getLogger(__name__)
 
 _PHOTOS_URL_TEMPLATE = (
     f"https://www.strava.com/api/v3/activities/%s/photos?size={CONFIG_IMG_SIZE}"
 )
+# Answers that count against the API's circuit breaker
+_SERVER_ERROR_STATUSES = frozenset(range(500, 600))
 _STATS_URL_TEMPLATE = "https://www.strava.com/api/v3/athletes/%s/stats"
+_STREAMS_URL_TEMPLATE = (
+    "https://www.strava.com/api/v3/activities/%d/streams"
+    f"?keys={','.join(STREAM_TYPES)}&key_by_type=true"
+)
 
 
 class StravaDataUpdateCoordinator(DataUpdateCoordinator):
@@ -107,7 +140,21 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
                 OAUTH2_TOKEN,
             ),
         )
-        self.image_updates = {}
+        self.photo_discovery = PhotoDiscovery(self)
+        self.rate_limit = RateLimitThrottle()
+        self.api_circuit = CircuitBreaker(hass)
+        self.spatial_index = ActivitySpatialIndex()
+        self.sources = SourceFreshness()
+        # Device info by device, shared by the entities of each device.
+        # Treat the values as read-only.
+        self.device_infos: dict[tuple, DeviceInfo] = {}
+        self._weekly_totals_window: tuple[int, int] | None = None
+        # How to fetch each source whose last fetch failed, for the retry
+        self._failed_fetches: dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._unsub_retry: CALLBACK_TYPE | None = None
+        self._curves_task: asyncio.Task | None = None
+        # The options the data was last brought in line with
+        self.applied_options = dict(entry.options)
         super().__init__(
             hass,
             _LOGGER,
@@ -115,37 +162,293 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=None,  # Disable automatic polling - use webhooks only
         )
 
+    @cached_property
+    def stream_cache(self) -> StreamCache:
+        """Return the on-disk activity streams cache for this entry."""
+        return StreamCache(
+            self.hass.config.path(STREAMS_CACHE_DIR, self.entry.entry_id)
+        )
+
+    @cached_property
+    def image_updates(self) -> PhotoFetchLog:
+        """Return when each activity's photos were last fetched."""
+        return PhotoFetchLog(self.hass, self.entry.unique_id)
+
+    @cached_property
+    def curves(self) -> ActivityCurves:
+        """Return the per-activity and all-time curve cache for this athlete."""
+        return ActivityCurves(self.hass, self.entry.unique_id)
+
+    @cached_property
+    def gear_mileage(self) -> GearMileage:
+        """Return the gear as last fetched, kept current from the activities."""
+        return GearMileage(self.hass, self.entry.unique_id)
+
+    def _option(self, options: Mapping[str, Any], key: str, default: Any) -> Any:
+        """Return an option, falling back to the entry data of initial configs."""
+        if key in options:
+            return options[key]
+        return self.entry.data.get(key, default)
+
+    def _needs_refresh(self, previous: Mapping[str, Any]) -> bool:
+        """Return whether the options ask for data not fetched under the previous ones."""
+        options = self.entry.options
+        added_activity_types = set(
+            self._option(options, CONF_ACTIVITY_TYPES_TO_TRACK, [])
+        ) - set(self._option(previous, CONF_ACTIVITY_TYPES_TO_TRACK, []))
+        if added_activity_types:
+            return True
+
+        # Only the first N activities are fetched in detail
+        if self._option(
+            options, CONF_NUM_RECENT_ACTIVITIES, CONF_NUM_RECENT_ACTIVITIES_DEFAULT
+        ) > self._option(
+            previous, CONF_NUM_RECENT_ACTIVITIES, CONF_NUM_RECENT_ACTIVITIES_DEFAULT
+        ):
+            return True
+
+        if options.get(CONF_CURVES, False) and not previous.get(CONF_CURVES, False):
+            return True
+
+        if not self._option(options, CONF_GEAR_ENABLED, False):
+            return False
+        if not self._option(previous, CONF_GEAR_ENABLED, False):
+            return True
+        return self._option(
+            options, CONF_NUM_GEAR_SENSORS, CONF_NUM_GEAR_SENSORS_DEFAULT
+        ) > self._option(previous, CONF_NUM_GEAR_SENSORS, CONF_NUM_GEAR_SENSORS_DEFAULT)
+
+    async def async_apply_options(self) -> None:
+        """Bring the data in line with options changed since it was fetched.
+
+        Options asking for less than before are applied to the data already
+        held, so only options asking for more cost API calls.
+        """
+        previous = self.applied_options
+        self.applied_options = dict(self.entry.options)
+        if self._needs_refresh(previous):
+            # Weekly totals are only counted for the tracked types
+            self.sources.invalidate(SOURCE_WEEKLY_TOTALS)
+            await self.async_refresh()
+            return
+
+        data = self.data or {}
+        options = self.entry.options
+        activity_types = self._option(options, CONF_ACTIVITY_TYPES_TO_TRACK, [])
+        activities = [
+            activity
+            for activity in data.get("activities") or []
+            if activity.get(CONF_ATTR_SPORT_TYPE) in activity_types
+        ]
+        self.spatial_index.update(activities)
+        gear = data.get("gear") or []
+        if self._option(options, CONF_GEAR_ENABLED, False):
+            gear = gear[
+                : self._option(
+                    options, CONF_NUM_GEAR_SENSORS, CONF_NUM_GEAR_SENSORS_DEFAULT
+                )
+            ]
+        else:
+            gear = []
+        # Also notifies the entities, e.g. of a new distance unit
+        self.async_set_updated_data({**data, "activities": activities, "gear": gear})
+
     async def _async_update_data(self):
         """Fetch data from the Strava API.
 
         This method is called:
         1. During initial setup (async_config_entry_first_refresh)
         2. When manually triggered by webhook updates
+
+        Once there is data, a source that fails to fetch keeps its last good
+        value and is retried on its own instead of failing the whole update.
         """
         try:
             await self.oauth_session.async_ensure_token_valid()
 
-            athlete_id, activities = await self._fetch_activities()
-            raw_summary_stats = await self._fetch_summary_stats(athlete_id)
-            summary_stats = self._sensor_summary_stats(raw_summary_stats)
-            summary_stats.update(await self._fetch_weekly_totals())
-            images = await self._fetch_images(activities)
-            gear = await self._fetch_gear(athlete_id)
+            try:
+                activities_json = await self._fetch_activity_list()
+                athlete_id, activities = await self._fetch_activities(activities_json)
+            except UpdateFailed as err:
+                if self.data is None:
+                    raise
+                self._source_failed(SOURCE_ACTIVITIES, None, err)
+                activities_json = self.sources.get(SOURCE_ACTIVITIES, [])
+                activities = self.data.get("activities") or []
+                athlete_id = self.entry.unique_id
+            else:
+                self.sources.set(SOURCE_ACTIVITIES, activities_json)
+                self.spatial_index.update(activities)
+            await self._refresh_source(
+                SOURCE_SUMMARY_STATS, lambda: self._fetch_summary_stats(athlete_id)
+            )
+            if (window := self._weekly_activity_window()) != self._weekly_totals_window:
+                # A new week started
+                self._weekly_totals_window = window
+                self.sources.invalidate(SOURCE_WEEKLY_TOTALS)
+            await self._refresh_source(SOURCE_WEEKLY_TOTALS, self._fetch_weekly_totals)
+            summary_stats = self._summary_stats()
+            # Photos are discovered by self.photo_discovery in the background
+            gear = await self._update_gear(athlete_id, activities_json)
+            # Curves of new activities are computed in the background
+            await self.curves.async_load()
+            self._backfill_curves(activities)
 
             return {
                 "activities": activities,
                 "summary_stats": summary_stats,
-                "images": images,
                 "gear": gear,
+                "curves": self.curves.all_time,
             }
         except aiohttp.ClientError as err:
             _LOGGER.error(f"Error communicating with API: {err}")
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-    async def _fetch_activities(self) -> Tuple[str, list[dict]]:
-        _LOGGER.debug("Fetching activities")
+    def invalidate_for_event(self, event: Mapping[str, Any]) -> None:
+        """Mark the sources a Strava webhook event changes for the next refresh."""
+        if event.get("object_type") != "activity":
+            return
+        if event.get("aspect_type") in ("create", "delete") or {
+            "type",
+            "sport_type",
+            "private",
+        } & set(event.get("updates") or {}):
+            self.sources.invalidate(SOURCE_SUMMARY_STATS, SOURCE_WEEKLY_TOTALS)
+
+    async def _refresh_source(
+        self, source: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return a source's value, only waiting for a fetch if it has none.
+
+        A value older than the source's TTL is returned as is and fetched
+        again in the background.
+        """
+        state = self.sources.state(source)
+        if state == MISSING:
+            try:
+                value = await fetch()
+            except (aiohttp.ClientError, UpdateFailed) as err:
+                if self.sources.get(source) is None:
+                    # Nothing to fall back on
+                    raise
+                self._source_failed(source, fetch, err)
+            else:
+                self.sources.set(source, value)
+                self._failed_fetches.pop(source, None)
+        elif state == STALE and self.sources.start_revalidating(source):
+            self.hass.async_create_background_task(
+                self._async_revalidate(source, fetch),
+                name=f"{self.name} revalidate {source}",
+            )
+        return self.sources.get(source)
+
+    async def _async_revalidate(
+        self, source: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> None:
+        _LOGGER.debug(f"Revalidating stale {source}")
+        try:
+            value = await fetch()
+        except (aiohttp.ClientError, UpdateFailed) as err:
+            self._source_failed(source, fetch, err)
+            return
+        finally:
+            self.sources.done_revalidating(source)
+        self.sources.set(source, value)
+        self._failed_fetches.pop(source, None)
+        if self.data is not None:
+            self.async_set_updated_data(
+                {**self.data, "summary_stats": self._summary_stats()}
+            )
+
+    def _source_failed(
+        self,
+        source: str,
+        fetch: Callable[[], Awaitable[Any]] | None,
+        err: Exception,
+    ) -> None:
+        """Keep a source's last good value and retry just that source later."""
+        _LOGGER.warning(f"Keeping last good {source} after error: {err}")
+        self.sources.set_failed(source, err)
+        if fetch is not None:
+            self._failed_fetches[source] = fetch
+        if self._unsub_retry is None:
+            self._unsub_retry = async_call_later(
+                self.hass, CONF_SOURCE_RETRY_SECONDS, self._async_retry_failed_sources
+            )
+
+    async def _async_retry_failed_sources(self, _now) -> None:
+        """Fetch again only the sources whose last fetch failed."""
+        self._unsub_retry = None
+        if self.sources.failed(SOURCE_ACTIVITIES):
+            # The other sources are only fetched again if they need to be
+            await self.async_request_refresh()
+            return
+
+        try:
+            await self.oauth_session.async_ensure_token_valid()
+        except aiohttp.ClientError as err:
+            for source in list(self._failed_fetches):
+                self._source_failed(source, self._failed_fetches[source], err)
+            return
+        for source, fetch in list(self._failed_fetches.items()):
+            await self._refresh_source(source, fetch)
+        if self.data is not None:
+            self.async_set_updated_data(
+                {**self.data, "summary_stats": self._summary_stats()}
+            )
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending retries, the curves backfill and the circuit's cooldown."""
+        await super().async_shutdown()
+        self.api_circuit.async_shutdown()
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        if self._curves_task is not None:
+            self._curves_task.cancel()
+            self._curves_task = None
+
+    def _summary_stats(self) -> dict:
+        """Return the summary stats sensors' data from the sources' values."""
+        return {
+            **self._sensor_summary_stats(self.sources.get(SOURCE_SUMMARY_STATS, {})),
+            **self.sources.get(SOURCE_WEEKLY_TOTALS, {}),
+        }
+
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> aiohttp.ClientResponse:
+        """Send a Strava API request, failing fast while the API is down."""
+        if not self.api_circuit.allow():
+            raise CircuitOpenError(
+                "Strava API unavailable, next attempt in "
+                f"{self.api_circuit.retry_in():.0f} seconds"
+            )
+        probe = self.api_circuit.state == CIRCUIT_HALF_OPEN
         try:
             response = await self.oauth_session.async_request(
+                method=method, url=url, **kwargs
+            )
+        except Exception:
+            # Connection errors, timeouts and anything unexpected
+            self.api_circuit.record_failure()
+            raise
+        else:
+            if response.status in _SERVER_ERROR_STATUSES:
+                self.api_circuit.record_failure()
+            else:
+                self.api_circuit.record_success()
+            return response
+        finally:
+            if probe:
+                # A cancelled probe tells nothing about the API
+                self.api_circuit.release_probe()
+
+    async def _fetch_activity_list(self) -> list[dict]:
+        """Fetch the summaries of the athlete's most recent activities."""
+        _LOGGER.debug("Fetching activities")
+        try:
+            response = await self._async_request(
                 method="GET",
                 url="https://www.strava.com/api/v3/athlete/activities?per_page=200",
             )
@@ -157,6 +460,13 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
         except json.JSONDecodeError as json_err:
             _LOGGER.error(f"Invalid JSON response: {json_err}")
             raise UpdateFailed(f"Invalid JSON response: {json_err}") from json_err
+        return activities_json
+
+    async def _fetch_activities(
+        self, activities_json: list[dict] | None = None
+    ) -> Tuple[str, list[dict]]:
+        if activities_json is None:
+            activities_json = await self._fetch_activity_list()
 
         # Get selected activity types from config, default to empty list
         # Check both options (for updated configs) and data (for initial configs)
@@ -243,7 +553,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
                     f"Fetching detailed info for activity {activity_id} (type: {effective_type})"
                 )
                 try:
-                    activity_response = await self.oauth_session.async_request(
+                    activity_response = await self._async_request(
                         method="GET",
                         url=(
                             f"https://www.strava.com/api/v3/activities/{activity_id}"
@@ -327,7 +637,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
             )
             _LOGGER.debug("Fetching weekly activities page %s", page)
             try:
-                response = await self.oauth_session.async_request(method="GET", url=url)
+                response = await self._async_request(method="GET", url=url)
                 response.raise_for_status()
                 activities_json = await response.json()
             except aiohttp.ClientError as err:
@@ -373,7 +683,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _fetch_summary_stats(self, athlete_id: str) -> dict:
         _LOGGER.debug("Fetching summary stats")
-        response = await self.oauth_session.async_request(
+        response = await self._async_request(
             method="GET", url=_STATS_URL_TEMPLATE % (athlete_id,)
         )
         response.raise_for_status()
@@ -382,12 +692,23 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
         raw_data[CONF_SENSOR_ID] = athlete_id
         return raw_data
 
-    async def _fetch_images(self, activities: list[dict]):
+    async def _fetch_images(
+        self,
+        activities: list[dict],
+        on_images: Callable[[list[dict]], None] | None = None,
+    ):
+        """Fetch photos for recent activities not checked within the cache window.
+
+        Up to CONF_PHOTO_FETCH_CONCURRENCY activities are queried at once, paced
+        by self.rate_limit. on_images is called with each activity's photos as
+        soon as they are fetched.
+        """
         if not self.entry.options.get(CONF_PHOTOS, False):
             _LOGGER.debug("Fetch photos DISABLED")
             return
 
         _LOGGER.debug("Fetching images")
+        await self.image_updates.async_load()
         img_urls = []
 
         cache_threshold = dt.now() - timedelta(hours=CONF_PHOTO_CACHE_HOURS)
@@ -395,6 +716,8 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
 
         for activity in activities[:CONF_PHOTO_FETCH_INITIAL_LIMIT]:
             activity_id = activity.get(CONF_SENSOR_ID)
+            if activity.get(CONF_ATTR_PHOTO_COUNT) == 0:
+                continue
             last_update = self.image_updates.get(activity_id, dt(1990, 1, 1))
 
             if last_update > cache_threshold:
@@ -408,40 +731,111 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
 
         _LOGGER.debug(f"Fetching photos for {len(activities_to_fetch)} activities")
 
-        for activity_id in activities_to_fetch:
-            try:
-                response = await self._fetch_photo_with_retry(activity_id)
-                if response.status != 200:
-                    _LOGGER.warning(
-                        f"Failed to fetch photos for activity {activity_id}: "
-                        f"status {response.status}"
-                    )
-                    continue
+        semaphore = asyncio.Semaphore(CONF_PHOTO_FETCH_CONCURRENCY)
+
+        async def fetch(activity_id) -> list[dict]:
+            async with semaphore, self.rate_limit.async_slot() as allowed:
+                if not allowed:
+                    # Left unrecorded so a later run picks it up
+                    return []
+                return await self._fetch_activity_images(activity_id, on_images)
+
+        for activity_img_urls in await asyncio.gather(
+            *(fetch(activity_id) for activity_id in activities_to_fetch)
+        ):
+            img_urls.extend(activity_img_urls)
+
+        return img_urls
 
-                self.image_updates[activity_id] = dt.now()
-                images_data = await response.json()
-                for image in images_data:
-                    img_date = dt.strptime(
-                        image.get("created_at_local", "2000-01-01T00:00:00Z"),
-                        "%Y-%m-%dT%H:%M:%SZ",
+    async def _fetch_activity_images(
+        self,
+        activity_id: int,
+        on_images: Callable[[list[dict]], None] | None = None,
+    ) -> list[dict]:
+        activity_img_urls = []
+        try:
+            response = await self._fetch_photo_with_retry(activity_id)
+            if response.status != 200:
+                _LOGGER.warning(
+                    f"Failed to fetch photos for activity {activity_id}: "
+                    f"status {response.status}"
+                )
+                return activity_img_urls
+
+            self.image_updates[activity_id] = dt.now()
+            images_data = await response.json()
+            for image in images_data:
+                img_date = dt.strptime(
+                    image.get("created_at_local", "2000-01-01T00:00:00Z"),
+                    "%Y-%m-%dT%H:%M:%SZ",
+                )
+                img_url = list(image.get("urls").values())[0]
+                activity_img_urls.append(
+                    {
+                        "date": img_date,
+                        "url": img_url,
+                        "activity_id": activity_id,
+                    }
+                )
+            if on_images is not None and activity_img_urls:
+                on_images(activity_img_urls)
+        except Exception as err:
+            _LOGGER.error(f"Error fetching photos for activity {activity_id}: {err}")
+        return activity_img_urls
+
+    def _backfill_curves(self, activities: list[dict]) -> None:
+        """Start computing curves for new activities, unless disabled or running."""
+        if not self.entry.options.get(CONF_CURVES, False):
+            return
+        if self._curves_task is not None and not self._curves_task.done():
+            return
+        self._curves_task = self.hass.async_create_background_task(
+            self._async_backfill_curves(activities),
+            name=f"{self.name} curves backfill",
+        )
+
+    async def _async_backfill_curves(self, activities: list[dict]) -> None:
+        """Compute curves for activities not seen before, paced by self.rate_limit.
+
+        Activities left over, out of budget or whose streams failed to load
+        are picked up by the backfill after a later refresh.
+        """
+        await self.curves.async_load()
+        pending = [
+            activity
+            for activity in activities
+            if activity.get(CONF_SENSOR_ID) is not None
+            and activity[CONF_SENSOR_ID] not in self.curves
+        ]
+        added = False
+        for activity in pending[:CONF_CURVES_FETCH_LIMIT]:
+            activity_id = activity[CONF_SENSOR_ID]
+            async with self.rate_limit.async_slot() as allowed:
+                if not allowed:
+                    break
+                try:
+                    streams = await self.async_get_activity_streams(
+                        activity_id, ["time", "distance", "heartrate", "watts"]
                     )
-                    img_url = list(image.get("urls").values())[0]
-                    img_urls.append(
-                        {
-                            "date": img_date,
-                            "url": img_url,
-                            "activity_id": activity_id,
-                        }
+                except UpdateFailed as err:
+                    _LOGGER.warning(
+                        f"Skipping curves for activity {activity_id}: {err}"
                     )
+                    continue
 
-                await asyncio.sleep(CONF_PHOTO_FETCH_DELAY_SECONDS)
-            except Exception as err:
-                _LOGGER.error(
-                    f"Error fetching photos for activity {activity_id}: {err}"
-                )
-                continue
+            is_run = (
+                WEEKLY_SPORT_TYPE_TO_CATEGORY.get(activity.get(CONF_ATTR_SPORT_TYPE))
+                == "Run"
+            )
+            activity_curves = await self.hass.async_add_executor_job(
+                compute_activity_curves, streams or {}, is_run
+            )
+            if self.curves.add(activity_id, activity_curves):
+                _LOGGER.debug(f"Activity {activity_id} set new all-time bests")
+            added = True
 
-        return img_urls
+        if added and self.data is not None:
+            self.async_set_updated_data({**self.data, "curves": self.curves.all_time})
 
     async def _fetch_photo_with_retry(self, activity_id: int):
         """Fetch photo with exponential backoff retry logic."""
@@ -450,7 +844,8 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
 
         for attempt in range(CONF_API_RETRY_MAX_ATTEMPTS):
             try:
-                response = await self.oauth_session.async_request(method="GET", url=url)
+                response = await self._async_request(method="GET", url=url)
+                self.rate_limit.update(response.headers)
 
                 if response.status == 429:
                     retry_after = int(
@@ -477,6 +872,9 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
                 response.raise_for_status()
                 return response
 
+            except CircuitOpenError:
+                # Retrying can't help while the API is down
+                raise
             except aiohttp.ClientResponseError as err:
                 if err.status == 429 and attempt < CONF_API_RETRY_MAX_ATTEMPTS - 1:
                     retry_after = int(
@@ -516,6 +914,75 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
             f"Failed to fetch photos for activity {activity_id} after {CONF_API_RETRY_MAX_ATTEMPTS} attempts"
         )
 
+    async def _update_gear(
+        self, athlete_id: str, activities_json: list[dict]
+    ) -> list[dict]:
+        """Return the gear, only fetching its details when they may be out of date.
+
+        In between, distances follow the activities added, edited or deleted.
+        Details older than their TTL are fetched again in the background.
+        """
+        if not self._option(self.entry.options, CONF_GEAR_ENABLED, False):
+            _LOGGER.debug("Gear sensors are disabled, skipping gear fetch")
+            return []
+
+        num_gear_sensors = self._option(
+            self.entry.options, CONF_NUM_GEAR_SENSORS, CONF_NUM_GEAR_SENSORS_DEFAULT
+        )
+        await self.gear_mileage.async_load()
+        if (
+            self.sources.get(SOURCE_GEAR) is None
+            and self.gear_mileage.fetched is not None
+        ):
+            # Restored from storage
+            self.sources.set(
+                SOURCE_GEAR, self.gear_mileage.gear, self.gear_mileage.fetched
+            )
+
+        state = self.sources.state(SOURCE_GEAR)
+        if state == MISSING or self.gear_mileage.needs_fetch(
+            activities_json, num_gear_sensors
+        ):
+            gear = await self._fetch_gear_mileage(
+                athlete_id, activities_json, num_gear_sensors
+            )
+            # Nothing is fetched if the request failed; keep the last good gear
+            return gear or self.gear_mileage.gear
+
+        _LOGGER.debug("Updating gear distances from the activities")
+        self.gear_mileage.update(activities_json)
+        if state == STALE and self.sources.start_revalidating(SOURCE_GEAR):
+            self.hass.async_create_background_task(
+                self._async_revalidate_gear(
+                    athlete_id, activities_json, num_gear_sensors
+                ),
+                name=f"{self.name} revalidate {SOURCE_GEAR}",
+            )
+        return self.gear_mileage.gear
+
+    async def _fetch_gear_mileage(
+        self, athlete_id: str, activities_json: list[dict], num_gear_sensors: int
+    ) -> list[dict]:
+        """Fetch the gear details and count distances from these activities on."""
+        gear = await self._fetch_gear(athlete_id)
+        if gear:
+            self.gear_mileage.set_fetched(gear, activities_json, num_gear_sensors)
+            self.sources.set(SOURCE_GEAR, gear)
+        return gear
+
+    async def _async_revalidate_gear(
+        self, athlete_id: str, activities_json: list[dict], num_gear_sensors: int
+    ) -> None:
+        _LOGGER.debug(f"Revalidating stale {SOURCE_GEAR}")
+        try:
+            gear = await self._fetch_gear_mileage(
+                athlete_id, activities_json, num_gear_sensors
+            )
+        finally:
+            self.sources.done_revalidating(SOURCE_GEAR)
+        if gear and self.data is not None:
+            self.async_set_updated_data({**self.data, "gear": gear})
+
     async def _fetch_gear(self, athlete_id: str) -> list[dict]:
         """Fetch gear list from Strava API.
 
@@ -543,7 +1010,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
 
         try:
             _LOGGER.debug("Fetching athlete data to get gear list")
-            response = await self.oauth_session.async_request(
+            response = await self._async_request(
                 method="GET",
                 url="https://www.strava.com/api/v3/athlete",
             )
@@ -610,7 +1077,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
 
         try:
             _LOGGER.debug(f"Fetching gear details for gear_id: {gear_id}")
-            response = await self.oauth_session.async_request(
+            response = await self._async_request(
                 method="GET",
                 url=f"https://www.strava.com/api/v3/gear/{gear_id}",
             )
@@ -625,6 +1092,52 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.error(f"Error fetching gear {gear_id}: {e}")
             return {}
 
+    async def async_get_activity_streams(
+        self, activity_id: int, keys: list[str] | None = None
+    ) -> dict | None:
+        """Return an activity's streams, fetching them from Strava only once.
+
+        Returns None if Strava has no streams for the activity.
+        """
+        streams = await self.hass.async_add_executor_job(
+            self.stream_cache.get, activity_id, keys
+        )
+        if streams is not None:
+            return streams
+
+        try:
+            await self.oauth_session.async_ensure_token_valid()
+            response = await self._async_request(
+                method="GET", url=_STREAMS_URL_TEMPLATE % int(activity_id)
+            )
+            self.rate_limit.update(response.headers)
+            if response.status == 404:
+                _LOGGER.debug(f"No streams available for activity {activity_id}")
+                return None
+            response.raise_for_status()
+            payload = await response.json()
+        except aiohttp.ClientError as err:
+            raise UpdateFailed(
+                f"Error fetching streams for activity {activity_id}: {err}"
+            ) from err
+
+        raw_streams = {
+            key: stream.get("data") or []
+            for key, stream in payload.items()
+            if key in STREAM_TYPES and isinstance(stream, dict)
+        }
+        return await self.hass.async_add_executor_job(
+            self._store_streams, activity_id, raw_streams, keys
+        )
+
+    def _store_streams(
+        self, activity_id: int | str, raw_streams: dict, keys: list[str] | None
+    ) -> dict:
+        """Cache raw streams and return them as they decode from the cache."""
+        size = self.stream_cache.put(activity_id, raw_streams)
+        _LOGGER.debug(f"Cached streams for activity {activity_id} ({size} bytes)")
+        return self.stream_cache.get(activity_id, keys) or {}
+
     async def async_update_activity(
         self, activity_id: int | str, **fields: dict
     ) -> None:
@@ -642,7 +1155,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
 
         for attempt in range(CONF_API_RETRY_MAX_ATTEMPTS):
             try:
-                response = await self.oauth_session.async_request(
+                response = await self._async_request(
                     method="PUT",
                     url=url,
                     json=payload,
@@ -672,6 +1185,10 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
                 updated_activity = await response.json()
                 break
 
+            except CircuitOpenError as err:
+                raise UpdateFailed(
+                    f"Error updating activity {activity_id}: {err}"
+                ) from err
             except aiohttp.ClientResponseError as err:
                 if err.status in (401, 403):
                     raise ConfigEntryAuthFailed(
@@ -722,6 +1239,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
             updated_activity,
             sport_type=updated_activity.get("sport_type"),
         )
+        self.spatial_index.upsert(processed)
         current_data = self.data or {}
         current_activities = current_data.get("activities") or []
         new_activities = []
@@ -762,7 +1280,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
             return
 
         try:
-            response = await self.oauth_session.async_request(
+            response = await self._async_request(
                 method="GET",
                 url=(
                     f"https://www.strava.com/api/v3/activities/{activity_id}"
@@ -781,6 +1299,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
             return
 
         processed_activity = self._sensor_activity(activity_detail, activity_detail)
+        self.spatial_index.upsert(processed_activity)
 
         current_data = self.data or {}
         current_activities = current_data.get("activities") or []
@@ -915,6 +1434,7 @@ class StravaDataUpdateCoordinator(DataUpdateCoordinator):
             CONF_ATTR_POLYLINE: activity.get("map", {}).get("summary_polyline", ""),
             CONF_ATTR_PR_SEGMENTS: pr_segments,
             CONF_ATTR_KOM_SEGMENTS: kom_segments,
+            CONF_ATTR_PHOTO_COUNT: activity.get("total_photo_count"),
             # Activity Details
             CONF_SENSOR_CALORIES: calories_kcal,
             # Device source tracking
@@ -0,0 +1,218 @@
+"""Mean-maximal power/heart rate curves plus running pace and best efforts.
+
+Curves are computed once per activity from its streams with vectorized
+sliding windows, cached per activity in Home Assistant storage and folded into
+an all-time curve, so a new upload only costs that one activity's computation.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CURVE_BEST_EFFORT_DISTANCES,
+    CURVE_BEST_EFFORTS,
+    CURVE_DURATIONS,
+    CURVE_HEARTRATE,
+    CURVE_PACE,
+    CURVE_POWER,
+    DOMAIN,
+)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}_curves"
+STORAGE_SAVE_DELAY_SECONDS = 30
+
+# Gaps longer than this (auto-pause, dropped samples) count as zero power
+# rather than stretching the last reading across the pause.
+_MAX_SAMPLE_GAP_SECONDS = 5
+
+# Curves measured in time (seconds, seconds per km) where a lower value wins.
+_LOWER_IS_BETTER = {CURVE_BEST_EFFORTS, CURVE_PACE}
+
+
+def _resample_1hz(
+    time: np.ndarray, values: np.ndarray, gap_fill: float | None = None
+) -> np.ndarray:
+    """Resample a series onto a 1 second grid by carrying samples forward."""
+    grid = np.arange(time[0], time[-1] + 1)
+    idx = np.searchsorted(time, grid, side="right") - 1
+    resampled = values[idx]
+    if gap_fill is not None:
+        resampled = np.where(
+            grid - time[idx] > _MAX_SAMPLE_GAP_SECONDS, gap_fill, resampled
+        )
+    return resampled
+
+
+def mean_maximal(
+    values: np.ndarray, durations: tuple[int, ...] = CURVE_DURATIONS
+) -> dict[str, float]:
+    """Return the best average of a 1 Hz series over each window length."""
+    cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    curve = {}
+    for duration in durations:
+        if duration > len(values):
+            break
+        window_sums = cumsum[duration:] - cumsum[:-duration]
+        curve[str(duration)] = round(float(window_sums.max()) / duration, 1)
+    return curve
+
+
+def best_pace(
+    time: np.ndarray,
+    distance: np.ndarray,
+    durations: tuple[int, ...] = CURVE_DURATIONS,
+) -> dict[str, float]:
+    """Return the fastest pace in seconds per km held over each window length."""
+    grid = np.arange(time[0], time[-1] + 1)
+    # Interpolate rather than carry forward so distance accrues smoothly
+    # across sparse samples instead of jumping at the next one.
+    cumulative = np.interp(grid, time, distance)
+    curve = {}
+    for duration in durations:
+        if duration >= len(cumulative):
+            break
+        best_distance = float((cumulative[duration:] - cumulative[:-duration]).max())
+        if best_distance > 0:
+            curve[str(duration)] = round(duration * 1000 / best_distance, 1)
+    return curve
+
+
+def best_efforts(
+    time: np.ndarray,
+    distance: np.ndarray,
+    targets: dict[str, float] = CURVE_BEST_EFFORT_DISTANCES,
+) -> dict[str, float]:
+    """Return the fastest elapsed time in seconds to cover each target distance.
+
+    distance must be cumulative and non-decreasing.
+    """
+    efforts = {}
+    for name, target in targets.items():
+        if distance[-1] - distance[0] < target:
+            continue
+        goal = distance + target
+        ends = np.searchsorted(distance, goal, side="left")
+        starts = np.nonzero(ends < len(distance))[0]
+        ends = ends[starts]
+
+        # Interpolate the exact moment the target distance is crossed between
+        # the last sample short of it and the first sample past it.
+        d_prev = distance[ends - 1]
+        d_end = distance[ends]
+        span = d_end - d_prev
+        fraction = np.divide(
+            goal[starts] - d_prev, span, out=np.ones_like(span), where=span > 0
+        )
+        crossing = time[ends - 1] + fraction * (time[ends] - time[ends - 1])
+        efforts[name] = round(float((crossing - time[starts]).min()), 1)
+    return efforts
+
+
+def compute_activity_curves(streams: dict, include_running: bool) -> dict:
+    """Compute all curves available from one activity's streams.
+
+    Pace and best efforts are only meaningful for runs, so they are skipped
+    unless include_running is set. Runs CPU-bound numpy code; call it from
+    the executor.
+    """
+    raw_time = streams.get("time")
+    if not raw_time or len(raw_time) < 2:
+        return {}
+
+    time = np.asarray(raw_time, dtype=np.float64)
+    curves = {}
+
+    if watts := streams.get("watts"):
+        power = _resample_1hz(time, np.asarray(watts, dtype=np.float64), 0.0)
+        if power.any():
+            curves[CURVE_POWER] = mean_maximal(power)
+
+    if heartrate := streams.get("heartrate"):
+        hr = _resample_1hz(time, np.asarray(heartrate, dtype=np.float64))
+        if hr.any():
+            curves[CURVE_HEARTRATE] = mean_maximal(hr)
+
+    if include_running and (raw_distance := streams.get("distance")):
+        # GPS noise can make cumulative distance dip slightly; both pace and
+        # best efforts need a non-decreasing series.
+        distance = np.maximum.accumulate(np.asarray(raw_distance, dtype=np.float64))
+        if pace := best_pace(time, distance):
+            curves[CURVE_PACE] = pace
+        if efforts := best_efforts(time, distance):
+            curves[CURVE_BEST_EFFORTS] = efforts
+
+    return curves
+
+
+def merge_curves(all_time: dict, curves: dict, activity_id) -> bool:
+    """Fold one activity's curves into the all-time bests in place.
+
+    Returns True if any all-time value improved.
+    """
+    improved = False
+    for kind, points in curves.items():
+        best_points = all_time.setdefault(kind, {})
+        lower_is_better = kind in _LOWER_IS_BETTER
+        for key, value in points.items():
+            best = best_points.get(key)
+            if (
+                best is None
+                or (lower_is_better and value < best["value"])
+                or (not lower_is_better and value > best["value"])
+            ):
+                best_points[key] = {"value": value, "activity_id": activity_id}
+                improved = True
+    return improved
+
+
+class ActivityCurves:
+    """Per-activity curve cache plus the all-time curve derived from it."""
+
+    def __init__(self, hass: HomeAssistant, athlete_id: str):
+        """Initialize an empty curve cache for an athlete."""
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{athlete_id}")
+        self._activities: dict[str, dict] = {}
+        self.all_time: dict = {}
+        self._loaded = False
+
+    def __contains__(self, activity_id) -> bool:
+        """Return True if curves for the activity have been computed."""
+        return str(activity_id) in self._activities
+
+    async def async_load(self) -> None:
+        """Load cached curves from storage once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load()
+        if not data:
+            return
+        self._activities = data.get("activities", {})
+        self.all_time = data.get("all_time", {})
+
+    def add(self, activity_id, curves: dict) -> bool:
+        """Cache an activity's curves and merge them into the all-time curve."""
+        self._activities[str(activity_id)] = curves
+        improved = merge_curves(self.all_time, curves, activity_id)
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY_SECONDS)
+        return improved
+
+    def remove(self, activity_id) -> None:
+        """Forget an activity and rebuild the all-time curve without it."""
+        if self._activities.pop(str(activity_id), None) is None:
+            return
+        self.all_time = {}
+        for cached_id, curves in self._activities.items():
+            merge_curves(
+                self.all_time,
+                curves,
+                int(cached_id) if cached_id.isdigit() else cached_id,
+            )
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY_SECONDS)
+
+    def _data_to_save(self) -> dict:
+        return {"activities": self._activities, "all_time": self.all_time}
@@ -0,0 +1,24 @@
+"""Diagnostics support for Strava."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .camera import DATA_CAMERAS
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    camera = hass.data.get(DATA_CAMERAS, {}).get(entry.entry_id)
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    return {
+        "camera": camera.diagnostics if camera else None,
+        "sources": coordinator.sources.diagnostics if coordinator else None,
+        "api_circuit": coordinator.api_circuit.diagnostics if coordinator else None,
+    }
@@ -0,0 +1,170 @@
+"""Keep each platform's entities in step with the entry's options and data.
+
+Platforms hand over a function building the entities their options call for,
+together with their add callback. When the options change, the entities are
+built again: those with a new unique_id are added through the callback and
+those no longer built are disabled, so the entry doesn't need a reload.
+Disabling rather than removing keeps the user's customisations, and an
+entity disabled this way is enabled again once it is built again.
+Entities for things first seen in a coordinator update, like a new bike,
+are added the same way.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import StravaDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Entity syncs by config entry id, one per platform
+DATA_ENTITY_SYNC = f"{DOMAIN}_entity_sync"
+
+
+class EntitySync:
+    """The entities a platform built from its entry's options."""
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        build: Callable[[], Iterable[Entity]],
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Initialize with the platform's entity builder and add callback."""
+        self._entry = entry
+        self._build = build
+        self._async_add_entities = async_add_entities
+        self._entities: dict[str, Entity] = {}
+
+    @callback
+    def async_add_new(self) -> dict[str, Entity]:
+        """Add the built entities not added yet and return all built ones."""
+        wanted = {entity.unique_id: entity for entity in self._build()}
+        self._async_add(wanted)
+        return wanted
+
+    @callback
+    def _async_add(self, wanted: dict[str, Entity]) -> None:
+        """Add the entities in wanted that are not added yet."""
+        new_entities = [
+            entity
+            for unique_id, entity in wanted.items()
+            if unique_id not in self._entities
+        ]
+        for entity in new_entities:
+            self._track(entity)
+        if new_entities:
+            self._async_add_entities(new_entities)
+
+    async def async_sync(self, hass: HomeAssistant) -> None:
+        """Add newly built entities and disable those no longer built."""
+        wanted = {entity.unique_id: entity for entity in self._build()}
+        registry = er.async_get(hass)
+
+        # Enable what was disabled here before adding, or adding is aborted
+        for registry_entry in er.async_entries_for_config_entry(
+            registry, self._entry.entry_id
+        ):
+            if (
+                registry_entry.unique_id in wanted
+                and registry_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+            ):
+                _LOGGER.debug("Enabling %s, configured again", registry_entry.entity_id)
+                registry.async_update_entity(registry_entry.entity_id, disabled_by=None)
+        self._async_add(wanted)
+
+        for unique_id, entity in list(self._entities.items()):
+            if unique_id in wanted:
+                continue
+            _LOGGER.debug("Disabling %s, no longer configured", entity.entity_id)
+            if registry.async_get(entity.entity_id):
+                # The entity removes itself when its registry entry is disabled
+                registry.async_update_entity(
+                    entity.entity_id,
+                    disabled_by=er.RegistryEntryDisabler.INTEGRATION,
+                )
+            else:
+                await entity.async_remove(force_remove=True)
+
+    def _track(self, entity: Entity) -> None:
+        """Track an entity until it is removed, however that happens."""
+        unique_id = entity.unique_id
+        self._entities[unique_id] = entity
+
+        @callback
+        def forget() -> None:
+            if self._entities.get(unique_id) is entity:
+                del self._entities[unique_id]
+
+        # Also called when adding is aborted, e.g. for disabled entities
+        entity.async_on_remove(forget)
+
+
+@callback
+def async_track_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    build: Callable[[], Iterable[Entity]],
+) -> EntitySync:
+    """Add the entities built for the entry and follow later options changes."""
+    syncs: list[EntitySync] = hass.data.setdefault(DATA_ENTITY_SYNC, {}).setdefault(
+        entry.entry_id, []
+    )
+    sync = EntitySync(entry, build, async_add_entities)
+    syncs.append(sync)
+
+    @callback
+    def untrack() -> None:
+        syncs.remove(sync)
+        if not syncs:
+            hass.data[DATA_ENTITY_SYNC].pop(entry.entry_id, None)
+
+    entry.async_on_unload(untrack)
+    sync.async_add_new()
+    return sync
+
+
+@callback
+def async_discover_entities(
+    entry: ConfigEntry,
+    coordinator: StravaDataUpdateCoordinator,
+    sync: EntitySync,
+    discovered: Callable[[], set[str]],
+) -> None:
+    """Add entities for things first seen in a coordinator update.
+
+    discovered returns what the platform builds entities for, e.g. gear ids.
+    Entities are only built again when it returns something new, and an
+    update never removes any.
+    """
+    seen = discovered()
+
+    @callback
+    def discover() -> None:
+        nonlocal seen
+        found = discovered()
+        if found - seen:
+            _LOGGER.debug("Adding entities for %s", ", ".join(sorted(found - seen)))
+            sync.async_add_new()
+        seen = found
+
+    entry.async_on_unload(coordinator.async_add_listener(discover))
+
+
+async def async_sync_entities(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Rebuild every platform's entities for the entry's current options."""
+    for sync in list(hass.data.get(DATA_ENTITY_SYNC, {}).get(entry.entry_id, [])):
+        await sync.async_sync(hass)
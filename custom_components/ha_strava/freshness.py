@@ -0,0 +1,136 @@
+"""Per-source freshness of data that changes more slowly than the activities.
+
+Every webhook refreshes the activity list, but the summary stats and weekly
+totals only change when an activity is added, deleted or changes type, and
+gear details hardly ever change. Each such source keeps its last value with
+when it was fetched:
+
+- fresh: the value is served without an API call
+- stale: older than the source's TTL; the value is still served while it is
+  fetched again in the background (stale-while-revalidate)
+- missing: never fetched, or invalidated by an event that changed it, and
+  fetched before the refresh completes
+
+The activities themselves are fetched on every refresh and never go stale.
+A source that fails to fetch keeps its last good value and is marked failed
+until a later fetch succeeds, so only its own sensors are affected.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_GEAR_DETAILS_CACHE_HOURS,
+    CONF_SUMMARY_STATS_CACHE_HOURS,
+    CONF_WEEKLY_TOTALS_CACHE_HOURS,
+)
+
+SOURCE_ACTIVITIES = "activities"
+SOURCE_SUMMARY_STATS = "summary_stats"
+SOURCE_WEEKLY_TOTALS = "weekly_totals"
+SOURCE_GEAR = "gear"
+
+FRESH = "fresh"
+STALE = "stale"
+MISSING = "missing"
+
+DEFAULT_TTLS: dict[str, timedelta | None] = {
+    SOURCE_ACTIVITIES: None,
+    SOURCE_SUMMARY_STATS: timedelta(hours=CONF_SUMMARY_STATS_CACHE_HOURS),
+    SOURCE_WEEKLY_TOTALS: timedelta(hours=CONF_WEEKLY_TOTALS_CACHE_HOURS),
+    SOURCE_GEAR: timedelta(hours=CONF_GEAR_DETAILS_CACHE_HOURS),
+}
+
+
+class SourceFreshness:
+    """The last value of each slowly changing source and when it was fetched."""
+
+    def __init__(self, ttls: Mapping[str, timedelta | None] = DEFAULT_TTLS):
+        """Initialize with nothing fetched."""
+        self._ttls = dict(ttls)
+        self._values: dict[str, Any] = {}
+        self._fetched: dict[str, datetime] = {}
+        self._invalidated: set[str] = set()
+        self._revalidating: set[str] = set()
+        self._errors: dict[str, str] = {}
+
+    def state(self, source: str) -> str:
+        """Return whether a source is fresh, stale or missing."""
+        fetched = self._fetched.get(source)
+        if fetched is None or source in self._invalidated:
+            return MISSING
+        ttl = self._ttls.get(source)
+        if ttl is not None and dt_util.utcnow() - fetched > ttl:
+            return STALE
+        return FRESH
+
+    def get(self, source: str, default: Any = None) -> Any:
+        """Return the last value fetched for a source."""
+        return self._values.get(source, default)
+
+    def set(self, source: str, value: Any, fetched: datetime | None = None) -> None:
+        """Record a value fetched now, or at the time given."""
+        self._values[source] = value
+        self._fetched[source] = fetched or dt_util.utcnow()
+        self._invalidated.discard(source)
+        self._errors.pop(source, None)
+
+    def set_failed(self, source: str, err: Exception) -> None:
+        """Record a failed fetch; the last good value is kept."""
+        self._errors[source] = str(err) or type(err).__name__
+
+    def failed(self, source: str) -> bool:
+        """Return whether the last fetch of a source failed."""
+        return source in self._errors
+
+    @property
+    def failed_sources(self) -> set[str]:
+        """Return the sources whose last fetch failed."""
+        return set(self._errors)
+
+    def invalidate(self, *sources: str) -> None:
+        """Mark sources as changed, so they are fetched on the next refresh."""
+        self._invalidated.update(source for source in sources if source in self._ttls)
+
+    def start_revalidating(self, source: str) -> bool:
+        """Return True if a stale source isn't being fetched in the background yet."""
+        if source in self._revalidating:
+            return False
+        self._revalidating.add(source)
+        return True
+
+    def done_revalidating(self, source: str) -> None:
+        """Record that the background fetch of a source has finished."""
+        self._revalidating.discard(source)
+
+    def ages(self) -> dict[str, float | None]:
+        """Return how many seconds ago each source was fetched."""
+        now = dt_util.utcnow()
+        return {
+            source: (
+                round((now - fetched).total_seconds())
+                if (fetched := self._fetched.get(source)) is not None
+                else None
+            )
+            for source in self._ttls
+        }
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the state and age of each source for config entry diagnostics."""
+        ages = self.ages()
+        return {
+            source: {
+                "state": self.state(source),
+                "age_seconds": ages[source],
+                "ttl_seconds": int(ttl.total_seconds()) if ttl is not None else None,
+                "revalidating": source in self._revalidating,
+                "error": self._errors.get(source),
+            }
+            for source, ttl in self._ttls.items()
+        }
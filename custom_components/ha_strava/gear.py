@@ -0,0 +1,154 @@
+"""Gear distances kept current from the activity list between gear fetches.
+
+Fetching gear costs a call for the athlete plus one per gear item. The details
+are only fetched again when the coordinator's freshness schedule says they're
+stale, when the number of gear sensors changes or when an activity uses gear
+not seen before. In between, every refresh compares the activity list with
+the one seen last: new and edited activities add their distance to their gear
+and deleted ones take it off again.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}_gear"
+STORAGE_SAVE_DELAY_SECONDS = 30
+
+
+def _activity_mileage(activities: list[dict]) -> dict[int, tuple]:
+    """Return each summary activity's gear id, distance and start date by id."""
+    return {
+        int(activity["id"]): (
+            activity.get("gear_id"),
+            activity.get("distance") or 0.0,
+            activity.get("start_date") or "",
+        )
+        for activity in activities
+        if activity.get("id") is not None
+    }
+
+
+class GearMileage:
+    """The gear as last fetched, with distances moved by activities since.
+
+    Persisted so a restart doesn't cost a gear fetch inside the cache window.
+    """
+
+    def __init__(self, hass: HomeAssistant, athlete_id: str):
+        """Initialize without any fetched gear."""
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{athlete_id}")
+        self._gear: list[dict] = []
+        self._fetched: datetime | None = None
+        self._limit: int | None = None
+        self._activities: dict[int, tuple] = {}
+        self._gear_ids: set[str] = set()
+        self._loaded = False
+
+    @property
+    def gear(self) -> list[dict]:
+        """Return the gear with its current distances."""
+        return self._gear
+
+    @property
+    def fetched(self) -> datetime | None:
+        """Return when the gear details were last fetched."""
+        return self._fetched
+
+    def needs_fetch(self, activities: list[dict], limit: int) -> bool:
+        """Return whether the gear details have to be fetched again."""
+        if self._fetched is None or limit != self._limit:
+            return True
+        return any(
+            activity.get("gear_id") and activity["gear_id"] not in self._gear_ids
+            for activity in activities
+        )
+
+    def set_fetched(self, gear: list[dict], activities: list[dict], limit: int) -> None:
+        """Record freshly fetched gear, whose distances count these activities."""
+        self._gear = gear
+        self._fetched = dt_util.utcnow()
+        self._limit = limit
+        self._activities = _activity_mileage(activities)
+        self._gear_ids = {str(item["id"]) for item in gear if item.get("id")}
+        self._gear_ids.update(
+            gear_id for gear_id, _, _ in self._activities.values() if gear_id
+        )
+        self._save()
+
+    def update(self, activities: list[dict]) -> None:
+        """Move gear distances by the activities changed since the last list."""
+        current = _activity_mileage(activities)
+        if current == self._activities:
+            return
+
+        # The list only holds the most recent activities, so activities
+        # sliding in or out at its old end weren't added or deleted
+        oldest = min((start for _, _, start in current.values()), default="")
+        previous_oldest = min(
+            (start for _, _, start in self._activities.values()), default=""
+        )
+        changes: dict[str, float] = {}
+        for activity_id in self._activities.keys() | current.keys():
+            seen = self._activities.get(activity_id)
+            now = current.get(activity_id)
+            if seen == now:
+                continue
+            if seen is None and now[2] < previous_oldest:
+                continue
+            if now is None and seen[2] < oldest:
+                continue
+            if seen and seen[0]:
+                changes[seen[0]] = changes.get(seen[0], 0.0) - seen[1]
+            if now and now[0]:
+                changes[now[0]] = changes.get(now[0], 0.0) + now[1]
+
+        self._gear = [
+            (
+                {**item, "distance": max(item.get("distance", 0) + change, 0)}
+                if (change := changes.get(str(item.get("id")))) is not None
+                else item
+            )
+            for item in self._gear
+        ]
+        self._activities = current
+        self._save()
+
+    async def async_load(self) -> None:
+        """Load the gear and the activities counted from storage once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load()
+        if not data or self._fetched is not None:
+            return
+        self._gear = data["gear"]
+        self._fetched = datetime.fromisoformat(data["fetched"])
+        self._limit = data["limit"]
+        self._activities = {
+            int(activity_id): tuple(mileage)
+            for activity_id, mileage in data["activities"].items()
+        }
+        self._gear_ids = set(data["gear_ids"])
+
+    def _save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY_SECONDS)
+
+    def _data_to_save(self) -> dict:
+        return {
+            "gear": self._gear,
+            "fetched": self._fetched.isoformat(),
+            "limit": self._limit,
+            "activities": {
+                str(activity_id): list(mileage)
+                for activity_id, mileage in self._activities.items()
+            },
+            "gear_ids": sorted(self._gear_ids),
+        }
@@ -0,0 +1,230 @@
+"""Image platform: the primary photo of each recent activity."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_NUM_RECENT_ACTIVITIES,
+    CONF_NUM_RECENT_ACTIVITIES_DEFAULT,
+    CONF_PHOTOS,
+    CONF_SENSOR_ID,
+    DOMAIN,
+    generate_recent_activity_device_id,
+    generate_recent_activity_device_name,
+    get_athlete_name_from_title,
+)
+from .coordinator import StravaDataUpdateCoordinator
+from .entity_sync import async_track_entities
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}_primary_photos"
+STORAGE_SAVE_DELAY_SECONDS = 30
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up an image entity per recent activity."""
+    if not entry.options.get(CONF_PHOTOS, False):
+        return
+
+    coordinator: StravaDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    primary_photos = PrimaryPhotos(hass, entry.unique_id)
+    await primary_photos.async_load()
+
+    def num_recent_activities() -> int:
+        return entry.options.get(
+            CONF_NUM_RECENT_ACTIVITIES, CONF_NUM_RECENT_ACTIVITIES_DEFAULT
+        )
+
+    @callback
+    def retain_recent() -> None:
+        activities = (coordinator.data or {}).get("activities") or []
+        primary_photos.retain(
+            {
+                activity.get(CONF_SENSOR_ID)
+                for activity in activities[: num_recent_activities()]
+            }
+        )
+
+    def build() -> list[StravaRecentActivityImage]:
+        return [
+            StravaRecentActivityImage(
+                coordinator=coordinator,
+                hass=hass,
+                primary_photos=primary_photos,
+                athlete_id=entry.unique_id,
+                athlete_name=get_athlete_name_from_title(entry.title),
+                activity_index=index,
+            )
+            for index in range(num_recent_activities())
+        ]
+
+    # Registered before the entities so they never see a pruned photo
+    entry.async_on_unload(coordinator.async_add_listener(retain_recent))
+    async_track_entities(hass, entry, async_add_entities, build)
+
+
+class PrimaryPhotos:
+    """The first photo found for each activity, and when it was found.
+
+    Persisted so image entities keep their photo and image_last_updated
+    across restarts instead of waiting for photo discovery.
+    """
+
+    def __init__(self, hass: HomeAssistant, athlete_id: str):
+        """Initialize an empty set of photos for an athlete."""
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{athlete_id}")
+        self._photos: dict[int, dict] = {}
+
+    def get(self, activity_id: int | None) -> dict | None:
+        """Return an activity's primary photo URL and when it was found."""
+        return self._photos.get(activity_id)
+
+    def add(self, images: list[dict]) -> None:
+        """Record the first photo of each activity not seen before."""
+        changed = False
+        for image in images:
+            activity_id = image["activity_id"]
+            if activity_id in self._photos:
+                continue
+            self._photos[activity_id] = {
+                "url": image["url"],
+                "updated": dt_util.utcnow(),
+            }
+            changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY_SECONDS)
+
+    def retain(self, activity_ids: set[int]) -> None:
+        """Forget photos of activities that are no longer shown."""
+        stale = self._photos.keys() - activity_ids
+        for activity_id in stale:
+            del self._photos[activity_id]
+        if stale:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY_SECONDS)
+
+    async def async_load(self) -> None:
+        """Load the photos from storage."""
+        data = await self._store.async_load() or {}
+        for activity_id, photo in data.items():
+            self._photos[int(activity_id)] = {
+                "url": photo["url"],
+                "updated": datetime.fromisoformat(photo["updated"]),
+            }
+
+    def _data_to_save(self) -> dict:
+        return {
+            str(activity_id): {
+                "url": photo["url"],
+                "updated": photo["updated"].isoformat(),
+            }
+            for activity_id, photo in self._photos.items()
+        }
+
+
+class StravaRecentActivityImage(CoordinatorEntity, ImageEntity):
+    """The primary photo of the Nth most recent activity.
+
+    image_last_updated only moves when the photo itself changes, so the
+    frontend downloads each photo once instead of polling a camera stream.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: StravaDataUpdateCoordinator,
+        hass: HomeAssistant,
+        primary_photos: PrimaryPhotos,
+        athlete_id: str,
+        athlete_name: str,
+        activity_index: int,
+    ) -> None:
+        """Initialize the image entity."""
+        CoordinatorEntity.__init__(self, coordinator)
+        ImageEntity.__init__(self, hass)
+        self._primary_photos = primary_photos
+        self._athlete_id = athlete_id
+        self._athlete_name = athlete_name
+        self._activity_index = activity_index
+        self._attr_unique_id = f"strava_{athlete_id}_recent_{activity_index + 1}_photo"
+        self._attr_name = "Photo"
+        self._attr_image_url = None
+        self._update_image()
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        return {
+            "identifiers": {
+                (
+                    DOMAIN,
+                    generate_recent_activity_device_id(
+                        self._athlete_id,
+                        self._activity_index,
+                    ),
+                )
+            },
+            "name": generate_recent_activity_device_name(
+                self._athlete_name,
+                self._activity_index,
+            ),
+            "manufacturer": "Powered by Strava",
+            "model": "Recent Activity",
+        }
+
+    @property
+    def available(self) -> bool:
+        return self._get_activity() is not None
+
+    def _get_activity(self) -> dict | None:
+        data = self.coordinator.data or {}
+        activities = data.get("activities") or []
+        if activities and len(activities) > self._activity_index:
+            return activities[self._activity_index]
+        return None
+
+    def _update_image(self) -> bool:
+        """Point the entity at its activity's primary photo; True if it changed."""
+        activity = self._get_activity()
+        photo = self._primary_photos.get(activity and activity.get(CONF_SENSOR_ID))
+        url = photo["url"] if photo else None
+        if url == self._attr_image_url:
+            return False
+        self._attr_image_url = url
+        self._attr_image_last_updated = photo["updated"] if photo else None
+        self._cached_image = None
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        """Follow newly discovered photos."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.photo_discovery.async_add_listener(self._handle_new_photos)
+        )
+
+    @callback
+    def _handle_new_photos(self, images: list[dict]) -> None:
+        self._primary_photos.add(images)
+        if self._update_image():
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_image()
+        super()._handle_coordinator_update()
@@ -0,0 +1,225 @@
+"""Two-tier byte cache for camera photos.
+
+A small in-memory LRU serves the frames a dashboard keeps polling; behind it a
+size-bounded on-disk LRU keeps every photo in the rotation, so each photo is
+downloaded from the CDN once and survives restarts. Frames resized for
+dashboard tiles are kept in a separate memory LRU keyed by photo and size.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from homeassistant.core import HomeAssistant
+from PIL import Image, UnidentifiedImageError
+
+from .const import (
+    CONF_IMAGE_DISK_CACHE_MAX_BYTES,
+    CONF_IMAGE_JPEG_QUALITY,
+    CONF_IMAGE_MEMORY_CACHE_SIZE,
+    CONF_IMAGE_SCALED_CACHE_SIZE,
+    CONF_IMAGE_SIZE_STEP,
+    CONF_MAX_NB_IMAGES,
+    CONFIG_IMG_SIZE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_FILE_SUFFIX = ".img"
+
+
+def scaled_size(width: int | None, height: int | None) -> tuple[int, int] | None:
+    """Round a requested frame size up to the cache step.
+
+    Returns None when no downscaling is needed: nothing was requested or the
+    request is at least as large as the photos Strava serves.
+    """
+    if not width and not height:
+        return None
+    width = width or CONFIG_IMG_SIZE
+    height = height or CONFIG_IMG_SIZE
+    if width >= CONFIG_IMG_SIZE and height >= CONFIG_IMG_SIZE:
+        return None
+    return tuple(
+        math.ceil(side / CONF_IMAGE_SIZE_STEP) * CONF_IMAGE_SIZE_STEP
+        for side in (width, height)
+    )
+
+
+def scale_image(data: bytes, size: tuple[int, int]) -> bytes:
+    """Shrink an image to fit within size and re-encode it as JPEG.
+
+    Aspect ratio is kept and images are never upscaled; undecodable data is
+    returned unchanged. Blocks on decoding, so call it from the executor.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width <= size[0] and image.height <= size[1]:
+                return data
+            # Lets the JPEG decoder skip straight to a reduced scale
+            image.draft("RGB", size)
+            frame = image.convert("RGB")
+    except (UnidentifiedImageError, OSError) as err:
+        _LOGGER.debug(f"Serving image unscaled, could not decode it: {err}")
+        return data
+
+    frame.thumbnail(size, Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    frame.save(output, format="JPEG", quality=CONF_IMAGE_JPEG_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+class ImageCache:
+    """Memory LRU in front of a disk LRU, keyed by the photo's URL hash."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        directory: str,
+        max_items: int = CONF_MAX_NB_IMAGES,
+        memory_items: int = CONF_IMAGE_MEMORY_CACHE_SIZE,
+        max_bytes: int = CONF_IMAGE_DISK_CACHE_MAX_BYTES,
+    ):
+        """Initialize the cache; the directory is created on first write."""
+        self._hass = hass
+        self._directory = directory
+        self._max_items = max_items
+        self._memory_items = memory_items
+        self._max_bytes = max_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._scaled: OrderedDict[tuple[str, int, int], bytes] = OrderedDict()
+        self._disk: OrderedDict[str, int] | None = None
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Return cached bytes for a key, or None on a miss."""
+        if (data := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+            return data
+
+        data = await self._hass.async_add_executor_job(self._disk_get, key)
+        if data is not None:
+            self._remember(key, data)
+        return data
+
+    async def async_put(self, key: str, data: bytes) -> None:
+        """Store bytes for a key in both tiers."""
+        self._remember(key, data)
+        await self._hass.async_add_executor_job(self._disk_put, key, data)
+
+    def get_scaled(self, key: str, size: tuple[int, int]) -> bytes | None:
+        """Return a resized frame if one is cached."""
+        scaled_key = (key, *size)
+        if (data := self._scaled.get(scaled_key)) is not None:
+            self._scaled.move_to_end(scaled_key)
+        return data
+
+    async def async_scale(self, key: str, data: bytes, size: tuple[int, int]) -> bytes:
+        """Resize a photo in the executor and cache the result."""
+        scaled = await self._hass.async_add_executor_job(scale_image, data, size)
+        self._scaled[(key, *size)] = scaled
+        while len(self._scaled) > CONF_IMAGE_SCALED_CACHE_SIZE:
+            self._scaled.popitem(last=False)
+        return scaled
+
+    async def async_retain(self, keys: Iterable[str]) -> None:
+        """Drop every cached photo that is no longer in the rotation."""
+        keep = set(keys)
+        for key in [key for key in self._memory if key not in keep]:
+            del self._memory[key]
+        for scaled_key in [key for key in self._scaled if key[0] not in keep]:
+            del self._scaled[scaled_key]
+        await self._hass.async_add_executor_job(self._disk_retain, keep)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}{_FILE_SUFFIX}")
+
+    def _ensure_loaded(self) -> OrderedDict[str, int]:
+        """Rebuild the disk LRU order from file modification times on first use."""
+        if self._disk is not None:
+            return self._disk
+
+        found = []
+        try:
+            with os.scandir(self._directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(_FILE_SUFFIX):
+                        stat = entry.stat()
+                        found.append(
+                            (
+                                stat.st_mtime,
+                                entry.name[: -len(_FILE_SUFFIX)],
+                                stat.st_size,
+                            )
+                        )
+        except FileNotFoundError:
+            pass
+
+        found.sort()
+        self._disk = OrderedDict((key, size) for _, key, size in found)
+        self._disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def _disk_get(self, key: str) -> bytes | None:
+        with self._lock:
+            disk = self._ensure_loaded()
+            if key not in disk:
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as file:
+                    data = file.read()
+                os.utime(path)
+            except OSError as err:
+                _LOGGER.debug(f"Dropping unreadable cached image {key}: {err}")
+                self._disk_bytes -= disk.pop(key)
+                return None
+            disk.move_to_end(key)
+            return data
+
+    def _disk_put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            disk = self._ensure_loaded()
+            try:
+                os.makedirs(self._directory, exist_ok=True)
+                with open(tmp_path, "wb") as file:
+                    file.write(data)
+                os.replace(tmp_path, path)
+            except OSError as err:
+                _LOGGER.warning(f"Could not cache image {key} on disk: {err}")
+                return
+
+            self._disk_bytes += len(data) - disk.pop(key, 0)
+            disk[key] = len(data)
+            while len(disk) > 1 and (
+                len(disk) > self._max_items or self._disk_bytes > self._max_bytes
+            ):
+                self._disk_remove(next(iter(disk)))
+
+    def _disk_retain(self, keep: set[str]) -> None:
+        with self._lock:
+            for key in [key for key in self._ensure_loaded() if key not in keep]:
+                self._disk_remove(key)
+
+    def _disk_remove(self, key: str) -> None:
+        """Remove one entry; the caller must hold the lock."""
+        self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,318 @@
+"""Local library of downloaded activity photos, served through media_source.
+
+Every photo discovered for an athlete is downloaded once and stored under its
+content hash, so the same picture attached to several activities or served
+from several URLs is kept a single time, next to a small JPEG thumbnail. The
+browse index (photos per activity and per month, newest first) is kept up to
+date as photos arrive, so browsing never scans the directory. At setup the
+library is seeded with the photos the camera already knows about, taking
+their bytes from the camera's disk cache where it still has them.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import os
+import shutil
+from collections.abc import Callable
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CONF_MEDIA_THUMBNAIL_SIZE,
+    DOMAIN,
+    HTTP_TIMEOUT_SECONDS,
+    IMAGE_CACHE_DIR,
+    MEDIA_DIR,
+    PHOTO_URLS_STORAGE_KEY,
+)
+from .image_cache import ImageCache, scale_image
+
+if TYPE_CHECKING:
+    from .coordinator import StravaDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}_media"
+STORAGE_SAVE_DELAY_SECONDS = 30
+PHOTO_URLS_STORAGE_VERSION = 1
+
+# Libraries by athlete id, for the media source and the photo view
+DATA_LIBRARIES = f"{DOMAIN}_libraries"
+
+_PHOTO_SUFFIX = ".jpg"
+_THUMBNAIL_SUFFIX = "_thumb.jpg"
+
+
+def _write_photo(directory: str, digest: str, data: bytes) -> None:
+    """Write a photo and its thumbnail, each atomically."""
+    os.makedirs(directory, exist_ok=True)
+    thumbnail = scale_image(
+        data, (CONF_MEDIA_THUMBNAIL_SIZE, CONF_MEDIA_THUMBNAIL_SIZE)
+    )
+    for suffix, content in ((_PHOTO_SUFFIX, data), (_THUMBNAIL_SUFFIX, thumbnail)):
+        path = os.path.join(directory, digest + suffix)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+
+
+class PhotoLibrary:
+    """One athlete's downloaded photos and their browse index."""
+
+    def __init__(self, hass: HomeAssistant, athlete_id: str, title: str):
+        """Initialize an empty library for an athlete."""
+        self.hass = hass
+        self.athlete_id = athlete_id
+        self.title = title
+        self.directory = hass.config.path(MEDIA_DIR, athlete_id)
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{athlete_id}")
+        # The camera's photos, read when seeding so they aren't downloaded again
+        self._camera_images = ImageCache(
+            hass, hass.config.path(IMAGE_CACHE_DIR, athlete_id), memory_items=0
+        )
+        # Content hash -> {"activity_id", "date"}
+        self._photos: dict[str, dict] = {}
+        # Source URL -> content hash, so known URLs are never downloaded again
+        self._urls: dict[str, str] = {}
+        # Browse index: content hashes sorted oldest first per activity and month
+        self._by_activity: dict[int, list[str]] = {}
+        self._by_month: dict[str, list[str]] = {}
+
+    def __contains__(self, digest: str) -> bool:
+        """Return True if a photo with this content hash is stored."""
+        return digest in self._photos
+
+    def __len__(self) -> int:
+        """Return the number of stored photos."""
+        return len(self._photos)
+
+    def photo(self, digest: str) -> dict | None:
+        """Return a stored photo's activity id and date."""
+        return self._photos.get(digest)
+
+    def path(self, digest: str, thumbnail: bool = False) -> str:
+        """Return the file path of a photo or its thumbnail."""
+        suffix = _THUMBNAIL_SUFFIX if thumbnail else _PHOTO_SUFFIX
+        return os.path.join(self.directory, digest + suffix)
+
+    def activities(self) -> list[int]:
+        """Return activity ids with photos, most recent photo first."""
+        return sorted(
+            self._by_activity,
+            key=lambda activity_id: self._date(self._by_activity[activity_id][-1]),
+            reverse=True,
+        )
+
+    def months(self) -> list[str]:
+        """Return the months with photos as YYYY-MM, newest first."""
+        return sorted(self._by_month, reverse=True)
+
+    def activity_photos(self, activity_id: int) -> list[str]:
+        """Return an activity's photo hashes, newest first."""
+        return self._by_activity.get(activity_id, [])[::-1]
+
+    def month_photos(self, month: str) -> list[str]:
+        """Return a month's photo hashes, newest first."""
+        return self._by_month.get(month, [])[::-1]
+
+    async def async_load(self) -> None:
+        """Load the library index from storage and build the browse index."""
+        data = await self._store.async_load() or {}
+        self._urls = data.get("urls", {})
+        for digest, photo in data.get("photos", {}).items():
+            self._index(
+                digest,
+                {
+                    "activity_id": photo["activity_id"],
+                    "date": datetime.fromisoformat(photo["date"]),
+                },
+            )
+
+    async def async_seed(self) -> None:
+        """Add the photos in the camera's stored rotation not in the library yet.
+
+        Photo discovery only publishes photos it finds from now on, so this
+        brings in those found before the library was listening.
+        """
+        stored = await Store(
+            self.hass,
+            PHOTO_URLS_STORAGE_VERSION,
+            f"{PHOTO_URLS_STORAGE_KEY}_{self.athlete_id}",
+        ).async_load()
+        images = []
+        for image in (stored or {}).values():
+            if not isinstance(image, dict) or image.get("url") in self._urls:
+                continue
+            try:
+                images.append(
+                    {
+                        "url": image["url"],
+                        "activity_id": int(image["activity_id"]),
+                        "date": datetime.fromisoformat(image["date"]),
+                    }
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        if images:
+            _LOGGER.debug(f"Seeding {self.title} photo library with {len(images)}")
+            await self.async_add(images)
+
+    @callback
+    def async_start(self, coordinator: StravaDataUpdateCoordinator) -> CALLBACK_TYPE:
+        """Add photos to the library as photo discovery finds them."""
+
+        @callback
+        def handle_new_photos(images: list[dict]) -> None:
+            self.hass.async_create_background_task(
+                self.async_add(images), name=f"{self.title} photo library"
+            )
+
+        return coordinator.photo_discovery.async_add_listener(handle_new_photos)
+
+    async def async_add(self, images: list[dict]) -> None:
+        """Download and store photos not seen before."""
+        added = False
+        for image in images:
+            url = image["url"]
+            if url in self._urls:
+                continue
+            # The camera caches photos under the MD5 of their URL
+            data = await self._camera_images.async_get(
+                hashlib.md5(url.encode()).hexdigest()
+            ) or await self._async_download(url)
+            if data is None:
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            if digest not in self._photos:
+                await self.hass.async_add_executor_job(
+                    _write_photo, self.directory, digest, data
+                )
+                self._index(
+                    digest,
+                    {"activity_id": image["activity_id"], "date": image["date"]},
+                )
+            self._urls[url] = digest
+            added = True
+        if added:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY_SECONDS)
+
+    async def _async_download(self, url: str) -> bytes | None:
+        try:
+            async with async_get_clientsession(self.hass).get(
+                url=url, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+            ) as response:
+                if response.status == 200:
+                    return await response.read()
+                _LOGGER.warning(
+                    f"Error downloading photo from {url}: HTTP {response.status}"
+                )
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.error(f"Error downloading photo from {url}: {err}")
+        return None
+
+    def _date(self, digest: str) -> datetime:
+        return self._photos[digest]["date"]
+
+    def _index(self, digest: str, photo: dict) -> None:
+        self._photos[digest] = photo
+        month = photo["date"].strftime("%Y-%m")
+        for photos in (
+            self._by_activity.setdefault(photo["activity_id"], []),
+            self._by_month.setdefault(month, []),
+        ):
+            bisect.insort(photos, digest, key=self._date)
+
+    def _data_to_save(self) -> dict:
+        return {
+            "photos": {
+                digest: {
+                    "activity_id": photo["activity_id"],
+                    "date": photo["date"].isoformat(),
+                }
+                for digest, photo in self._photos.items()
+            },
+            "urls": self._urls,
+        }
+
+
+class StravaPhotoView(HomeAssistantView):
+    """Serve library photos and thumbnails straight from disk."""
+
+    url = "/api/ha_strava/photos/{athlete_id}/{name}"
+    name = "api:ha_strava:photos"
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(
+        self, request: web.Request, athlete_id: str, name: str
+    ) -> web.FileResponse:
+        """Return a photo; FileResponse hands the file to sendfile."""
+        library: PhotoLibrary | None = self.hass.data.get(DATA_LIBRARIES, {}).get(
+            athlete_id
+        )
+        if library is None:
+            raise web.HTTPNotFound
+        thumbnail = name.endswith(_THUMBNAIL_SUFFIX)
+        digest = name.removesuffix(_THUMBNAIL_SUFFIX if thumbnail else _PHOTO_SUFFIX)
+        # Only names of stored photos are accepted, so no path can escape
+        if digest not in library or not name.endswith(_PHOTO_SUFFIX):
+            raise web.HTTPNotFound
+        return web.FileResponse(
+            library.path(digest, thumbnail), headers={"Cache-Control": "max-age=86400"}
+        )
+
+
+def photo_url(athlete_id: str, digest: str, thumbnail: bool = False) -> str:
+    """Return the view URL of a library photo or its thumbnail.
+
+    The view requires authentication, so sign the URL before handing it out.
+    """
+    suffix = _THUMBNAIL_SUFFIX if thumbnail else _PHOTO_SUFFIX
+    return f"/api/ha_strava/photos/{athlete_id}/{digest}{suffix}"
+
+
+async def async_setup_library(
+    hass: HomeAssistant, coordinator: StravaDataUpdateCoordinator
+) -> Callable[[], None]:
+    """Load an entry's photo library and keep it filled; returns the unloader."""
+    athlete_id = coordinator.entry.unique_id
+    if DATA_LIBRARIES not in hass.data:
+        hass.data[DATA_LIBRARIES] = {}
+        hass.http.register_view(StravaPhotoView(hass))
+
+    library = PhotoLibrary(hass, athlete_id, coordinator.entry.title)
+    await library.async_load()
+    hass.data[DATA_LIBRARIES][athlete_id] = library
+    unsub = library.async_start(coordinator)
+    hass.async_create_background_task(
+        library.async_seed(), name=f"{library.title} photo library seed"
+    )
+
+    @callback
+    def unload() -> None:
+        unsub()
+        hass.data[DATA_LIBRARIES].pop(athlete_id, None)
+
+    return unload
+
+
+async def async_remove_library(hass: HomeAssistant, athlete_id: str) -> None:
+    """Delete an athlete's stored photos and their index."""
+    await hass.async_add_executor_job(
+        shutil.rmtree, hass.config.path(MEDIA_DIR, athlete_id), True
+    )
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{athlete_id}").async_remove()
@@ -0,0 +1,179 @@
+"""Browse downloaded activity photos through Home Assistant's media browser.
+
+Identifiers are `<athlete_id>`, `<athlete_id>/activity[/<activity_id>]`,
+`<athlete_id>/month[/<YYYY-MM>]` and `<athlete_id>/photo/<content hash>`.
+Photo and thumbnail URLs are signed, so browsers and media players can load
+them without an auth header.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.components.media_player import MediaClass, MediaType
+from homeassistant.components.media_source import (
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+    Unresolvable,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_MEDIA_URL_EXPIRY_SECONDS,
+    CONF_SENSOR_ID,
+    CONF_SENSOR_TITLE,
+    DOMAIN,
+)
+from .library import DATA_LIBRARIES, PhotoLibrary, photo_url
+
+_MIME_TYPE = "image/jpeg"
+
+
+async def async_get_media_source(hass: HomeAssistant) -> StravaMediaSource:
+    """Set up the Strava photos media source."""
+    return StravaMediaSource(hass)
+
+
+class StravaMediaSource(MediaSource):
+    """Activity photos by athlete, activity and month."""
+
+    name = "Strava"
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+
+    def _library(self, athlete_id: str) -> PhotoLibrary:
+        library = self.hass.data.get(DATA_LIBRARIES, {}).get(athlete_id)
+        if library is None:
+            raise Unresolvable(f"Unknown athlete: {athlete_id}")
+        return library
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Resolve a photo to the URL it is served from."""
+        athlete_id, _, digest = (item.identifier or "").partition("/photo/")
+        if not digest or digest not in self._library(athlete_id):
+            raise Unresolvable(f"Unknown photo: {item.identifier}")
+        return PlayMedia(self._sign(photo_url(athlete_id, digest)), _MIME_TYPE)
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """Browse athletes, their activities and months, and their photos."""
+        if not item.identifier:
+            return self._directory(
+                None,
+                self.name,
+                [
+                    self._directory(library.athlete_id, library.title)
+                    for library in self.hass.data.get(DATA_LIBRARIES, {}).values()
+                ],
+            )
+
+        athlete_id, _, path = item.identifier.partition("/")
+        library = self._library(athlete_id)
+        group, _, key = path.partition("/")
+
+        if not group:
+            return self._directory(
+                athlete_id,
+                library.title,
+                [
+                    self._directory(f"{athlete_id}/activity", "Activities"),
+                    self._directory(f"{athlete_id}/month", "By month"),
+                ],
+            )
+        if group == "activity" and not key:
+            titles = self._activity_titles(library)
+            return self._directory(
+                item.identifier,
+                "Activities",
+                [
+                    self._directory(
+                        f"{athlete_id}/activity/{activity_id}",
+                        titles.get(activity_id, f"Activity {activity_id}"),
+                    )
+                    for activity_id in library.activities()
+                ],
+            )
+        if group == "activity":
+            try:
+                photos = library.activity_photos(int(key))
+            except ValueError as err:
+                raise Unresolvable(f"Unknown activity: {key}") from err
+            title = self._activity_titles(library).get(int(key), f"Activity {key}")
+        elif group == "month" and not key:
+            return self._directory(
+                item.identifier,
+                "By month",
+                [
+                    self._directory(f"{athlete_id}/month/{month}", month)
+                    for month in library.months()
+                ],
+            )
+        elif group == "month":
+            photos = library.month_photos(key)
+            title = key
+        else:
+            raise Unresolvable(f"Unknown media: {item.identifier}")
+
+        return self._directory(
+            item.identifier,
+            title,
+            [self._photo(library, digest) for digest in photos],
+            children_media_class=MediaClass.IMAGE,
+        )
+
+    def _activity_titles(self, library: PhotoLibrary) -> dict[int, str]:
+        coordinator = next(
+            (
+                coordinator
+                for coordinator in self.hass.data.get(DOMAIN, {}).values()
+                if coordinator.entry.unique_id == library.athlete_id
+            ),
+            None,
+        )
+        activities = ((coordinator and coordinator.data) or {}).get("activities", [])
+        return {
+            activity[CONF_SENSOR_ID]: activity[CONF_SENSOR_TITLE]
+            for activity in activities
+            if activity.get(CONF_SENSOR_TITLE)
+        }
+
+    def _directory(
+        self,
+        identifier: str | None,
+        title: str,
+        children: list[BrowseMediaSource] | None = None,
+        children_media_class: str = MediaClass.DIRECTORY,
+    ) -> BrowseMediaSource:
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=identifier,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=title,
+            can_play=False,
+            can_expand=True,
+            children=children,
+            children_media_class=children_media_class,
+        )
+
+    def _photo(self, library: PhotoLibrary, digest: str) -> BrowseMediaSource:
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=f"{library.athlete_id}/photo/{digest}",
+            media_class=MediaClass.IMAGE,
+            media_content_type=MediaType.IMAGE,
+            title=library.photo(digest)["date"].strftime("%Y-%m-%d %H:%M"),
+            can_play=True,
+            can_expand=False,
+            thumbnail=self._sign(photo_url(library.athlete_id, digest, thumbnail=True)),
+        )
+
+    def _sign(self, path: str) -> str:
+        return async_sign_path(
+            self.hass, path, timedelta(seconds=CONF_MEDIA_URL_EXPIRY_SECONDS)
+        )
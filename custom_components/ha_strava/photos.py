@@ -0,0 +1,184 @@
+"""Background discovery of activity photos.
+
+Photo lookups cost one API call per activity, paced to the remaining API
+budget, so they run in a low-priority background task instead of inside the
+coordinator refresh. Sensors update as soon as activities are fetched and the
+camera receives photos activity by activity as they are found.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CONF_PHOTO_DISCOVERY_INTERVAL_MINUTES,
+    CONF_PHOTO_FETCH_LOG_MAX_ENTRIES,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import StravaDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}_photo_fetches"
+STORAGE_SAVE_DELAY_SECONDS = 30
+
+
+class PhotoFetchLog:
+    """When each activity's photos were last fetched, persisted and LRU-bounded.
+
+    Survives restarts so activities fetched within the cache window aren't
+    queried again after Home Assistant comes back up.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        athlete_id: str,
+        max_entries: int = CONF_PHOTO_FETCH_LOG_MAX_ENTRIES,
+    ):
+        """Initialize an empty log for an athlete."""
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{athlete_id}")
+        self._max_entries = max_entries
+        self._fetched: OrderedDict[int, datetime] = OrderedDict()
+        self._loaded = False
+
+    def __contains__(self, activity_id) -> bool:
+        """Return True if the activity's photos have been fetched."""
+        return activity_id in self._fetched
+
+    def __len__(self) -> int:
+        """Return the number of activities tracked."""
+        return len(self._fetched)
+
+    def get(self, activity_id, default: datetime | None = None) -> datetime | None:
+        """Return when an activity's photos were last fetched."""
+        return self._fetched.get(activity_id, default)
+
+    def __setitem__(self, activity_id, fetched: datetime) -> None:
+        """Record a fetch, evicting the least recently fetched activity if full."""
+        self._fetched[activity_id] = fetched
+        self._fetched.move_to_end(activity_id)
+        while len(self._fetched) > self._max_entries:
+            self._fetched.popitem(last=False)
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY_SECONDS)
+
+    async def async_load(self) -> None:
+        """Load the log from storage once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load()
+        if not data:
+            return
+        stored = OrderedDict()
+        for activity_id, fetched in data.items():
+            try:
+                stored[int(activity_id)] = datetime.fromisoformat(fetched)
+            except (TypeError, ValueError):
+                continue
+        # Entries recorded before the load are newer than anything stored
+        stored.update(self._fetched)
+        self._fetched = stored
+
+    def _data_to_save(self) -> dict:
+        return {
+            str(activity_id): fetched.isoformat()
+            for activity_id, fetched in self._fetched.items()
+        }
+
+
+class PhotoDiscovery:
+    """Find photos for recent activities and push them to listeners.
+
+    Runs after every coordinator update and on its own interval while anyone
+    is listening. Per-activity results are cached by the coordinator's
+    image_updates, so repeated runs only query activities not seen recently.
+    """
+
+    def __init__(self, coordinator: StravaDataUpdateCoordinator):
+        """Initialize the worker; it starts with its first listener."""
+        self._coordinator = coordinator
+        self._listeners: list[Callable[[list[dict]], None]] = []
+        self._unsub: list[CALLBACK_TYPE] = []
+        self._task: asyncio.Task | None = None
+        self._rerun = False
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[list[dict]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for newly discovered photos."""
+        self._listeners.append(update_callback)
+        if len(self._listeners) == 1:
+            self._async_start()
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+            if not self._listeners:
+                self._async_stop()
+
+        return remove_listener
+
+    @callback
+    def async_schedule(self, *_) -> None:
+        """Run discovery now, or once more after the current run finishes."""
+        if self._task is not None and not self._task.done():
+            self._rerun = True
+            return
+        self._task = self._coordinator.hass.async_create_background_task(
+            self._async_run(), name=f"{self._coordinator.name} photo discovery"
+        )
+
+    @callback
+    def _async_start(self) -> None:
+        hass = self._coordinator.hass
+        self._unsub = [
+            self._coordinator.async_add_listener(self.async_schedule),
+            async_track_time_interval(
+                hass,
+                self.async_schedule,
+                timedelta(minutes=CONF_PHOTO_DISCOVERY_INTERVAL_MINUTES),
+            ),
+        ]
+        self.async_schedule()
+
+    @callback
+    def _async_stop(self) -> None:
+        for unsub in self._unsub:
+            unsub()
+        self._unsub = []
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._rerun = False
+
+    async def _async_run(self) -> None:
+        while True:
+            self._rerun = False
+            activities = (self._coordinator.data or {}).get("activities") or []
+            try:
+                await self._coordinator._fetch_images(
+                    activities, on_images=self._async_publish
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error(f"Photo discovery failed: {err}")
+            if not self._rerun:
+                return
+
+    @callback
+    def _async_publish(self, images: list[dict]) -> None:
+        for update_callback in list(self._listeners):
+            update_callback(images)
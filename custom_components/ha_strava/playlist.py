@@ -0,0 +1,91 @@
+"""Fixed-capacity photo playlist for the camera rotation."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from datetime import datetime
+
+from .const import CONF_MAX_NB_IMAGES
+
+
+def _photo_date(img: dict) -> datetime:
+    date = img.get("date")
+    return date if isinstance(date, datetime) else datetime.min
+
+
+class PhotoPlaylist(Mapping[str, dict]):
+    """Array-backed ring of the newest photos, keyed by URL hash.
+
+    The current photo and the ones after it are found by slot index in O(1).
+    New photos are written into a free slot or over the oldest photo, so
+    the rotation never has to be rebuilt or re-sorted.
+    """
+
+    def __init__(
+        self,
+        images: Mapping[str, dict] | None = None,
+        capacity: int = CONF_MAX_NB_IMAGES,
+    ):
+        """Initialize the playlist, keeping the newest of the given photos."""
+        self._capacity = capacity
+        self._slots: list[str] = []
+        self._images: dict[str, dict] = {}
+        self.position = 0
+        if images:
+            for key, img in sorted(
+                images.items(), key=lambda item: _photo_date(item[1])
+            )[-capacity:]:
+                self.add(key, img)
+
+    def __getitem__(self, key: str) -> dict:
+        """Return a photo by key."""
+        return self._images[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over photo keys in rotation order."""
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        """Return the number of photos."""
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if the photo is in the playlist."""
+        return key in self._images
+
+    def peek(self, offset: int = 0) -> tuple[str, dict] | None:
+        """Return the key and photo offset slots after the current one."""
+        if not self._slots:
+            return None
+        key = self._slots[(self.position + offset) % len(self._slots)]
+        return key, self._images[key]
+
+    def advance(self) -> None:
+        """Move to the next photo."""
+        if self._slots:
+            self.position = (self.position + 1) % len(self._slots)
+
+    def add(self, key: str, img: dict) -> bool:
+        """Insert a photo, evicting the oldest if full.
+
+        Returns False if the photo was already present or is older than
+        every photo in a full playlist.
+        """
+        if key in self._images:
+            return False
+        if len(self._slots) < self._capacity:
+            self._slots.append(key)
+            self._images[key] = img
+            return True
+
+        # Only scanned when a new photo arrives, never per frame
+        slot = min(
+            range(len(self._slots)),
+            key=lambda i: _photo_date(self._images[self._slots[i]]),
+        )
+        if _photo_date(img) <= _photo_date(self._images[self._slots[slot]]):
+            return False
+        del self._images[self._slots[slot]]
+        self._slots[slot] = key
+        self._images[key] = img
+        return True
@@ -0,0 +1,154 @@
+"""Adaptive pacing of Strava API requests from the rate-limit headers.
+
+Strava reports usage against a 15-minute and a daily limit on every response,
+as comma-separated pairs in X-RateLimit-Usage and X-RateLimit-Limit. The
+15-minute window resets on the quarter hour and the daily one at midnight
+UTC. Background work such as photo discovery uses this to go as fast as the
+connection allows while plenty of budget is left, and to spread what remains
+over the rest of the window as the limit gets close.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+
+from .const import (
+    CONF_RATE_LIMIT_FREE_FRACTION,
+    CONF_RATE_LIMIT_RESERVE_FRACTION,
+    RATE_LIMIT_SHORT_WINDOW_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_LIMIT_HEADER = "X-RateLimit-Limit"
+_USAGE_HEADER = "X-RateLimit-Usage"
+_DAY_SECONDS = 86400
+
+
+def _parse_pair(value: str | None) -> tuple[int, int] | None:
+    if not value:
+        return None
+    try:
+        short, daily = (int(part) for part in value.split(","))
+    except ValueError:
+        return None
+    return short, daily
+
+
+class RateLimitThrottle:
+    """Pace requests to fit the API budget left in each rate-limit window.
+
+    Below free_fraction of a limit requests are not delayed at all. Above it,
+    the budget left after holding back reserve_fraction for the coordinator's
+    own refreshes is spread evenly over the rest of the window. Once that is
+    used up async_slot yields False and callers should stop until a later run.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = RATE_LIMIT_SHORT_WINDOW_SECONDS,
+        free_fraction: float = CONF_RATE_LIMIT_FREE_FRACTION,
+        reserve_fraction: float = CONF_RATE_LIMIT_RESERVE_FRACTION,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize with no usage known; nothing is delayed until a response."""
+        self._windows = (window_seconds, _DAY_SECONDS)
+        self._free_fraction = free_fraction
+        self._reserve_fraction = reserve_fraction
+        self._clock = clock
+        self._limit: tuple[int, int] | None = None
+        self._usage: tuple[int, int] | None = None
+        self._updated_at = 0.0
+        # Requests sent but not answered yet may not be counted in the usage.
+        # They're dropped once a new window's usage is reported, as Strava
+        # counts them there; _generation tells their slots not to release them.
+        self._pending = 0
+        self._generation = 0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def usage(self) -> tuple[int, int] | None:
+        """Return the last reported (15-minute, daily) usage."""
+        return self._usage
+
+    @property
+    def limit(self) -> tuple[int, int] | None:
+        """Return the last reported (15-minute, daily) limits."""
+        return self._limit
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record the usage reported in a response's headers."""
+        usage = _parse_pair(headers.get(_USAGE_HEADER))
+        limit = _parse_pair(headers.get(_LIMIT_HEADER))
+        if usage is None or limit is None:
+            return
+        now = self._clock()
+        window = self._windows[0]
+        if now // window != self._updated_at // window:
+            self._pending = 0
+            self._generation += 1
+        self._usage = usage
+        self._limit = limit
+        self._updated_at = now
+
+    def delay(self) -> float | None:
+        """Return how long to wait between requests, or None if out of budget."""
+        if self._usage is None or self._limit is None:
+            return 0.0
+        now = self._clock()
+        delay = 0.0
+        for used, limit, window in zip(self._usage, self._limit, self._windows):
+            if limit <= 0:
+                continue
+            if now // window != self._updated_at // window:
+                # Reported before this window started
+                used = 0
+            used += self._pending
+            remaining = limit - used - math.ceil(limit * self._reserve_fraction)
+            if remaining <= 0:
+                return None
+            if used < limit * self._free_fraction:
+                continue
+            delay = max(delay, (window - now % window) / remaining)
+        return delay
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[bool]:
+        """Hold a request slot while the request is in flight.
+
+        Yields False, without waiting, if out of budget. The slot is released
+        when the block exits, however it exits.
+        """
+        if not await self._async_reserve():
+            yield False
+            return
+        generation = self._generation
+        try:
+            yield True
+        finally:
+            if generation == self._generation:
+                self._pending = max(self._pending - 1, 0)
+
+    async def _async_reserve(self) -> bool:
+        """Wait for the next request slot; return False if out of budget."""
+        async with self._lock:
+            delay = self.delay()
+            if delay is None:
+                _LOGGER.debug(
+                    "Strava API budget reserved (usage %s of %s)",
+                    self._usage,
+                    self._limit,
+                )
+                return False
+            loop = asyncio.get_running_loop()
+            if (wait := self._next_at - loop.time()) > 0:
+                await asyncio.sleep(wait)
+            self._next_at = loop.time() + delay
+            self._pending += 1
+            return True
@@ -1,19 +1,25 @@
 """Sensor platform for HA Strava"""
 
 import logging
+from collections.abc import Callable
+from functools import partial
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.const import (
+    EntityCategory,
     UnitOfEnergy,
     UnitOfLength,
     UnitOfPower,
     UnitOfSpeed,
     UnitOfTime,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.unit_conversion import DistanceConverter, SpeedConverter
 from homeassistant.util.unit_system import METRIC_SYSTEM
@@ -26,6 +32,7 @@ from .const import (
     CONF_ATTR_COMMUTE,
     CONF_ATTR_KOM_SEGMENTS,
     CONF_ATTR_LOCATION,
+    CONF_ATTR_METRICS,
     CONF_ATTR_POLYLINE,
     CONF_ATTR_PR_SEGMENTS,
     CONF_ATTR_PRIVATE,
@@ -33,6 +40,9 @@ from .const import (
     CONF_ATTR_START_LATLONG,
     CONF_ATTRIBUTE_SENSOR_TYPES,
     CONF_ATTRIBUTE_SENSORS,
+    CONF_ATTRIBUTE_SENSORS_TO_CREATE,
+    CONF_COMPACT_SENSORS,
+    CONF_CURVES,
     CONF_DISTANCE_UNIT_OVERRIDE,
     CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT,
     CONF_DISTANCE_UNIT_OVERRIDE_METRIC,
@@ -68,6 +78,14 @@ from .const import (
     CONF_SENSOR_POWER,
     CONF_SENSOR_SPEED,
     CONF_SENSOR_TITLE,
+    CURVE_BEST_EFFORT_DISTANCES,
+    CURVE_BEST_EFFORTS,
+    CURVE_DURATIONS,
+    CURVE_HEADLINE_DISTANCE,
+    CURVE_HEADLINE_DURATION,
+    CURVE_HEARTRATE,
+    CURVE_PACE,
+    CURVE_POWER,
     DEVICE_CLASS_DISTANCE,
     DOMAIN,
     STRAVA_ACTHLETE_BASE_URL,
@@ -76,6 +94,7 @@ from .const import (
     UNIT_PACE_MINUTES_PER_KILOMETER,
     UNIT_PACE_MINUTES_PER_MILE,
     format_activity_type_display,
+    format_curve_duration,
     format_seconds_to_human_readable,
     generate_device_id,
     generate_device_name,
@@ -86,21 +105,199 @@ from .const import (
     generate_recent_activity_device_id,
     generate_recent_activity_device_name,
     generate_recent_activity_sensor_id,
-    generate_recent_activity_sensor_name,
     generate_sensor_id,
     generate_sensor_name,
     get_athlete_name_from_title,
     get_gear_type_label,
     normalize_activity_type,
 )
+from .circuit import CIRCUIT_STATES
 from .coordinator import StravaDataUpdateCoordinator
+from .entity_sync import async_discover_entities, async_track_entities
+from .freshness import SOURCE_SUMMARY_STATS, SOURCE_WEEKLY_TOTALS
 
 _LOGGER = logging.getLogger(__name__)
 
+_CURVE_SENSOR_NAMES_AND_ICONS = {
+    CURVE_POWER: ("Power Curve", "mdi:lightning-bolt"),
+    CURVE_HEARTRATE: ("Heart Rate Curve", "mdi:heart-pulse"),
+    CURVE_PACE: ("Best Pace", "mdi:timer-outline"),
+    CURVE_BEST_EFFORTS: ("Best Efforts", "mdi:trophy-outline"),
+}
+
+_SUMMARY_STATS_ICONS = {
+    "recent_run_totals": "mdi:run",
+    "all_run_totals": "mdi:run",
+    "ytd_run_totals": "mdi:run",
+    "weekly_run_totals": "mdi:run",
+    "recent_ride_totals": "mdi:bike",
+    "all_ride_totals": "mdi:bike",
+    "ytd_ride_totals": "mdi:bike",
+    "weekly_ride_totals": "mdi:bike",
+    "recent_swim_totals": "mdi:swim",
+    "all_swim_totals": "mdi:swim",
+    "ytd_swim_totals": "mdi:swim",
+    "weekly_swim_totals": "mdi:swim",
+    "biggest_ride_distance": "mdi:map-marker-distance",
+    "biggest_climb_elevation_gain": "mdi:elevation-rise",
+}
+
+
+def _attribute_sensor_description(attribute_type: str) -> SensorEntityDescription:
+    config = CONF_ATTRIBUTE_SENSORS.get(attribute_type, {})
+    return SensorEntityDescription(
+        key=attribute_type,
+        name=generate_sensor_name(attribute_type),
+        icon=config.get("icon", "mdi:information"),
+        device_class=config.get("device_class"),
+        state_class=config.get("state_class"),
+    )
+
+
+# Shared by every activity type and recent activity device
+_ATTRIBUTE_SENSOR_DESCRIPTIONS = {
+    attribute_type: _attribute_sensor_description(attribute_type)
+    for attribute_type in (
+        *CONF_ATTRIBUTE_SENSORS,
+        *CONF_ATTRIBUTE_SENSOR_TYPES,
+        CONF_SENSOR_GEAR_NAME,
+    )
+}
+
+
+def _shared_device_info(
+    coordinator: StravaDataUpdateCoordinator,
+    key: tuple,
+    build: Callable[[], DeviceInfo],
+) -> DeviceInfo:
+    """Return a device's info, built once per coordinator and shared.
+
+    The device info lives on the coordinator, so it goes away with it on a
+    reload. Entities share the returned dict and must not change it.
+    """
+    device_infos = coordinator.device_infos
+    if (device_info := device_infos.get(key)) is None:
+        device_info = device_infos[key] = build()
+    return device_info
+
+
+def _stats_device_info(
+    coordinator: StravaDataUpdateCoordinator, athlete_id: str
+) -> DeviceInfo:
+    """Return the stats device info, shared by its entities."""
+    return _shared_device_info(
+        coordinator,
+        ("stats", athlete_id),
+        lambda: DeviceInfo(
+            identifiers={(DOMAIN, generate_device_id(athlete_id, "stats"))},
+            name=generate_device_name(
+                get_athlete_name_from_title(coordinator.entry.title), "Stats"
+            ),
+            manufacturer="Powered by Strava",
+            model="Activity Summary",
+            configuration_url=f"{STRAVA_ACTHLETE_BASE_URL}{athlete_id}",
+        ),
+    )
+
+
+def _activity_device_info(
+    coordinator: StravaDataUpdateCoordinator, athlete_id: str, activity_type: str
+) -> DeviceInfo:
+    """Return an activity type's device info, shared by its entities."""
+    return _shared_device_info(
+        coordinator,
+        ("activity", athlete_id, activity_type),
+        lambda: DeviceInfo(
+            identifiers={
+                (
+                    DOMAIN,
+                    generate_device_id(
+                        athlete_id, normalize_activity_type(activity_type)
+                    ),
+                )
+            },
+            name=generate_device_name(
+                get_athlete_name_from_title(coordinator.entry.title),
+                format_activity_type_display(activity_type),
+            ),
+            manufacturer="Powered by Strava",
+            model=f"{activity_type} Activity",
+            configuration_url=f"{STRAVA_ACTHLETE_BASE_URL}{athlete_id}",
+        ),
+    )
+
+
+def _recent_activity_device_info(
+    coordinator: StravaDataUpdateCoordinator, athlete_id: str, activity_index: int
+) -> DeviceInfo:
+    """Return a recent activity slot's device info, shared by its entities."""
+    return _shared_device_info(
+        coordinator,
+        ("recent", athlete_id, activity_index),
+        lambda: DeviceInfo(
+            identifiers={
+                (
+                    DOMAIN,
+                    generate_recent_activity_device_id(athlete_id, activity_index),
+                )
+            },
+            name=generate_recent_activity_device_name(
+                get_athlete_name_from_title(coordinator.entry.title), activity_index
+            ),
+            manufacturer="Powered by Strava",
+            model="Recent Activity",
+            configuration_url=f"{STRAVA_ACTHLETE_BASE_URL}{athlete_id}",
+        ),
+    )
+
+
+def _gear_device_info(
+    coordinator: StravaDataUpdateCoordinator,
+    athlete_id: str,
+    gear_id: str,
+    gear_name: str,
+) -> DeviceInfo:
+    """Return a gear item's device info, shared by its entities."""
+    name = generate_gear_device_name(
+        get_athlete_name_from_title(coordinator.entry.title), gear_name
+    )
+    key = ("gear", athlete_id, gear_id)
+    device_info = coordinator.device_infos.get(key)
+    # Built again when the gear is renamed in Strava
+    if device_info is None or device_info["name"] != name:
+        device_info = coordinator.device_infos[key] = DeviceInfo(
+            identifiers={(DOMAIN, generate_gear_device_id(athlete_id, gear_id))},
+            name=name,
+            manufacturer="Powered by Strava",
+            model="Gear",
+            configuration_url=f"{STRAVA_ACTHLETE_BASE_URL}{athlete_id}",
+        )
+    return device_info
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the sensor platform."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    sync = async_track_entities(
+        hass,
+        config_entry,
+        async_add_entities,
+        partial(_build_sensors, coordinator, config_entry),
+    )
+    # Gear bought after setup gets its sensors on the next update
+    async_discover_entities(
+        config_entry, coordinator, sync, partial(_gear_ids, coordinator)
+    )
+
+
+def _gear_ids(coordinator) -> set[str]:
+    """Return the ids of the gear in the coordinator's data."""
+    gear_data = (coordinator.data or {}).get("gear") or []
+    return {str(gear_item["id"]) for gear_item in gear_data if gear_item.get("id")}
+
+
+def _build_sensors(coordinator, config_entry) -> list[SensorEntity]:
+    """Build the sensors called for by the entry's current options."""
     athlete_id = config_entry.unique_id
 
     # Get selected activity types from config, default to empty list
@@ -127,6 +324,13 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         else config_entry.data.get(CONF_GEAR_ENABLED, False)
     )
 
+    # In compact mode the main sensors carry the attribute and gear sensor
+    # values instead, so those sensors aren't built
+    compact_metrics = _compact_metric_types(config_entry.options)
+    attribute_sensor_types = (
+        _attribute_sensor_types(config_entry.options) if compact_metrics is None else []
+    )
+
     entries = []
 
     # Create activity type sensors for each selected activity type
@@ -142,7 +346,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             )
 
             # Create individual attribute sensors
-            for attribute_type in CONF_ATTRIBUTE_SENSOR_TYPES:
+            for attribute_type in attribute_sensor_types:
                 if attribute_type == CONF_SENSOR_DEVICE_INFO:
                     entries.append(
                         StravaActivityDeviceInfoSensor(
@@ -171,13 +375,14 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                     )
 
             # Create gear sensor for each activity type
-            entries.append(
-                StravaActivityGearSensor(
-                    coordinator,
-                    activity_type=activity_type,
-                    athlete_id=athlete_id,
+            if compact_metrics is None:
+                entries.append(
+                    StravaActivityGearSensor(
+                        coordinator,
+                        activity_type=activity_type,
+                        athlete_id=athlete_id,
+                    )
                 )
-            )
 
     # Create recent activity devices and sensors
     # Create N recent activity devices based on user configuration
@@ -192,7 +397,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         )
 
         # Create individual attribute sensors for this recent activity
-        for attribute_type in CONF_ATTRIBUTE_SENSOR_TYPES:
+        for attribute_type in attribute_sensor_types:
             if attribute_type == CONF_SENSOR_DEVICE_INFO:
                 entries.append(
                     StravaRecentActivityDeviceInfoSensor(
@@ -221,13 +426,14 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                 )
 
         # Create gear sensor for this recent activity
-        entries.append(
-            StravaRecentActivityGearSensor(
-                coordinator,
-                athlete_id=athlete_id,
-                activity_index=activity_index,
+        if compact_metrics is None:
+            entries.append(
+                StravaRecentActivityGearSensor(
+                    coordinator,
+                    athlete_id=athlete_id,
+                    activity_index=activity_index,
+                )
             )
-        )
 
     # Create summary statistics sensors (one global device)
     # Break down totals into individual metric sensors
@@ -280,6 +486,19 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             )
         )
 
+    # Create all-time curve sensors (on the same stats device) if enabled
+    if config_entry.options.get(CONF_CURVES, False):
+        for curve_type in _CURVE_SENSOR_NAMES_AND_ICONS:
+            entries.append(
+                StravaCurveSensor(
+                    coordinator,
+                    curve_type=curve_type,
+                    athlete_id=athlete_id,
+                )
+            )
+
+    entries.append(StravaApiStatusSensor(coordinator, athlete_id=athlete_id))
+
     # Create gear sensors if enabled
     if gear_enabled:
         gear_data = coordinator.data.get("gear") if coordinator.data else []
@@ -302,7 +521,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                 )
             )
 
-    async_add_entities(entries)
+    return entries
 
 
 class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
@@ -325,19 +544,25 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
         self._display_name = display_name
         self._metric_key = metric_key
         self._athlete_id = athlete_id
-        self._athlete_name = get_athlete_name_from_title(self.coordinator.entry.title)
         self._attr_unique_id = f"strava_{athlete_id}_stats_{api_key}_{metric_key}"
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, generate_device_id(self._athlete_id, "stats"))},
-            "name": generate_device_name(self._athlete_name, "Stats"),
-            "manufacturer": "Powered by Strava",
-            "model": "Activity Summary",
-            "configuration_url": f"{STRAVA_ACTHLETE_BASE_URL}{self._athlete_id}",
-        }
+        self._source = (
+            SOURCE_WEEKLY_TOTALS
+            if api_key.startswith("weekly_")
+            else SOURCE_SUMMARY_STATS
+        )
+        self._attr_device_info = _stats_device_info(self.coordinator, athlete_id)
+        self._attr_icon = _SUMMARY_STATS_ICONS.get(
+            api_key, "mdi:chart-timeline-variant"
+        )
+        if metric_key in [
+            "distance",
+            "elevation_gain",
+            "biggest_ride_distance",
+            "biggest_climb_elevation_gain",
+        ]:
+            self._attr_device_class = SensorDeviceClass.DISTANCE
+        elif metric_key == "moving_time":
+            self._attr_device_class = SensorDeviceClass.DURATION
 
     @property
     def _data(self):
@@ -361,42 +586,6 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
         """Return if entity is available."""
         return self._data is not None
 
-    @property
-    def icon(self):
-        """Return the icon of the sensor."""
-        # Map API keys to appropriate icons
-        icon_mapping = {
-            "recent_run_totals": "mdi:run",
-            "all_run_totals": "mdi:run",
-            "ytd_run_totals": "mdi:run",
-            "weekly_run_totals": "mdi:run",
-            "recent_ride_totals": "mdi:bike",
-            "all_ride_totals": "mdi:bike",
-            "ytd_ride_totals": "mdi:bike",
-            "weekly_ride_totals": "mdi:bike",
-            "recent_swim_totals": "mdi:swim",
-            "all_swim_totals": "mdi:swim",
-            "ytd_swim_totals": "mdi:swim",
-            "weekly_swim_totals": "mdi:swim",
-            "biggest_ride_distance": "mdi:map-marker-distance",
-            "biggest_climb_elevation_gain": "mdi:elevation-rise",
-        }
-        return icon_mapping.get(self._api_key, "mdi:chart-timeline-variant")
-
-    @property
-    def device_class(self):
-        """Return the device class of the sensor."""
-        if self._metric_key in [
-            "distance",
-            "elevation_gain",
-            "biggest_ride_distance",
-            "biggest_climb_elevation_gain",
-        ]:
-            return SensorDeviceClass.DISTANCE
-        elif self._metric_key == "moving_time":
-            return SensorDeviceClass.DURATION
-        return None
-
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -428,7 +617,7 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
             if self._metric_key == "biggest_ride_distance":
                 # Convert from meters to km/miles
                 distance = numeric_value / 1000
-                is_metric = self._is_metric()
+                is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
                 if is_metric:
                     return round(distance, 2)
                 return round(
@@ -440,7 +629,7 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
             else:  # biggest_climb_elevation_gain
                 # Convert from meters to meters/feet
                 elevation = numeric_value
-                is_metric = self._is_metric()
+                is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
                 if is_metric:
                     return round(elevation, 2)
                 return round(
@@ -461,7 +650,7 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
             if self._metric_key == "distance":
                 # Convert from meters to km/miles
                 distance = value / 1000
-                is_metric = self._is_metric()
+                is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
                 if is_metric:
                     return round(distance, 2)
                 return round(
@@ -473,7 +662,7 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
             elif self._metric_key == "elevation_gain":
                 # Convert from meters to meters/feet
                 elevation = value
-                is_metric = self._is_metric()
+                is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
                 if is_metric:
                     return round(elevation, 2)
                 return round(
@@ -496,13 +685,13 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
             self._metric_key == "biggest_ride_distance"
             or self._metric_key == "distance"
         ):
-            is_metric = self._is_metric()
+            is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
             return UnitOfLength.KILOMETERS if is_metric else UnitOfLength.MILES
         elif (
             self._metric_key == "biggest_climb_elevation_gain"
             or self._metric_key == "elevation_gain"
         ):
-            is_metric = self._is_metric()
+            is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
             return UnitOfLength.METERS if is_metric else UnitOfLength.FEET
         elif self._metric_key == "moving_time":
             return UnitOfTime.SECONDS
@@ -529,6 +718,14 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
+        attributes = self._totals_attributes()
+        if self.coordinator.sources.failed(self._source):
+            # Kept from before the last refresh, which failed to fetch it
+            attributes["stale"] = True
+        return attributes
+
+    def _totals_attributes(self) -> dict:
+        """Return the other metrics of the totals."""
         if not self.available:
             return {}
 
@@ -562,31 +759,166 @@ class StravaSummaryStatsSensor(CoordinatorEntity, SensorEntity):
 
         return {}
 
-    def _is_metric(self):
-        """Determine if the user has configured metric units."""
-        override = (
-            self.coordinator.entry.options.get(CONF_DISTANCE_UNIT_OVERRIDE)
-            if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.options
-            else (
-                self.coordinator.entry.data.get(CONF_DISTANCE_UNIT_OVERRIDE)
-                if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.data
-                else None
+
+# Kilobytes per state for long activities; fetch with get_activity_details
+_UNRECORDED_ACTIVITY_ATTRIBUTES = frozenset(
+    {CONF_ATTR_POLYLINE, CONF_ATTR_PR_SEGMENTS, CONF_ATTR_KOM_SEGMENTS}
+)
+
+
+# Metrics whose value and unit depend on the configured unit system
+_CONVERTED_METRICS = frozenset(
+    {CONF_SENSOR_DISTANCE, CONF_SENSOR_ELEVATION, CONF_SENSOR_SPEED, CONF_SENSOR_PACE}
+)
+
+
+def _is_metric_entry(hass, entry) -> bool:
+    """Determine if the entry is configured for metric units."""
+    override = entry.options.get(
+        CONF_DISTANCE_UNIT_OVERRIDE, entry.data.get(CONF_DISTANCE_UNIT_OVERRIDE)
+    )
+    if override == CONF_DISTANCE_UNIT_OVERRIDE_METRIC:
+        return True
+    if override in (CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT, None):
+        return hass.config.units is METRIC_SYSTEM
+    return False
+
+
+def _get_value_or_unavailable(value):
+    """Return the value or None if None, blank, or -1."""
+    if value is None or value == "" or value == -1:
+        return None
+    return value
+
+
+def _metric_value(activity: dict, metric_type: str, is_metric: bool):
+    """Return an activity metric converted to the configured unit system."""
+    distance = activity.get(CONF_SENSOR_DISTANCE, 0)
+    moving_time = activity.get(CONF_SENSOR_MOVING_TIME, 0)
+
+    if metric_type == CONF_SENSOR_PACE:
+        if distance == 0 or moving_time == 0:
+            return 0.0
+        pace = moving_time / (distance / 1000)  # seconds per km
+        if not is_metric:
+            # pace is s/km; multiply by km-per-mile to get s/mile
+            pace = pace * DistanceConverter.convert(
+                1, UnitOfLength.MILES, UnitOfLength.KILOMETERS
             )
+        return round(pace / 60, 3)  # decimal minutes
+
+    if metric_type == CONF_SENSOR_SPEED:
+        if distance == 0 or moving_time == 0:
+            return 0.0
+        speed = (distance / 1000) / (moving_time / 3600)  # km/h
+        if is_metric:
+            return round(speed, 2)
+        return round(
+            SpeedConverter.convert(
+                speed, UnitOfSpeed.KILOMETERS_PER_HOUR, UnitOfSpeed.MILES_PER_HOUR
+            ),
+            2,
         )
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_METRIC:
-            return True
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT:
-            return self.hass.config.units is METRIC_SYSTEM
-        # If override is None or imperial, check HA system units as fallback
-        if override is None:
-            return self.hass.config.units is METRIC_SYSTEM
-        return False
+
+    value = _get_value_or_unavailable(activity.get(metric_type))
+    if metric_type == CONF_SENSOR_DISTANCE:
+        # Convert from meters to km/miles
+        distance = value / 1000 if value else 0
+        if is_metric:
+            return round(distance, 2)
+        return round(
+            DistanceConverter.convert(
+                distance, UnitOfLength.KILOMETERS, UnitOfLength.MILES
+            ),
+            2,
+        )
+    if metric_type == CONF_SENSOR_ELEVATION:
+        # Convert from meters to meters/feet
+        elevation = value if value else 0
+        if is_metric:
+            return round(elevation, 2)
+        return round(
+            DistanceConverter.convert(
+                elevation, UnitOfLength.METERS, UnitOfLength.FEET
+            ),
+            2,
+        )
+    return value
+
+
+def _metric_unit(metric_type: str, is_metric: bool) -> str | None:
+    """Return the unit of an activity metric in the configured unit system."""
+    if metric_type == CONF_SENSOR_PACE:
+        return (
+            UNIT_PACE_MINUTES_PER_KILOMETER if is_metric else UNIT_PACE_MINUTES_PER_MILE
+        )
+
+    unit = CONF_ATTRIBUTE_SENSORS.get(metric_type, {}).get("unit")
+    if not unit:
+        return None
+
+    if metric_type == CONF_SENSOR_DISTANCE:
+        return UnitOfLength.KILOMETERS if is_metric else UnitOfLength.MILES
+    if metric_type == CONF_SENSOR_ELEVATION:
+        return UnitOfLength.METERS if is_metric else UnitOfLength.FEET
+    if metric_type == CONF_SENSOR_SPEED:
+        return (
+            UnitOfSpeed.KILOMETERS_PER_HOUR if is_metric else UnitOfSpeed.MILES_PER_HOUR
+        )
+    if metric_type in [CONF_SENSOR_MOVING_TIME, CONF_SENSOR_ELAPSED_TIME]:
+        return UnitOfTime.SECONDS
+    if metric_type == CONF_SENSOR_CALORIES:
+        return UnitOfEnergy.KILO_CALORIE
+    if metric_type in [CONF_SENSOR_HEART_RATE_AVG, CONF_SENSOR_HEART_RATE_MAX]:
+        return "bpm"
+    if metric_type == CONF_SENSOR_CADENCE_AVG:
+        return "spm"
+    if metric_type == CONF_SENSOR_POWER:
+        return UnitOfPower.WATT
+    return unit
+
+
+def _attribute_sensor_types(options) -> list[str]:
+    """Return the selected attribute sensor types, in their usual order."""
+    selected_attribute_sensors = options.get(
+        CONF_ATTRIBUTE_SENSORS_TO_CREATE, CONF_ATTRIBUTE_SENSOR_TYPES
+    )
+    return [
+        attribute_type
+        for attribute_type in CONF_ATTRIBUTE_SENSOR_TYPES
+        if attribute_type in selected_attribute_sensors
+    ]
+
+
+def _compact_metric_types(options) -> list[str] | None:
+    """Return the metrics the main sensors carry, or None outside compact mode."""
+    if not options.get(CONF_COMPACT_SENSORS, False):
+        return None
+    return _attribute_sensor_types(options) + [CONF_SENSOR_GEAR_NAME]
+
+
+def _compact_metrics(activity: dict, metric_types: list[str], is_metric: bool) -> dict:
+    """Return the compact mode payload: each metric's value and unit."""
+    metrics = {}
+    for metric_type in metric_types:
+        if metric_type == CONF_SENSOR_DEVICE_INFO:
+            value = _get_value_or_unavailable(activity.get(CONF_SENSOR_DEVICE_NAME))
+        elif metric_type in (CONF_SENSOR_DATE, CONF_SENSOR_GEAR_NAME):
+            value = _get_value_or_unavailable(activity.get(metric_type))
+        else:
+            value = _metric_value(activity, metric_type, is_metric)
+        metrics[metric_type] = {
+            "value": value,
+            "unit": _metric_unit(metric_type, is_metric),
+        }
+    return metrics
 
 
 class StravaActivityTypeSensor(CoordinatorEntity, SensorEntity):
     """A sensor for specific activity type with latest activity data."""
 
     _attr_has_entity_name = True
+    _unrecorded_attributes = _UNRECORDED_ACTIVITY_ATTRIBUTES
     _attr_state_class = None
     _attr_device_class = None
 
@@ -600,29 +932,15 @@ class StravaActivityTypeSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._activity_type = activity_type
         self._athlete_id = athlete_id
-        self._athlete_name = get_athlete_name_from_title(self.coordinator.entry.title)
-        self._normalized_activity_type = normalize_activity_type(activity_type)
-        self._attr_unique_id = f"strava_{athlete_id}_{self._normalized_activity_type}"
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {
-                (
-                    DOMAIN,
-                    generate_device_id(
-                        self._athlete_id, self._normalized_activity_type
-                    ),
-                )
-            },
-            "name": generate_device_name(
-                self._athlete_name, format_activity_type_display(self._activity_type)
-            ),
-            "manufacturer": "Powered by Strava",
-            "model": f"{self._activity_type} Activity",
-            "configuration_url": f"{STRAVA_ACTHLETE_BASE_URL}{self._athlete_id}",
-        }
+        self._attr_unique_id = (
+            f"strava_{athlete_id}_{normalize_activity_type(activity_type)}"
+        )
+        self._attr_device_info = _activity_device_info(
+            self.coordinator, athlete_id, activity_type
+        )
+        self._attr_icon = ACTIVITY_TYPE_ICONS.get(activity_type, "mdi:run")
+        self._metric_types = None
+        self._metrics = None
 
     @property
     def _latest_activity(self):
@@ -640,11 +958,6 @@ class StravaActivityTypeSensor(CoordinatorEntity, SensorEntity):
         """Return if entity is available."""
         return self._latest_activity is not None
 
-    @property
-    def icon(self):
-        """Return the icon of the sensor."""
-        return ACTIVITY_TYPE_ICONS.get(self._activity_type, "mdi:run")
-
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -690,8 +1003,26 @@ class StravaActivityTypeSensor(CoordinatorEntity, SensorEntity):
             attrs[CONF_SENSOR_LATITUDE] = float(start_latlng[0])
             attrs[CONF_SENSOR_LONGITUDE] = float(start_latlng[1])
 
+        # Compact mode can be switched in the options without a reload
+        metric_types = _compact_metric_types(self.coordinator.entry.options)
+        if metric_types is not None:
+            if self._metrics is None or metric_types != self._metric_types:
+                self._metric_types = metric_types
+                self._metrics = _compact_metrics(
+                    activity,
+                    metric_types,
+                    _is_metric_entry(self.hass, self.coordinator.entry),
+                )
+            attrs[CONF_ATTR_METRICS] = self._metrics
+
         return attrs
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute the compact metrics once per coordinator update."""
+        self._metrics = None
+        super()._handle_coordinator_update()
+
     def _calculate_pace(self, activity):
         """Calculate pace for the activity, returning decimal minutes."""
         distance = activity.get(CONF_SENSOR_DISTANCE, 0)
@@ -701,7 +1032,7 @@ class StravaActivityTypeSensor(CoordinatorEntity, SensorEntity):
             return 0.0
 
         pace = moving_time / (distance / 1000)  # seconds per km
-        if not self._is_metric():
+        if not _is_metric_entry(self.hass, self.coordinator.entry):
             # pace is s/km; multiply by km-per-mile to get s/mile
             pace = pace * DistanceConverter.convert(
                 1, UnitOfLength.MILES, UnitOfLength.KILOMETERS
@@ -718,7 +1049,7 @@ class StravaActivityTypeSensor(CoordinatorEntity, SensorEntity):
             return 0.0
 
         speed = (distance / 1000) / (moving_time / 3600)  # km/h
-        is_metric = self._is_metric()
+        is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
 
         if is_metric:
             return round(speed, 2)
@@ -730,26 +1061,6 @@ class StravaActivityTypeSensor(CoordinatorEntity, SensorEntity):
             2,
         )
 
-    def _is_metric(self):
-        """Determine if the user has configured metric units."""
-        override = (
-            self.coordinator.entry.options.get(CONF_DISTANCE_UNIT_OVERRIDE)
-            if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.options
-            else (
-                self.coordinator.entry.data.get(CONF_DISTANCE_UNIT_OVERRIDE)
-                if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.data
-                else None
-            )
-        )
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_METRIC:
-            return True
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT:
-            return self.hass.config.units is METRIC_SYSTEM
-        # If override is None or imperial, check HA system units as fallback
-        if override is None:
-            return self.hass.config.units is METRIC_SYSTEM
-        return False
-
 
 class StravaActivityAttributeSensor(CoordinatorEntity, SensorEntity):
     """Base class for individual activity attribute sensors."""
@@ -768,31 +1079,15 @@ class StravaActivityAttributeSensor(CoordinatorEntity, SensorEntity):
         self._activity_type = activity_type
         self._attribute_type = attribute_type
         self._athlete_id = athlete_id
-        self._athlete_name = get_athlete_name_from_title(self.coordinator.entry.title)
-        self._normalized_activity_type = normalize_activity_type(activity_type)
         self._attr_unique_id = generate_sensor_id(
-            athlete_id, self._normalized_activity_type, attribute_type
+            athlete_id, normalize_activity_type(activity_type), attribute_type
         )
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {
-                (
-                    DOMAIN,
-                    generate_device_id(
-                        self._athlete_id, self._normalized_activity_type
-                    ),
-                )
-            },
-            "name": generate_device_name(
-                self._athlete_name, format_activity_type_display(self._activity_type)
-            ),
-            "manufacturer": "Powered by Strava",
-            "model": f"{self._activity_type} Activity",
-            "configuration_url": f"{STRAVA_ACTHLETE_BASE_URL}{self._athlete_id}",
-        }
+        self._attr_device_info = _activity_device_info(
+            self.coordinator, athlete_id, activity_type
+        )
+        self.entity_description = _ATTRIBUTE_SENSOR_DESCRIPTIONS.get(
+            attribute_type
+        ) or _attribute_sensor_description(attribute_type)
 
     @property
     def _latest_activity(self):
@@ -810,54 +1105,6 @@ class StravaActivityAttributeSensor(CoordinatorEntity, SensorEntity):
         """Return if entity is available."""
         return self._latest_activity is not None
 
-    @property
-    def icon(self):
-        """Return the icon of the sensor."""
-        return CONF_ATTRIBUTE_SENSORS.get(self._attribute_type, {}).get(
-            "icon", "mdi:information"
-        )
-
-    @property
-    def device_class(self):
-        """Return the device class of the sensor."""
-        return CONF_ATTRIBUTE_SENSORS.get(self._attribute_type, {}).get("device_class")
-
-    @property
-    def state_class(self):
-        """Return the state class of the sensor."""
-        return CONF_ATTRIBUTE_SENSORS.get(self._attribute_type, {}).get("state_class")
-
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return generate_sensor_name(self._attribute_type)
-
-    def _get_value_or_unavailable(self, value):
-        """Return the value or None if None, blank, or -1."""
-        if value is None or value == "" or value == -1:
-            return None
-        return value
-
-    def _is_metric(self):
-        """Determine if the user has configured metric units."""
-        override = (
-            self.coordinator.entry.options.get(CONF_DISTANCE_UNIT_OVERRIDE)
-            if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.options
-            else (
-                self.coordinator.entry.data.get(CONF_DISTANCE_UNIT_OVERRIDE)
-                if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.data
-                else None
-            )
-        )
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_METRIC:
-            return True
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT:
-            return self.hass.config.units is METRIC_SYSTEM
-        # If override is None or imperial, check HA system units as fallback
-        if override is None:
-            return self.hass.config.units is METRIC_SYSTEM
-        return False
-
 
 class StravaActivityGearSensor(StravaActivityAttributeSensor):
     """Sensor for gear information - shows gear name as value with other gear details as attributes."""
@@ -878,7 +1125,7 @@ class StravaActivityGearSensor(StravaActivityAttributeSensor):
             return None
 
         activity = self._latest_activity
-        return self._get_value_or_unavailable(activity.get(CONF_SENSOR_GEAR_NAME))
+        return _get_value_or_unavailable(activity.get(CONF_SENSOR_GEAR_NAME))
 
     @property
     def extra_state_attributes(self):
@@ -908,7 +1155,7 @@ class StravaActivityGearSensor(StravaActivityAttributeSensor):
         gear_distance = activity.get(CONF_SENSOR_GEAR_DISTANCE)
         if gear_distance is not None:
             # Convert distance to appropriate units
-            is_metric = self._is_metric()
+            is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
             if is_metric:
                 attributes["gear_distance"] = round(
                     gear_distance / 1000, 2
@@ -956,7 +1203,7 @@ class StravaActivityDeviceSensor(StravaActivityAttributeSensor):
             return None
 
         activity = self._latest_activity
-        return self._get_value_or_unavailable(activity.get(self._device_attribute))
+        return _get_value_or_unavailable(activity.get(self._device_attribute))
 
 
 class StravaActivityDeviceInfoSensor(StravaActivityAttributeSensor):
@@ -980,7 +1227,7 @@ class StravaActivityDeviceInfoSensor(StravaActivityAttributeSensor):
             return None
 
         activity = self._latest_activity
-        return self._get_value_or_unavailable(activity.get(CONF_SENSOR_DEVICE_NAME))
+        return _get_value_or_unavailable(activity.get(CONF_SENSOR_DEVICE_NAME))
 
     @property
     def extra_state_attributes(self):
@@ -1059,125 +1306,19 @@ class StravaActivityMetricSensor(StravaActivityAttributeSensor):
         if not self.available:
             return None
 
-        activity = self._latest_activity
-
-        if self._metric_type == CONF_SENSOR_PACE:
-            return self._calculate_pace(activity)
-        elif self._metric_type == CONF_SENSOR_SPEED:
-            return self._calculate_speed(activity)
-        else:
-            value = self._get_value_or_unavailable(activity.get(self._metric_type))
-
-            # Apply unit conversions for distance and elevation
-            if self._metric_type == CONF_SENSOR_DISTANCE:
-                # Convert from meters to km/miles
-                distance = value / 1000 if value else 0
-                is_metric = self._is_metric()
-                if is_metric:
-                    return round(distance, 2)
-                return round(
-                    DistanceConverter.convert(
-                        distance, UnitOfLength.KILOMETERS, UnitOfLength.MILES
-                    ),
-                    2,
-                )
-            elif self._metric_type == CONF_SENSOR_ELEVATION:
-                # Convert from meters to meters/feet
-                elevation = value if value else 0
-                is_metric = self._is_metric()
-                if is_metric:
-                    return round(elevation, 2)
-                return round(
-                    DistanceConverter.convert(
-                        elevation, UnitOfLength.METERS, UnitOfLength.FEET
-                    ),
-                    2,
-                )
-            else:
-                return value
+        return _metric_value(
+            self._latest_activity, self._metric_type, self._uses_metric_units()
+        )
 
     @property
     def native_unit_of_measurement(self):
         """Return the unit of measurement."""
-        if self._metric_type == CONF_SENSOR_PACE:
-            return (
-                UNIT_PACE_MINUTES_PER_KILOMETER
-                if self._is_metric()
-                else UNIT_PACE_MINUTES_PER_MILE
-            )
-
-        config = CONF_ATTRIBUTE_SENSORS.get(self._metric_type, {})
-        unit = config.get("unit")
-
-        if not unit:
-            return None
-
-        # Handle unit conversion for distance and elevation
-        if self._metric_type in [CONF_SENSOR_DISTANCE, CONF_SENSOR_ELEVATION]:
-            is_metric = self._is_metric()
-            if self._metric_type == CONF_SENSOR_DISTANCE:
-                return UnitOfLength.KILOMETERS if is_metric else UnitOfLength.MILES
-            else:  # elevation
-                return UnitOfLength.METERS if is_metric else UnitOfLength.FEET
-        elif self._metric_type == CONF_SENSOR_SPEED:
-            is_metric = self._is_metric()
-            return (
-                UnitOfSpeed.KILOMETERS_PER_HOUR
-                if is_metric
-                else UnitOfSpeed.MILES_PER_HOUR
-            )
-        elif self._metric_type in [CONF_SENSOR_MOVING_TIME, CONF_SENSOR_ELAPSED_TIME]:
-            return UnitOfTime.SECONDS
-        elif self._metric_type == CONF_SENSOR_CALORIES:
-            return UnitOfEnergy.KILO_CALORIE
-        elif self._metric_type in [
-            CONF_SENSOR_HEART_RATE_AVG,
-            CONF_SENSOR_HEART_RATE_MAX,
-        ]:
-            return "bpm"
-        elif self._metric_type == CONF_SENSOR_CADENCE_AVG:
-            return "spm"
-        elif self._metric_type == CONF_SENSOR_POWER:
-            return UnitOfPower.WATT
-
-        return unit
-
-    def _calculate_pace(self, activity):
-        """Calculate pace for the activity, returning decimal minutes."""
-        distance = activity.get(CONF_SENSOR_DISTANCE, 0)
-        moving_time = activity.get(CONF_SENSOR_MOVING_TIME, 0)
-
-        if distance == 0 or moving_time == 0:
-            return 0.0
-
-        pace = moving_time / (distance / 1000)  # seconds per km
-        if not self._is_metric():
-            # pace is s/km; multiply by km-per-mile to get s/mile
-            pace = pace * DistanceConverter.convert(
-                1, UnitOfLength.MILES, UnitOfLength.KILOMETERS
-            )
+        return _metric_unit(self._metric_type, self._uses_metric_units())
 
-        return round(pace / 60, 3)  # decimal minutes
-
-    def _calculate_speed(self, activity):
-        """Calculate speed for the activity."""
-        distance = activity.get(CONF_SENSOR_DISTANCE, 0)
-        moving_time = activity.get(CONF_SENSOR_MOVING_TIME, 0)
-
-        if distance == 0 or moving_time == 0:
-            return 0.0
-
-        speed = (distance / 1000) / (moving_time / 3600)  # km/h
-        is_metric = self._is_metric()
-
-        if is_metric:
-            return round(speed, 2)
-
-        return round(
-            SpeedConverter.convert(
-                speed, UnitOfSpeed.KILOMETERS_PER_HOUR, UnitOfSpeed.MILES_PER_HOUR
-            ),
-            2,
+    def _uses_metric_units(self):
+        """Return the unit system, only looked up for metrics it affects."""
+        return self._metric_type in _CONVERTED_METRICS and _is_metric_entry(
+            self.hass, self.coordinator.entry
         )
 
     @property
@@ -1208,7 +1349,7 @@ class StravaActivityMetricSensor(StravaActivityAttributeSensor):
                 secs = int(round((pace_val - mins) * 60))
                 unit = (
                     UNIT_PACE_MINUTES_PER_KILOMETER
-                    if self._is_metric()
+                    if _is_metric_entry(self.hass, self.coordinator.entry)
                     else UNIT_PACE_MINUTES_PER_MILE
                 )
                 attributes["formatted_pace"] = f"{mins}:{secs:02d} {unit}"
@@ -1221,6 +1362,7 @@ class StravaRecentActivitySensor(CoordinatorEntity, SensorEntity):
     """A sensor for the most recent activity across all activity types."""
 
     _attr_has_entity_name = True
+    _unrecorded_attributes = _UNRECORDED_ACTIVITY_ATTRIBUTES
     _attr_state_class = None
     _attr_device_class = None
 
@@ -1233,31 +1375,15 @@ class StravaRecentActivitySensor(CoordinatorEntity, SensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._athlete_id = athlete_id
-        self._athlete_name = get_athlete_name_from_title(self.coordinator.entry.title)
         self._activity_index = activity_index
         self._attr_unique_id = generate_recent_activity_sensor_id(
             athlete_id, "recent", activity_index
         )
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {
-                (
-                    DOMAIN,
-                    generate_recent_activity_device_id(
-                        self._athlete_id, self._activity_index
-                    ),
-                )
-            },
-            "name": generate_recent_activity_device_name(
-                self._athlete_name, self._activity_index
-            ),
-            "manufacturer": "Powered by Strava",
-            "model": "Recent Activity",
-            "configuration_url": f"{STRAVA_ACTHLETE_BASE_URL}{self._athlete_id}",
-        }
+        self._attr_device_info = _recent_activity_device_info(
+            self.coordinator, athlete_id, activity_index
+        )
+        self._metric_types = None
+        self._metrics = None
 
     @property
     def _latest_activity(self):
@@ -1328,8 +1454,26 @@ class StravaRecentActivitySensor(CoordinatorEntity, SensorEntity):
             attrs[CONF_SENSOR_LATITUDE] = float(start_latlng[0])
             attrs[CONF_SENSOR_LONGITUDE] = float(start_latlng[1])
 
+        # Compact mode can be switched in the options without a reload
+        metric_types = _compact_metric_types(self.coordinator.entry.options)
+        if metric_types is not None:
+            if self._metrics is None or metric_types != self._metric_types:
+                self._metric_types = metric_types
+                self._metrics = _compact_metrics(
+                    activity,
+                    metric_types,
+                    _is_metric_entry(self.hass, self.coordinator.entry),
+                )
+            attrs[CONF_ATTR_METRICS] = self._metrics
+
         return attrs
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute the compact metrics once per coordinator update."""
+        self._metrics = None
+        super()._handle_coordinator_update()
+
 
 class StravaRecentActivityAttributeSensor(CoordinatorEntity, SensorEntity):
     """Base class for individual recent activity attribute sensors."""
@@ -1347,31 +1491,16 @@ class StravaRecentActivityAttributeSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._attribute_type = attribute_type
         self._athlete_id = athlete_id
-        self._athlete_name = get_athlete_name_from_title(self.coordinator.entry.title)
         self._activity_index = activity_index
         self._attr_unique_id = generate_recent_activity_sensor_id(
             athlete_id, attribute_type, activity_index
         )
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {
-                (
-                    DOMAIN,
-                    generate_recent_activity_device_id(
-                        self._athlete_id, self._activity_index
-                    ),
-                )
-            },
-            "name": generate_recent_activity_device_name(
-                self._athlete_name, self._activity_index
-            ),
-            "manufacturer": "Powered by Strava",
-            "model": "Recent Activity",
-            "configuration_url": f"{STRAVA_ACTHLETE_BASE_URL}{self._athlete_id}",
-        }
+        self._attr_device_info = _recent_activity_device_info(
+            self.coordinator, athlete_id, activity_index
+        )
+        self.entity_description = _ATTRIBUTE_SENSOR_DESCRIPTIONS.get(
+            attribute_type
+        ) or _attribute_sensor_description(attribute_type)
 
     @property
     def _latest_activity(self):
@@ -1389,54 +1518,6 @@ class StravaRecentActivityAttributeSensor(CoordinatorEntity, SensorEntity):
         """Return if entity is available."""
         return self._latest_activity is not None
 
-    @property
-    def icon(self):
-        """Return the icon of the sensor."""
-        return CONF_ATTRIBUTE_SENSORS.get(self._attribute_type, {}).get(
-            "icon", "mdi:information"
-        )
-
-    @property
-    def device_class(self):
-        """Return the device class of the sensor."""
-        return CONF_ATTRIBUTE_SENSORS.get(self._attribute_type, {}).get("device_class")
-
-    @property
-    def state_class(self):
-        """Return the state class of the sensor."""
-        return CONF_ATTRIBUTE_SENSORS.get(self._attribute_type, {}).get("state_class")
-
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return generate_recent_activity_sensor_name(self._attribute_type)
-
-    def _get_value_or_unavailable(self, value):
-        """Return the value or None if None, blank, or -1."""
-        if value is None or value == "" or value == -1:
-            return None
-        return value
-
-    def _is_metric(self):
-        """Determine if the user has configured metric units."""
-        override = (
-            self.coordinator.entry.options.get(CONF_DISTANCE_UNIT_OVERRIDE)
-            if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.options
-            else (
-                self.coordinator.entry.data.get(CONF_DISTANCE_UNIT_OVERRIDE)
-                if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.data
-                else None
-            )
-        )
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_METRIC:
-            return True
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT:
-            return self.hass.config.units is METRIC_SYSTEM
-        # If override is None or imperial, check HA system units as fallback
-        if override is None:
-            return self.hass.config.units is METRIC_SYSTEM
-        return False
-
 
 class StravaRecentActivityGearSensor(StravaRecentActivityAttributeSensor):
     """Sensor for gear information on recent activity."""
@@ -1457,7 +1538,7 @@ class StravaRecentActivityGearSensor(StravaRecentActivityAttributeSensor):
             return None
 
         activity = self._latest_activity
-        return self._get_value_or_unavailable(activity.get(CONF_SENSOR_GEAR_NAME))
+        return _get_value_or_unavailable(activity.get(CONF_SENSOR_GEAR_NAME))
 
     @property
     def extra_state_attributes(self):
@@ -1485,7 +1566,7 @@ class StravaRecentActivityGearSensor(StravaRecentActivityAttributeSensor):
 
         gear_distance = activity.get(CONF_SENSOR_GEAR_DISTANCE)
         if gear_distance is not None:
-            is_metric = self._is_metric()
+            is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
             if is_metric:
                 attributes["gear_distance"] = round(gear_distance / 1000, 2)
                 attributes["gear_distance_unit"] = "km"
@@ -1529,7 +1610,7 @@ class StravaRecentActivityDeviceInfoSensor(StravaRecentActivityAttributeSensor):
             return None
 
         activity = self._latest_activity
-        return self._get_value_or_unavailable(activity.get(CONF_SENSOR_DEVICE_NAME))
+        return _get_value_or_unavailable(activity.get(CONF_SENSOR_DEVICE_NAME))
 
     @property
     def extra_state_attributes(self):
@@ -1608,121 +1689,19 @@ class StravaRecentActivityMetricSensor(StravaRecentActivityAttributeSensor):
         if not self.available:
             return None
 
-        activity = self._latest_activity
-
-        if self._metric_type == CONF_SENSOR_PACE:
-            return self._calculate_pace(activity)
-        elif self._metric_type == CONF_SENSOR_SPEED:
-            return self._calculate_speed(activity)
-        else:
-            value = self._get_value_or_unavailable(activity.get(self._metric_type))
-
-            if self._metric_type == CONF_SENSOR_DISTANCE:
-                distance = value / 1000 if value else 0
-                is_metric = self._is_metric()
-                if is_metric:
-                    return round(distance, 2)
-                return round(
-                    DistanceConverter.convert(
-                        distance, UnitOfLength.KILOMETERS, UnitOfLength.MILES
-                    ),
-                    2,
-                )
-            elif self._metric_type == CONF_SENSOR_ELEVATION:
-                elevation = value if value else 0
-                is_metric = self._is_metric()
-                if is_metric:
-                    return round(elevation, 2)
-                return round(
-                    DistanceConverter.convert(
-                        elevation, UnitOfLength.METERS, UnitOfLength.FEET
-                    ),
-                    2,
-                )
-            else:
-                return value
+        return _metric_value(
+            self._latest_activity, self._metric_type, self._uses_metric_units()
+        )
 
     @property
     def native_unit_of_measurement(self):
         """Return the unit of measurement."""
-        if self._metric_type == CONF_SENSOR_PACE:
-            return (
-                UNIT_PACE_MINUTES_PER_KILOMETER
-                if self._is_metric()
-                else UNIT_PACE_MINUTES_PER_MILE
-            )
-
-        config = CONF_ATTRIBUTE_SENSORS.get(self._metric_type, {})
-        unit = config.get("unit")
-
-        if not unit:
-            return None
-
-        if self._metric_type in [CONF_SENSOR_DISTANCE, CONF_SENSOR_ELEVATION]:
-            is_metric = self._is_metric()
-            if self._metric_type == CONF_SENSOR_DISTANCE:
-                return UnitOfLength.KILOMETERS if is_metric else UnitOfLength.MILES
-            else:
-                return UnitOfLength.METERS if is_metric else UnitOfLength.FEET
-        elif self._metric_type == CONF_SENSOR_SPEED:
-            is_metric = self._is_metric()
-            return (
-                UnitOfSpeed.KILOMETERS_PER_HOUR
-                if is_metric
-                else UnitOfSpeed.MILES_PER_HOUR
-            )
-        elif self._metric_type in [CONF_SENSOR_MOVING_TIME, CONF_SENSOR_ELAPSED_TIME]:
-            return UnitOfTime.SECONDS
-        elif self._metric_type == CONF_SENSOR_CALORIES:
-            return UnitOfEnergy.KILO_CALORIE
-        elif self._metric_type in [
-            CONF_SENSOR_HEART_RATE_AVG,
-            CONF_SENSOR_HEART_RATE_MAX,
-        ]:
-            return "bpm"
-        elif self._metric_type == CONF_SENSOR_CADENCE_AVG:
-            return "spm"
-        elif self._metric_type == CONF_SENSOR_POWER:
-            return "W"
-
-        return unit
+        return _metric_unit(self._metric_type, self._uses_metric_units())
 
-    def _calculate_pace(self, activity):
-        """Calculate pace for the activity, returning decimal minutes."""
-        distance = activity.get(CONF_SENSOR_DISTANCE, 0)
-        moving_time = activity.get(CONF_SENSOR_MOVING_TIME, 0)
-
-        if distance == 0 or moving_time == 0:
-            return 0.0
-
-        pace = moving_time / (distance / 1000)  # seconds per km
-        if not self._is_metric():
-            # pace is s/km; multiply by km-per-mile to get s/mile
-            pace = pace * DistanceConverter.convert(
-                1, UnitOfLength.MILES, UnitOfLength.KILOMETERS
-            )
-
-        return round(pace / 60, 3)  # decimal minutes
-
-    def _calculate_speed(self, activity):
-        """Calculate speed for the activity."""
-        distance = activity.get(CONF_SENSOR_DISTANCE, 0)
-        moving_time = activity.get(CONF_SENSOR_MOVING_TIME, 0)
-
-        if distance == 0 or moving_time == 0:
-            return 0.0
-
-        speed = (distance / 1000) / (moving_time / 3600)
-        is_metric = self._is_metric()
-
-        if is_metric:
-            return round(speed, 2)
-
-        return round(
-            SpeedConverter.convert(
-                speed, UnitOfSpeed.KILOMETERS_PER_HOUR, UnitOfSpeed.MILES_PER_HOUR
-            ),
-            2,
+    def _uses_metric_units(self):
+        """Return the unit system, only looked up for metrics it affects."""
+        return self._metric_type in _CONVERTED_METRICS and _is_metric_entry(
+            self.hass, self.coordinator.entry
         )
 
     @property
@@ -1753,7 +1732,7 @@ class StravaRecentActivityMetricSensor(StravaRecentActivityAttributeSensor):
                 secs = int(round((pace_val - mins) * 60))
                 unit = (
                     UNIT_PACE_MINUTES_PER_KILOMETER
-                    if self._is_metric()
+                    if _is_metric_entry(self.hass, self.coordinator.entry)
                     else UNIT_PACE_MINUTES_PER_MILE
                 )
                 attributes["formatted_pace"] = f"{mins}:{secs:02d} {unit}"
@@ -1784,7 +1763,6 @@ class StravaGearNameSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._gear_id = gear_id
         self._athlete_id = athlete_id
-        self._athlete_name = get_athlete_name_from_title(self.coordinator.entry.title)
         self._attr_unique_id = generate_gear_sensor_id(athlete_id, gear_id, "name")
 
     @property
@@ -1796,15 +1774,9 @@ class StravaGearNameSensor(CoordinatorEntity, SensorEntity):
             if gear_data
             else f"Gear {self._gear_id}"
         )
-        return {
-            "identifiers": {
-                (DOMAIN, generate_gear_device_id(self._athlete_id, self._gear_id))
-            },
-            "name": generate_gear_device_name(self._athlete_name, gear_name),
-            "manufacturer": "Powered by Strava",
-            "model": "Gear",
-            "configuration_url": f"{STRAVA_ACTHLETE_BASE_URL}{self._athlete_id}",
-        }
+        return _gear_device_info(
+            self.coordinator, self._athlete_id, self._gear_id, gear_name
+        )
 
     @property
     def _gear_data(self):
@@ -1880,7 +1852,6 @@ class StravaGearDistanceSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._gear_id = gear_id
         self._athlete_id = athlete_id
-        self._athlete_name = get_athlete_name_from_title(self.coordinator.entry.title)
         self._attr_unique_id = generate_gear_sensor_id(athlete_id, gear_id, "distance")
 
     @property
@@ -1892,15 +1863,9 @@ class StravaGearDistanceSensor(CoordinatorEntity, SensorEntity):
             if gear_data
             else f"Gear {self._gear_id}"
         )
-        return {
-            "identifiers": {
-                (DOMAIN, generate_gear_device_id(self._athlete_id, self._gear_id))
-            },
-            "name": generate_gear_device_name(self._athlete_name, gear_name),
-            "manufacturer": "Powered by Strava",
-            "model": "Gear",
-            "configuration_url": f"{STRAVA_ACTHLETE_BASE_URL}{self._athlete_id}",
-        }
+        return _gear_device_info(
+            self.coordinator, self._athlete_id, self._gear_id, gear_name
+        )
 
     @property
     def _gear_data(self):
@@ -1933,7 +1898,7 @@ class StravaGearDistanceSensor(CoordinatorEntity, SensorEntity):
             return None
         # Convert from meters to km/miles
         distance_km = distance_meters / 1000
-        is_metric = self._is_metric()
+        is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
         if is_metric:
             return round(distance_km, 2)
         return round(
@@ -1946,7 +1911,7 @@ class StravaGearDistanceSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_unit_of_measurement(self):
         """Return the unit of measurement."""
-        is_metric = self._is_metric()
+        is_metric = _is_metric_entry(self.hass, self.coordinator.entry)
         return UnitOfLength.KILOMETERS if is_metric else UnitOfLength.MILES
 
     @property
@@ -1954,22 +1919,147 @@ class StravaGearDistanceSensor(CoordinatorEntity, SensorEntity):
         """Return the name of the sensor."""
         return generate_gear_sensor_name("distance")
 
-    def _is_metric(self):
-        """Determine if the user has configured metric units."""
-        override = (
-            self.coordinator.entry.options.get(CONF_DISTANCE_UNIT_OVERRIDE)
-            if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.options
-            else (
-                self.coordinator.entry.data.get(CONF_DISTANCE_UNIT_OVERRIDE)
-                if CONF_DISTANCE_UNIT_OVERRIDE in self.coordinator.entry.data
-                else None
+
+class StravaCurveSensor(CoordinatorEntity, SensorEntity):
+    """All-time best curve (power, heart rate, pace or best efforts).
+
+    The state is the curve's headline point (20 minutes, or 5k for best
+    efforts); every point of the curve and the activity that set it are
+    exposed as attributes.
+    """
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: StravaDataUpdateCoordinator,
+        curve_type: str,
+        athlete_id: str,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._curve_type = curve_type
+        self._athlete_id = athlete_id
+        self._attr_unique_id = f"strava_{athlete_id}_curve_{curve_type}"
+        self._attr_device_info = _stats_device_info(self.coordinator, athlete_id)
+        self._attr_name, self._attr_icon = _CURVE_SENSOR_NAMES_AND_ICONS[curve_type]
+        self._headline_key = (
+            CURVE_HEADLINE_DISTANCE
+            if curve_type == CURVE_BEST_EFFORTS
+            else str(CURVE_HEADLINE_DURATION)
+        )
+        if curve_type == CURVE_POWER:
+            self._attr_device_class = SensorDeviceClass.POWER
+        elif curve_type == CURVE_BEST_EFFORTS:
+            self._attr_device_class = SensorDeviceClass.DURATION
+
+    @property
+    def _curve(self) -> dict:
+        """Get the all-time curve points for this sensor."""
+        if not self.coordinator.data:
+            return {}
+        return (self.coordinator.data.get("curves") or {}).get(self._curve_type) or {}
+
+    @property
+    def available(self):
+        """Return if entity is available."""
+        return self._headline_key in self._curve
+
+    def _convert(self, value):
+        """Convert a stored curve value to this sensor's unit."""
+        if self._curve_type != CURVE_PACE:
+            return value
+        # Stored as seconds per km; report decimal minutes like the pace sensors
+        if not _is_metric_entry(self.hass, self.coordinator.entry):
+            value = value * DistanceConverter.convert(
+                1, UnitOfLength.MILES, UnitOfLength.KILOMETERS
+            )
+        return round(value / 60, 3)
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        if not self.available:
+            return None
+        return self._convert(self._curve[self._headline_key]["value"])
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit of measurement."""
+        if self._curve_type == CURVE_POWER:
+            return UnitOfPower.WATT
+        if self._curve_type == CURVE_HEARTRATE:
+            return "bpm"
+        if self._curve_type == CURVE_PACE:
+            return (
+                UNIT_PACE_MINUTES_PER_KILOMETER
+                if _is_metric_entry(self.hass, self.coordinator.entry)
+                else UNIT_PACE_MINUTES_PER_MILE
             )
+        return UnitOfTime.SECONDS
+
+    @property
+    def extra_state_attributes(self):
+        """Return every curve point and the activity that set it."""
+        if self._curve_type == CURVE_BEST_EFFORTS:
+            keys = [key for key in CURVE_BEST_EFFORT_DISTANCES if key in self._curve]
+        else:
+            keys = [str(d) for d in CURVE_DURATIONS if str(d) in self._curve]
+
+        attributes = {}
+        for key in keys:
+            point = self._curve[key]
+            label = (
+                key
+                if self._curve_type == CURVE_BEST_EFFORTS
+                else format_curve_duration(int(key))
+            )
+            attributes[label] = self._convert(point["value"])
+            attributes[f"{label}_{CONF_ATTR_ACTIVITY_ID}"] = str(point["activity_id"])
+        return attributes
+
+
+class StravaApiStatusSensor(CoordinatorEntity, SensorEntity):
+    """Whether requests to the Strava API go out or fail fast.
+
+    Follows the coordinator's circuit breaker: closed while the API answers,
+    open while it is paused after repeated failures and half_open while a
+    probe request checks whether it is back.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = "API Status"
+    _attr_icon = "mdi:api"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = CIRCUIT_STATES
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({"consecutive_failures"})
+
+    def __init__(self, coordinator: StravaDataUpdateCoordinator, athlete_id: str):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"strava_{athlete_id}_api_status"
+        self._attr_device_info = _stats_device_info(self.coordinator, athlete_id)
+
+    async def async_added_to_hass(self) -> None:
+        """Update as soon as the circuit opens or closes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.api_circuit.async_add_listener(self.async_write_ha_state)
         )
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_METRIC:
-            return True
-        if override == CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT:
-            return self.hass.config.units is METRIC_SYSTEM
-        # If override is None or imperial, check HA system units as fallback
-        if override is None:
-            return self.hass.config.units is METRIC_SYSTEM
-        return False
+
+    @property
+    def available(self):
+        """Return True; an outage is reported, not hidden."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the state of the circuit breaker."""
+        return self.coordinator.api_circuit.state
+
+    @property
+    def extra_state_attributes(self):
+        """Return the number of consecutive failed requests."""
+        return {"consecutive_failures": self.coordinator.api_circuit.failures}
@@ -0,0 +1,195 @@
+"""Grid-bucketed spatial index over activity start and end points.
+
+Points are bucketed into fixed-size lat/lon cells so a proximity query only
+has to look at the handful of cells overlapping the search radius instead of
+scanning every known activity.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Iterator
+
+from .const import (
+    CONF_ATTR_END_LATLONG,
+    CONF_ATTR_SPORT_TYPE,
+    CONF_ATTR_START_LATLONG,
+    CONF_SENSOR_DATE,
+    CONF_SENSOR_ID,
+    CONF_SENSOR_TITLE,
+    SPATIAL_INDEX_CELL_DEGREES,
+    SPATIAL_POINT_END,
+    SPATIAL_POINT_START,
+)
+
+EARTH_RADIUS_METERS = 6_371_008.8
+_METERS_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_METERS / 180
+
+_POINT_KEYS = {
+    SPATIAL_POINT_START: CONF_ATTR_START_LATLONG,
+    SPATIAL_POINT_END: CONF_ATTR_END_LATLONG,
+}
+
+
+def haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in meters."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _parse_latlng(value) -> tuple[float, float] | None:
+    """Return (lat, lon) from a Strava latlng pair, or None if missing/invalid."""
+    if not value or len(value) != 2:
+        return None
+    try:
+        return float(value[0]), float(value[1])
+    except (TypeError, ValueError):
+        return None
+
+
+class ActivitySpatialIndex:
+    """Incrementally maintained grid index of activity start/end points."""
+
+    def __init__(self, cell_degrees: float = SPATIAL_INDEX_CELL_DEGREES):
+        """Initialize an empty index."""
+        self._cell_degrees = cell_degrees
+        self._cells: dict[str, dict[tuple[int, int], set]] = {
+            kind: {} for kind in _POINT_KEYS
+        }
+        self._points: dict[object, dict[str, tuple[float, float]]] = {}
+        self._summaries: dict[object, dict] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed activities."""
+        return len(self._summaries)
+
+    def __contains__(self, activity_id) -> bool:
+        """Return True if the activity is indexed."""
+        return activity_id in self._summaries
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return (
+            math.floor(lat / self._cell_degrees),
+            math.floor(lon / self._cell_degrees),
+        )
+
+    def update(self, activities: Iterable[dict]) -> int:
+        """Upsert a batch of activities and return how many changed.
+
+        Activities that are no longer in the batch are kept, so the index keeps
+        growing as older activities scroll out of the coordinator's window.
+        """
+        return sum(1 for activity in activities if self.upsert(activity))
+
+    def upsert(self, activity: dict) -> bool:
+        """Add or refresh a single activity; return True if its points changed."""
+        activity_id = activity.get(CONF_SENSOR_ID)
+        if activity_id is None:
+            return False
+
+        points = {}
+        for kind, key in _POINT_KEYS.items():
+            if (latlng := _parse_latlng(activity.get(key))) is not None:
+                points[kind] = latlng
+
+        self._summaries[activity_id] = {
+            CONF_SENSOR_TITLE: activity.get(CONF_SENSOR_TITLE),
+            CONF_ATTR_SPORT_TYPE: activity.get(CONF_ATTR_SPORT_TYPE),
+            CONF_SENSOR_DATE: activity.get(CONF_SENSOR_DATE),
+        }
+
+        if self._points.get(activity_id) == points:
+            return False
+
+        self._remove_points(activity_id)
+        self._points[activity_id] = points
+        for kind, (lat, lon) in points.items():
+            self._cells[kind].setdefault(self._cell(lat, lon), set()).add(activity_id)
+        return True
+
+    def remove(self, activity_id) -> None:
+        """Drop an activity from the index."""
+        self._remove_points(activity_id)
+        self._points.pop(activity_id, None)
+        self._summaries.pop(activity_id, None)
+
+    def _remove_points(self, activity_id) -> None:
+        for kind, (lat, lon) in self._points.get(activity_id, {}).items():
+            cell = self._cell(lat, lon)
+            bucket = self._cells[kind].get(cell)
+            if bucket is None:
+                continue
+            bucket.discard(activity_id)
+            if not bucket:
+                del self._cells[kind][cell]
+
+    def _candidates(
+        self, lat: float, lon: float, radius_m: float, kind: str
+    ) -> Iterator[object]:
+        """Yield activity ids whose `kind` point lies in a cell near the radius."""
+        cells = self._cells[kind]
+        d_lat = radius_m / _METERS_PER_DEGREE_LAT
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        d_lon = min(radius_m / (_METERS_PER_DEGREE_LAT * cos_lat), 180.0)
+
+        min_row, min_col = self._cell(lat - d_lat, lon - d_lon)
+        max_row, max_col = self._cell(lat + d_lat, lon + d_lon)
+
+        # For very large radii, walking every cell in the box costs more than
+        # walking the occupied cells, so fall back to those.
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(cells):
+            for (row, col), bucket in cells.items():
+                if min_row <= row <= max_row and min_col <= col <= max_col:
+                    yield from bucket
+            return
+
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                if bucket := cells.get((row, col)):
+                    yield from bucket
+
+    def query(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        point: str = SPATIAL_POINT_START,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Return activities with a start/end point within radius_m, nearest first.
+
+        point is "start", "end" or "any"; with "any" each activity is reported
+        once, using whichever of its points is closer.
+        """
+        kinds = list(_POINT_KEYS) if point not in _POINT_KEYS else [point]
+        matches: dict[object, dict] = {}
+
+        for kind in kinds:
+            for activity_id in self._candidates(lat, lon, radius_m, kind):
+                p_lat, p_lon = self._points[activity_id][kind]
+                distance = haversine_meters(lat, lon, p_lat, p_lon)
+                if distance > radius_m:
+                    continue
+                best = matches.get(activity_id)
+                if best is not None and best["distance_m"] <= distance:
+                    continue
+                matches[activity_id] = {
+                    "activity_id": activity_id,
+                    "point": kind,
+                    "latitude": p_lat,
+                    "longitude": p_lon,
+                    "distance_m": distance,
+                    **self._summaries[activity_id],
+                }
+
+        results = sorted(matches.values(), key=lambda match: match["distance_m"])
+        if limit is not None:
+            results = results[:limit]
+        return results
@@ -0,0 +1,279 @@
+"""Compact columnar on-disk cache for Strava activity streams.
+
+Each activity's streams are stored as one file. Every series is quantized to
+fixed-point integers, delta encoded into a typed int32 array and compressed on
+its own, so a reader only inflates the columns it actually asks for. Files are
+evicted least-recently-used once the cache grows past its byte budget.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from .const import CONF_STREAMS_CACHE_MAX_BYTES, STREAM_TYPES
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"HAS1"
+_HEADER_LEN = struct.Struct("<I")
+_FILE_SUFFIX = ".bin"
+
+# Fixed-point scale per column. latlng is split into two columns so each one
+# delta encodes on its own.
+_COLUMN_SCALES = {
+    "time": 1,
+    "distance": 10,
+    "lat": 1_000_000,
+    "lng": 1_000_000,
+    "altitude": 10,
+    "heartrate": 1,
+    "watts": 1,
+    "cadence": 1,
+}
+
+
+def _encode_column(values: Iterable, scale: int) -> bytes:
+    """Quantize, delta encode and compress a numeric series."""
+    deltas = array("i")
+    previous = 0
+    for value in values:
+        # Strava occasionally sends nulls (e.g. dropped power meter samples);
+        # carry the last reading forward rather than breaking the series.
+        current = previous if value is None else round(value * scale)
+        deltas.append(current - previous)
+        previous = current
+    if sys.byteorder == "big":
+        deltas.byteswap()
+    return zlib.compress(deltas.tobytes())
+
+
+def _decode_column(payload: bytes, scale: int) -> list:
+    """Inverse of _encode_column."""
+    deltas = array("i")
+    deltas.frombytes(zlib.decompress(payload))
+    if sys.byteorder == "big":
+        deltas.byteswap()
+
+    values = []
+    current = 0
+    for delta in deltas:
+        current += delta
+        values.append(current if scale == 1 else current / scale)
+    return values
+
+
+def encode_streams(streams: dict[str, list]) -> bytes:
+    """Serialize raw Strava streams ({type: [values]}) to the cache format."""
+    columns: dict[str, list] = {}
+    for key in STREAM_TYPES:
+        data = streams.get(key)
+        if not data:
+            continue
+        if key == "latlng":
+            columns["lat"] = [point[0] if point else None for point in data]
+            columns["lng"] = [point[1] if point else None for point in data]
+        else:
+            columns[key] = data
+
+    header = []
+    chunks = []
+    for name, values in columns.items():
+        chunk = _encode_column(values, _COLUMN_SCALES[name])
+        header.append({"name": name, "length": len(values), "size": len(chunk)})
+        chunks.append(chunk)
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    return b"".join(
+        [_MAGIC, _HEADER_LEN.pack(len(header_bytes)), header_bytes, *chunks]
+    )
+
+
+def decode_streams(blob: bytes, keys: Iterable[str] | None = None) -> dict[str, list]:
+    """Deserialize cached streams, inflating only the requested stream types."""
+    if blob[:4] != _MAGIC:
+        raise ValueError("Not a stream cache file")
+
+    (header_len,) = _HEADER_LEN.unpack_from(blob, 4)
+    offset = 4 + _HEADER_LEN.size
+    header = json.loads(blob[offset : offset + header_len])
+    offset += header_len
+
+    wanted = set(STREAM_TYPES if keys is None else keys)
+    if "latlng" in wanted:
+        wanted.update(("lat", "lng"))
+
+    columns = {}
+    for column in header:
+        name, size = column["name"], column["size"]
+        if name in wanted:
+            columns[name] = _decode_column(
+                blob[offset : offset + size], _COLUMN_SCALES[name]
+            )
+        offset += size
+
+    streams = {}
+    for key in STREAM_TYPES:
+        if key not in wanted:
+            continue
+        if key == "latlng":
+            if "lat" in columns and "lng" in columns:
+                streams[key] = [
+                    [lat, lng] for lat, lng in zip(columns["lat"], columns["lng"])
+                ]
+        elif key in columns:
+            streams[key] = columns[key]
+    return streams
+
+
+def downsample(streams: dict[str, list], max_points: int) -> dict[str, list]:
+    """Return streams thinned to at most max_points evenly spaced samples.
+
+    The first and last samples are always kept so charts span the whole
+    activity.
+    """
+    length = max((len(values) for values in streams.values()), default=0)
+    if max_points <= 0 or length <= max_points:
+        return streams
+
+    if max_points == 1:
+        indices = [0]
+    else:
+        step = (length - 1) / (max_points - 1)
+        indices = [round(i * step) for i in range(max_points)]
+
+    return {
+        key: [values[i] for i in indices if i < len(values)]
+        for key, values in streams.items()
+    }
+
+
+class StreamCache:
+    """Size-bounded, least-recently-used on-disk cache of encoded streams.
+
+    All methods do blocking file IO and must be run in the executor.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = CONF_STREAMS_CACHE_MAX_BYTES):
+        """Initialize the cache; the directory is created on first write."""
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the number of bytes currently on disk."""
+        return self._total_bytes
+
+    def _path(self, activity_id) -> str:
+        return os.path.join(self._directory, f"{int(activity_id):d}{_FILE_SUFFIX}")
+
+    def _ensure_loaded(self) -> OrderedDict[str, int]:
+        """Rebuild the LRU order from file modification times on first use."""
+        if self._entries is not None:
+            return self._entries
+
+        found = []
+        try:
+            with os.scandir(self._directory) as entries:
+                for entry in entries:
+                    key = entry.name[: -len(_FILE_SUFFIX)]
+                    if (
+                        entry.is_file()
+                        and entry.name.endswith(_FILE_SUFFIX)
+                        and key.isdigit()
+                    ):
+                        stat = entry.stat()
+                        found.append((stat.st_mtime, key, stat.st_size))
+        except FileNotFoundError:
+            pass
+
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def __contains__(self, activity_id) -> bool:
+        """Return True if streams for the activity are cached."""
+        with self._lock:
+            return str(int(activity_id)) in self._ensure_loaded()
+
+    def get(self, activity_id, keys: Iterable[str] | None = None) -> dict | None:
+        """Return decoded streams for an activity, or None on a cache miss."""
+        key = str(int(activity_id))
+        with self._lock:
+            entries = self._ensure_loaded()
+            if key not in entries:
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as file:
+                    blob = file.read()
+                os.utime(path)
+            except OSError as err:
+                _LOGGER.debug(f"Dropping unreadable stream cache entry {key}: {err}")
+                self._total_bytes -= entries.pop(key)
+                return None
+            entries.move_to_end(key)
+
+        try:
+            return decode_streams(blob, keys)
+        except (ValueError, zlib.error) as err:
+            _LOGGER.warning(f"Discarding corrupt stream cache entry {key}: {err}")
+            self.remove(key)
+            return None
+
+    def put(self, activity_id, streams: dict[str, list]) -> int:
+        """Encode and store raw streams for an activity; return the file size."""
+        key = str(int(activity_id))
+        blob = encode_streams(streams)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+
+        with self._lock:
+            entries = self._ensure_loaded()
+            os.makedirs(self._directory, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                file.write(blob)
+            os.replace(tmp_path, path)
+
+            self._total_bytes += len(blob) - entries.pop(key, 0)
+            entries[key] = len(blob)
+            self._evict(keep=key)
+
+        return len(blob)
+
+    def remove(self, activity_id) -> None:
+        """Drop an activity's streams from the cache."""
+        key = str(int(activity_id))
+        with self._lock:
+            entries = self._ensure_loaded()
+            if key in entries:
+                self._total_bytes -= entries.pop(key)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self, keep: str) -> None:
+        """Remove least recently used files until under the byte budget."""
+        entries = self._entries
+        while self._total_bytes > self._max_bytes and len(entries) > 1:
+            oldest = next(iter(entries))
+            if oldest == keep:
+                break
+            self._total_bytes -= entries.pop(oldest)
+            try:
+                os.remove(self._path(oldest))
+            except FileNotFoundError:
+                pass
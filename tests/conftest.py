@@ -19,6 +19,17 @@ from custom_components.ha_strava.const import (
 pytest_plugins = ["pytest_homeassistant_custom_component"]
 
 
+@pytest.fixture(autouse=True)
+def isolated_image_cache(tmp_path, monkeypatch):
+    """Keep cached and library photos out of the shared test config directory."""
+    monkeypatch.setattr(
+        "custom_components.ha_strava.camera.IMAGE_CACHE_DIR", str(tmp_path / "images")
+    )
+    monkeypatch.setattr(
+        "custom_components.ha_strava.library.MEDIA_DIR", str(tmp_path / "media")
+    )
+
+
 @pytest.fixture
 def mock_config_entry():
     """Mock config entry for testing."""
@@ -57,6 +57,7 @@ class TestStravaActivityAttributeSensor:
     def test_device_info(self):
         """Test device info."""
         coordinator = MagicMock()
+        coordinator.device_infos = {}
         coordinator.data = {
             "activities": [],
             "athlete": {"id": 12345, "firstname": "Test", "lastname": "User"},
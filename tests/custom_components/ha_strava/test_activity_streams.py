@@ -0,0 +1,342 @@
+"""Test activity streams cache and get_activity_streams service for ha_strava."""
+
+import json
+import os
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.ha_strava import async_setup_entry, async_unload_entry
+from custom_components.ha_strava.const import (
+    CONF_SENSOR_ID,
+    DOMAIN,
+    SERVICE_GET_ACTIVITY_STREAMS,
+)
+from custom_components.ha_strava.coordinator import StravaDataUpdateCoordinator
+from custom_components.ha_strava.spatial import ActivitySpatialIndex
+from custom_components.ha_strava.streams import (
+    StreamCache,
+    decode_streams,
+    downsample,
+    encode_streams,
+)
+
+STREAMS_URL = re.compile(r"^https://www\.strava\.com/api/v3/activities/\d+/streams")
+
+
+def _raw_streams(length=3600):
+    """Build an hour of 1 Hz ride data shaped like Strava's streams."""
+    return {
+        "time": list(range(length)),
+        "distance": [round(i * 8.3, 1) for i in range(length)],
+        "latlng": [
+            [round(51.5 + i * 1e-5, 6), round(-0.12 + i * 2e-5, 6)]
+            for i in range(length)
+        ],
+        "altitude": [round(20 + (i % 300) * 0.1, 1) for i in range(length)],
+        "heartrate": [120 + i % 40 for i in range(length)],
+        "watts": [200 + (i * 7) % 90 for i in range(length)],
+        "cadence": [85 + i % 10 for i in range(length)],
+    }
+
+
+def _api_payload(raw):
+    return {
+        key: {"data": data, "series_type": "time", "original_size": len(data)}
+        for key, data in raw.items()
+    }
+
+
+class TestStreamEncoding:
+    """Test the columnar stream encoding."""
+
+    def test_round_trip(self):
+        """Test that encoded streams decode back to the original values."""
+        raw = _raw_streams(500)
+        assert decode_streams(encode_streams(raw)) == raw
+
+    def test_encoded_size_is_much_smaller_than_json(self):
+        """Test that delta encoding plus compression beats raw JSON by a wide margin."""
+        raw = _raw_streams()
+        encoded = encode_streams(raw)
+
+        assert len(encoded) * 5 < len(json.dumps(raw))
+
+    def test_decode_only_requested_keys(self):
+        """Test that decoding can be limited to a subset of streams."""
+        raw = _raw_streams(100)
+        decoded = decode_streams(encode_streams(raw), ["heartrate", "latlng"])
+
+        assert set(decoded) == {"heartrate", "latlng"}
+        assert decoded["latlng"] == raw["latlng"]
+
+    def test_missing_streams_are_omitted(self):
+        """Test that streams absent from the input are absent after decoding."""
+        decoded = decode_streams(encode_streams({"time": [0, 1, 2]}))
+
+        assert decoded == {"time": [0, 1, 2]}
+
+    def test_null_samples_carry_previous_value(self):
+        """Test that null samples are filled with the previous reading."""
+        decoded = decode_streams(encode_streams({"watts": [None, 100, None, 150]}))
+
+        assert decoded["watts"] == [0, 100, 100, 150]
+
+    def test_decode_rejects_foreign_data(self):
+        """Test that a blob without the cache header is rejected."""
+        with pytest.raises(ValueError):
+            decode_streams(b"not a stream file")
+
+
+class TestDownsample:
+    """Test stream downsampling."""
+
+    def test_short_series_unchanged(self):
+        """Test that series within the limit are returned as-is."""
+        streams = {"time": [0, 1, 2]}
+        assert downsample(streams, 10) is streams
+
+    def test_zero_means_full_resolution(self):
+        """Test that max_points of 0 disables downsampling."""
+        streams = {"time": list(range(1000))}
+        assert downsample(streams, 0) is streams
+
+    def test_keeps_first_and_last_samples(self):
+        """Test that downsampling keeps the endpoints and respects the limit."""
+        streams = {"time": list(range(3600)), "watts": list(range(3600))}
+        result = downsample(streams, 100)
+
+        assert len(result["time"]) == 100
+        assert result["time"][0] == 0
+        assert result["time"][-1] == 3599
+        assert result["watts"] == result["time"]
+
+
+class TestStreamCache:
+    """Test the on-disk LRU stream cache."""
+
+    def test_put_and_get(self, tmp_path):
+        """Test that stored streams can be read back."""
+        cache = StreamCache(str(tmp_path / "streams"))
+        raw = _raw_streams(100)
+
+        assert cache.get(1) is None
+        size = cache.put(1, raw)
+
+        assert 1 in cache
+        assert cache.total_bytes == size
+        assert cache.get(1) == raw
+        assert cache.get(1, ["time"]) == {"time": raw["time"]}
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that the oldest unread entry is evicted once over budget."""
+        size = len(encode_streams(_raw_streams(100)))
+        cache = StreamCache(str(tmp_path), max_bytes=size * 2 + size // 2)
+
+        cache.put(1, _raw_streams(100))
+        cache.put(2, _raw_streams(100))
+        cache.get(1)  # 2 is now the least recently used
+        cache.put(3, _raw_streams(100))
+
+        assert 1 in cache
+        assert 2 not in cache
+        assert 3 in cache
+        assert not os.path.exists(tmp_path / "2.bin")
+        assert cache.total_bytes <= size * 2 + size // 2
+
+    def test_index_rebuilt_from_disk(self, tmp_path):
+        """Test that a new cache instance picks up existing files."""
+        StreamCache(str(tmp_path)).put(1, _raw_streams(10))
+
+        cache = StreamCache(str(tmp_path))
+
+        assert 1 in cache
+        assert cache.total_bytes > 0
+        assert cache.get(1)["time"] == list(range(10))
+
+    def test_corrupt_entry_is_discarded(self, tmp_path):
+        """Test that unreadable files are treated as cache misses and removed."""
+        cache = StreamCache(str(tmp_path))
+        cache.put(1, _raw_streams(10))
+        (tmp_path / "1.bin").write_bytes(b"garbage")
+
+        assert cache.get(1) is None
+        assert 1 not in cache
+
+    def test_non_numeric_ids_are_rejected(self, tmp_path):
+        """Test that only integer activity IDs map to files in the cache."""
+        (tmp_path / "notes.bin").write_bytes(b"unrelated")
+        cache = StreamCache(str(tmp_path))
+
+        with pytest.raises(ValueError):
+            cache.put("../escape", _raw_streams(10))
+        assert cache.total_bytes == 0
+        assert not (tmp_path.parent / "escape.bin").exists()
+
+
+class TestCoordinatorActivityStreams:
+    """Test StravaDataUpdateCoordinator.async_get_activity_streams."""
+
+    @pytest.mark.asyncio
+    async def test_streams_fetched_once(
+        self, hass: HomeAssistant, mock_config_entry, aioresponses_mock, tmp_path
+    ):
+        """Test that streams are fetched from the API once and then served from disk."""
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=mock_config_entry)
+        coordinator.stream_cache = StreamCache(str(tmp_path))
+        raw = _raw_streams(100)
+        aioresponses_mock.get(STREAMS_URL, payload=_api_payload(raw), status=200)
+
+        first = await coordinator.async_get_activity_streams(12345)
+        second = await coordinator.async_get_activity_streams(12345, ["watts"])
+
+        assert first == raw
+        assert second == {"watts": raw["watts"]}
+        assert len(aioresponses_mock.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_streams_not_found(
+        self, hass: HomeAssistant, mock_config_entry, aioresponses_mock, tmp_path
+    ):
+        """Test that a 404 from Strava returns None and caches nothing."""
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=mock_config_entry)
+        coordinator.stream_cache = StreamCache(str(tmp_path))
+        aioresponses_mock.get(STREAMS_URL, status=404)
+
+        assert await coordinator.async_get_activity_streams(12345) is None
+        assert 12345 not in coordinator.stream_cache
+
+    @pytest.mark.asyncio
+    async def test_streams_api_error(
+        self, hass: HomeAssistant, mock_config_entry, aioresponses_mock, tmp_path
+    ):
+        """Test that API errors are raised as UpdateFailed."""
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=mock_config_entry)
+        coordinator.stream_cache = StreamCache(str(tmp_path))
+        aioresponses_mock.get(STREAMS_URL, status=500)
+
+        with pytest.raises(UpdateFailed):
+            await coordinator.async_get_activity_streams(12345)
+
+
+class TestGetActivityStreamsService:
+    """Test get_activity_streams service registration and handling."""
+
+    async def _setup(self, hass, mock_config_entry, mock_coordinator):
+        with patch(
+            "custom_components.ha_strava.StravaDataUpdateCoordinator",
+            return_value=mock_coordinator,
+        ):
+            with patch(
+                "custom_components.ha_strava.renew_webhook_subscription",
+                new_callable=AsyncMock,
+            ):
+                with patch.object(hass, "http", MagicMock()):
+                    with patch.object(
+                        hass.config_entries,
+                        "async_forward_entry_setups",
+                        new_callable=AsyncMock,
+                    ):
+                        assert await async_setup_entry(hass, mock_config_entry)
+
+    @pytest.mark.asyncio
+    async def test_service_returns_downsampled_streams(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that the service downsamples and reports the original size."""
+        mock_coordinator.data = {"activities": [{CONF_SENSOR_ID: 12345}]}
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        mock_coordinator.async_get_activity_streams = AsyncMock(
+            return_value={"time": list(range(3600))}
+        )
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        result = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_ACTIVITY_STREAMS,
+            {"activity_id": "12345", "keys": ["time"], "max_points": 50},
+            blocking=True,
+            return_response=True,
+        )
+
+        mock_coordinator.async_get_activity_streams.assert_awaited_once_with(
+            12345, ["time"]
+        )
+        assert result["activity_id"] == "12345"
+        assert result["original_points"] == 3600
+        assert len(result["streams"]["time"]) == 50
+
+    @pytest.mark.asyncio
+    async def test_service_raises_when_no_streams(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that a missing stream raises ServiceValidationError."""
+        mock_coordinator.data = {"activities": []}
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        mock_coordinator.async_get_activity_streams = AsyncMock(return_value=None)
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_GET_ACTIVITY_STREAMS,
+                {"activity_id": "99999"},
+                blocking=True,
+                return_response=True,
+            )
+
+    @pytest.mark.asyncio
+    async def test_service_rejects_unknown_stream_key(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that unsupported stream types are rejected by the schema."""
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        with pytest.raises(Exception):  # voluptuous.Invalid
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_GET_ACTIVITY_STREAMS,
+                {"activity_id": "12345", "keys": ["temp"]},
+                blocking=True,
+                return_response=True,
+            )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("activity_id", ["../../secrets", "12345/../1", "-1"])
+    async def test_service_rejects_non_numeric_activity_id(
+        self, hass, mock_config_entry, mock_coordinator, activity_id
+    ):
+        """Test that only positive integer activity IDs reach the API or disk."""
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        mock_coordinator.async_get_activity_streams = AsyncMock()
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        with pytest.raises(Exception):  # voluptuous.Invalid
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_GET_ACTIVITY_STREAMS,
+                {"activity_id": activity_id},
+                blocking=True,
+                return_response=True,
+            )
+        mock_coordinator.async_get_activity_streams.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_service_removed_on_last_entry_unload(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that the service is removed when the last config entry is unloaded."""
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        assert hass.services.has_service(DOMAIN, SERVICE_GET_ACTIVITY_STREAMS)
+        assert await async_unload_entry(hass, mock_config_entry)
+        assert not hass.services.has_service(DOMAIN, SERVICE_GET_ACTIVITY_STREAMS)
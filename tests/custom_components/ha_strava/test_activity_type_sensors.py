@@ -329,6 +329,7 @@ class TestStravaActivityTypeSensor:
         """Test sensor device info."""
         # Setup
         coordinator = MagicMock()
+        coordinator.device_infos = {}
         coordinator.data = {
             "activities": [],
             "athlete": {"id": 12345, "firstname": "Test", "lastname": "User"},
@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
@@ -12,6 +14,7 @@ from custom_components.ha_strava.const import (
     CONF_SENSOR_ID,
     DOMAIN,
 )
+from custom_components.ha_strava.coordinator import StravaDataUpdateCoordinator
 
 
 @pytest.mark.asyncio
@@ -31,6 +34,7 @@ async def test_button_setup_creates_buttons(
 
     coordinator = mock_coordinator
     coordinator.data = {"activities": activities}
+    coordinator.async_add_listener = MagicMock()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][mock_config_entry.entry_id] = coordinator
@@ -102,3 +106,30 @@ async def test_recent_activity_refresh_button_presses_triggers_single_refresh(
     await button.async_press()
 
     coordinator.async_refresh_activity.assert_called_once_with(20)
+
+
+@pytest.mark.asyncio
+async def test_button_added_for_new_sport_type(
+    hass: HomeAssistant, mock_config_entry
+) -> None:
+    mock_config_entry.add_to_hass(hass)
+    with patch("homeassistant.helpers.frame.report_usage"):
+        coordinator = StravaDataUpdateCoordinator(hass, entry=mock_config_entry)
+    run = {CONF_SENSOR_ID: 1, CONF_ATTR_SPORT_TYPE: "Run"}
+    coordinator.async_set_updated_data({"activities": [run]})
+    hass.data.setdefault(DOMAIN, {})[mock_config_entry.entry_id] = coordinator
+    added: list = []
+
+    await async_setup_entry(hass, mock_config_entry, added.append)
+    coordinator.async_set_updated_data(
+        {"activities": [{CONF_SENSOR_ID: 2, CONF_ATTR_SPORT_TYPE: "Run"}, run]}
+    )
+    coordinator.async_set_updated_data(
+        {"activities": [{CONF_SENSOR_ID: 3, CONF_ATTR_SPORT_TYPE: "Swim"}, run]}
+    )
+
+    # Another run adds nothing, the first swim adds its button
+    assert len(added) == 2
+    assert [type(button) for button in added[1]] == [StravaActivityRefreshButton]
+    assert added[1][0].unique_id.endswith("_swim_refresh")
+    await mock_config_entry._async_process_on_unload(hass)
@@ -1,14 +1,21 @@
 """Test camera platform for ha_strava."""
 
+import asyncio
 import sys
+import time
 from datetime import datetime
+from hashlib import md5
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from aioresponses import aioresponses
 from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
+from yarl import URL
 
 from custom_components.ha_strava.const import CONF_PHOTOS, DOMAIN
 
@@ -25,7 +32,31 @@ if "homeassistant.components.camera" not in sys.modules:
     camera_module.Camera = MockCamera
     sys.modules["homeassistant.components.camera"] = camera_module
 
-from custom_components.ha_strava.camera import UrlCam, async_setup_entry
+from custom_components.ha_strava.camera import (
+    _PLACEHOLDER_PATH,
+    UrlCam,
+    async_setup_entry,
+)
+from custom_components.ha_strava.playlist import PhotoPlaylist
+
+with open(_PLACEHOLDER_PATH, "rb") as _file:
+    PLACEHOLDER = _file.read()
+
+FRAMES = 50
+
+
+async def _frame_server(connections: set) -> TestServer:
+    """Start a local image server that records each client connection."""
+
+    async def handle(request: web.Request) -> web.Response:
+        connections.add(request.transport.get_extra_info("peername"))
+        return web.Response(body=b"\x89PNG" + b"\x00" * 2048)
+
+    app = web.Application()
+    app.router.add_get("/{name}.png", handle)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    return server
 
 
 class TestStravaCamera:
@@ -129,9 +160,7 @@ class TestStravaCamera:
 
         async_add_entities_mock = AsyncMock()
 
-        with patch(
-            "custom_components.ha_strava.camera.async_track_time_interval"
-        ), patch.object(
+        with patch.object(
             UrlCam, "async_load_storage", new_callable=AsyncMock
         ) as mock_load_storage:
             await async_setup_entry(hass, config_entry, async_add_entities_mock)
@@ -170,9 +199,7 @@ class TestStravaCamera:
 
         async_add_entities_mock = AsyncMock()
 
-        with patch(
-            "custom_components.ha_strava.camera.async_track_time_interval"
-        ), patch.object(
+        with patch.object(
             UrlCam, "async_load_storage", new_callable=AsyncMock
         ) as mock_load_storage:
             await async_setup_entry(hass, config_entry, async_add_entities_mock)
@@ -294,13 +321,15 @@ class TestStravaCamera:
 
             # Add some URLs
             test_date = datetime(2024, 1, 1, 12, 0, 0)
-            camera._urls = {
-                "abc123": {
-                    "date": test_date,
-                    "url": "https://example.com/photo1.jpg",
-                    "activity_id": 1,
+            camera._urls = PhotoPlaylist(
+                {
+                    "abc123": {
+                        "date": test_date,
+                        "url": "https://example.com/photo1.jpg",
+                        "activity_id": 1,
+                    }
                 }
-            }
+            )
 
             # Save to storage
             await camera._async_save_storage()
@@ -427,21 +456,16 @@ class TestStravaCamera:
 
     @pytest.mark.asyncio
     async def test_camera_image_returns_default_when_no_urls(self, hass: HomeAssistant):
-        """Test async_camera_image falls back to the default image when empty."""
+        """Test async_camera_image serves the bundled placeholder when empty."""
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
 
-        with aioresponses() as mocked, patch(
-            "custom_components.ha_strava.camera._DEFAULT_IMAGE_URL",
-            "https://example.com/default.png",
-        ):
-            mocked.get(
-                "https://example.com/default.png", status=200, body=b"default-bytes"
-            )
+        with aioresponses() as mocked:
             image = await camera.async_camera_image()
 
-        assert image == b"default-bytes"
+        assert image == PLACEHOLDER
+        assert not mocked.requests
 
     @pytest.mark.asyncio
     async def test_camera_image_fetches_current_url(self, hass: HomeAssistant):
@@ -449,13 +473,15 @@ class TestStravaCamera:
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
-        camera._urls = {
-            "abc123": {
-                "date": datetime(2024, 1, 1),
-                "url": "https://example.com/photo1.jpg",
-                "activity_id": 1,
+        camera._urls = PhotoPlaylist(
+            {
+                "abc123": {
+                    "date": datetime(2024, 1, 1),
+                    "url": "https://example.com/photo1.jpg",
+                    "activity_id": 1,
+                }
             }
-        }
+        )
 
         with aioresponses() as mocked:
             mocked.get(
@@ -471,25 +497,21 @@ class TestStravaCamera:
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
-        camera._urls = {
-            "abc123": {
-                "date": datetime(2024, 1, 1),
-                "url": "https://example.com/photo1.jpg",
-                "activity_id": 1,
+        camera._urls = PhotoPlaylist(
+            {
+                "abc123": {
+                    "date": datetime(2024, 1, 1),
+                    "url": "https://example.com/photo1.jpg",
+                    "activity_id": 1,
+                }
             }
-        }
+        )
 
-        with aioresponses() as mocked, patch(
-            "custom_components.ha_strava.camera._DEFAULT_IMAGE_URL",
-            "https://example.com/default.png",
-        ):
+        with aioresponses() as mocked:
             mocked.get("https://example.com/photo1.jpg", status=404)
-            mocked.get(
-                "https://example.com/default.png", status=200, body=b"default-bytes"
-            )
             image = await camera.async_camera_image()
 
-        assert image == b"default-bytes"
+        assert image == PLACEHOLDER
 
     @pytest.mark.asyncio
     async def test_camera_image_falls_back_on_client_error(self, hass: HomeAssistant):
@@ -499,42 +521,77 @@ class TestStravaCamera:
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
-        camera._urls = {
-            "abc123": {
-                "date": datetime(2024, 1, 1),
-                "url": "https://example.com/photo1.jpg",
-                "activity_id": 1,
+        camera._urls = PhotoPlaylist(
+            {
+                "abc123": {
+                    "date": datetime(2024, 1, 1),
+                    "url": "https://example.com/photo1.jpg",
+                    "activity_id": 1,
+                }
             }
-        }
+        )
 
-        with aioresponses() as mocked, patch(
-            "custom_components.ha_strava.camera._DEFAULT_IMAGE_URL",
-            "https://example.com/default.png",
-        ):
+        with aioresponses() as mocked:
             mocked.get(
                 "https://example.com/photo1.jpg",
                 exception=aiohttp.ClientError("boom"),
             )
-            mocked.get(
-                "https://example.com/default.png", status=200, body=b"default-bytes"
-            )
             image = await camera.async_camera_image()
 
-        assert image == b"default-bytes"
+        assert image == PLACEHOLDER
 
     @pytest.mark.asyncio
-    async def test_default_img_returns_none_on_non_200(self, hass: HomeAssistant):
-        """Test _return_default_img returns None when the fetch is not a 200."""
+    async def test_default_img_read_from_disk_once(self, hass: HomeAssistant):
+        """Test _return_default_img keeps the placeholder in memory."""
         from custom_components.ha_strava.camera import _return_default_img
 
-        with aioresponses() as mocked, patch(
-            "custom_components.ha_strava.camera._DEFAULT_IMAGE_URL",
-            "https://example.com/default.png",
-        ):
-            mocked.get("https://example.com/default.png", status=500)
-            image = await _return_default_img()
+        with patch(
+            "custom_components.ha_strava.camera._read_placeholder",
+            return_value=b"placeholder",
+        ) as mock_read:
+            assert await _return_default_img(hass) == b"placeholder"
+            assert await _return_default_img(hass) == b"placeholder"
 
-        assert image is None
+        mock_read.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failing_photo_backs_off(self, hass: HomeAssistant):
+        """Test that a failing URL isn't retried until its back-off expires."""
+        coordinator = MagicMock()
+        coordinator.entry = MagicMock(title="Strava: Test User")
+        camera = UrlCam(coordinator, hass, athlete_id="12345")
+        camera._urls = PhotoPlaylist(
+            {
+                "abc123": {
+                    "date": datetime(2024, 1, 1),
+                    "url": "https://example.com/photo1.jpg",
+                    "activity_id": 1,
+                }
+            }
+        )
+        url = "https://example.com/photo1.jpg"
+
+        with aioresponses() as mocked, patch(
+            "custom_components.ha_strava.camera.monotonic", return_value=1000.0
+        ) as mock_clock:
+            mocked.get(url, status=500, repeat=True)
+            for _ in range(3):
+                assert await camera.async_camera_image() == PLACEHOLDER
+            assert len(mocked.requests[("GET", URL(url))]) == 1
+            assert camera.diagnostics["failing_photos"] == 1
+
+            # Retried once the back-off expires, then backs off twice as long
+            mock_clock.return_value = 1061.0
+            await camera.async_camera_image()
+            assert len(mocked.requests[("GET", URL(url))]) == 2
+            assert camera._failed["abc123"] == (1181.0, 120)
+
+            mocked.clear()
+            mocked.get(url, status=200, body=b"photo-bytes")
+            mock_clock.return_value = 1200.0
+            assert await camera.async_camera_image() == b"photo-bytes"
+
+        assert camera._failed == {}
 
     @pytest.mark.asyncio
     async def test_rotate_img_advances_index(self, hass: HomeAssistant):
@@ -542,17 +599,19 @@ class TestStravaCamera:
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
-        camera._urls = {
-            "a": {"date": datetime(2024, 1, 1), "url": "u1", "activity_id": 1},
-            "b": {"date": datetime(2024, 1, 2), "url": "u2", "activity_id": 2},
-        }
+        camera._urls = PhotoPlaylist(
+            {
+                "a": {"date": datetime(2024, 1, 1), "url": "u1", "activity_id": 1},
+                "b": {"date": datetime(2024, 1, 2), "url": "u2", "activity_id": 2},
+            }
+        )
         camera.async_write_ha_state = MagicMock()
 
-        assert camera._url_index == 0
+        assert camera._urls.position == 0
         await camera.rotate_img()
-        assert camera._url_index == 1
+        assert camera._urls.position == 1
         await camera.rotate_img()
-        assert camera._url_index == 0
+        assert camera._urls.position == 0
 
     @pytest.mark.asyncio
     async def test_rotate_img_noop_when_no_urls(self, hass: HomeAssistant):
@@ -564,27 +623,63 @@ class TestStravaCamera:
 
         await camera.rotate_img()
 
-        assert camera._url_index == 0
+        assert camera._urls.position == 0
+        camera.async_write_ha_state.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rotates_only_when_viewed(self, hass: HomeAssistant):
+        """Test that frames advance the rotation once per interval, without writes.
+
+        A day of 15 s slideshow ticks used to write about 5,760 states per
+        athlete; serving a frame every 15 s for a day must write none.
+        """
+        coordinator = MagicMock()
+        coordinator.entry = MagicMock(title="Strava: Test User")
+        with patch("custom_components.ha_strava.camera.monotonic", return_value=0):
+            camera = UrlCam(coordinator, hass, athlete_id="12345", rotate_interval=15)
+        camera._urls = PhotoPlaylist(
+            {
+                "a": {"date": datetime(2024, 1, 1), "url": "u1", "activity_id": 1},
+                "b": {"date": datetime(2024, 1, 2), "url": "u2", "activity_id": 2},
+            }
+        )
+        camera._prefetch_lookahead = 0
+        camera._image_cache.async_get = AsyncMock(return_value=b"photo")
+        camera.async_write_ha_state = MagicMock()
+
+        with patch("custom_components.ha_strava.camera.monotonic") as clock:
+            clock.return_value = 10
+            await camera.async_camera_image()
+            assert camera._urls.position == 0
+
+            clock.return_value = 16
+            await camera.async_camera_image()
+            await camera.async_camera_image()
+            assert camera._urls.position == 1
+
+            for tick in range(2, 24 * 60 * 4):
+                clock.return_value = 16 + tick * 15
+                await camera.async_camera_image()
+
         camera.async_write_ha_state.assert_not_called()
+        assert "img_url" in camera._unrecorded_attributes
 
     def test_extra_state_attributes_default_when_no_urls(self, hass: HomeAssistant):
-        """Test extra_state_attributes returns the default image URL when empty."""
+        """Test extra_state_attributes has no image URL when empty."""
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
 
-        from custom_components.ha_strava.camera import _DEFAULT_IMAGE_URL
-
-        assert camera.extra_state_attributes == {"img_url": _DEFAULT_IMAGE_URL}
+        assert camera.extra_state_attributes == {"img_url": None}
 
     def test_extra_state_attributes_returns_current_url(self, hass: HomeAssistant):
         """Test extra_state_attributes returns the URL at the current index."""
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
-        camera._urls = {
-            "a": {"date": datetime(2024, 1, 1), "url": "https://example.com/a.jpg"}
-        }
+        camera._urls = PhotoPlaylist(
+            {"a": {"date": datetime(2024, 1, 1), "url": "https://example.com/a.jpg"}}
+        )
 
         assert camera.extra_state_attributes == {"img_url": "https://example.com/a.jpg"}
 
@@ -606,27 +701,31 @@ class TestStravaCamera:
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
 
+        camera.async_write_ha_state = MagicMock()
         coordinator.data = {
             "activities": [
                 {"id": 1, "start_date_local": datetime(2024, 1, 2)},
                 {"id": 2, "start_date_local": datetime(2024, 1, 1)},
             ],
-            "images": [
-                {
-                    "activity_id": 1,
-                    "url": "https://example.com/keep.jpg",
-                    "date": datetime(2024, 1, 2),
-                },
-                {
-                    "activity_id": 999,
-                    "url": "https://example.com/drop.jpg",
-                    "date": datetime(2024, 1, 1),
-                },
-            ],
         }
+        images = [
+            {
+                "activity_id": 1,
+                "url": "https://example.com/keep.jpg",
+                "date": datetime(2024, 1, 2),
+            },
+            {
+                "activity_id": 999,
+                "url": "https://example.com/drop.jpg",
+                "date": datetime(2024, 1, 1),
+            },
+        ]
 
-        with patch.object(camera, "_async_save_storage", new_callable=AsyncMock):
-            await camera._update_urls()
+        with patch.object(camera._store, "async_delay_save") as mock_save:
+            await camera._update_urls(images)
+
+        mock_save.assert_called_once()
+        camera.async_write_ha_state.assert_called_once()
 
         urls = {v["url"] for v in camera._urls.values()}
         assert "https://example.com/keep.jpg" in urls
@@ -634,58 +733,50 @@ class TestStravaCamera:
 
     @pytest.mark.asyncio
     async def test_update_urls_noop_when_no_images(self, hass: HomeAssistant):
-        """Test _update_urls does nothing when the coordinator has no images."""
+        """Test _update_urls does nothing when no photos were discovered."""
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
-        coordinator.data = {"activities": [], "images": []}
+        coordinator.data = {"activities": []}
 
-        with patch.object(
-            camera, "_async_save_storage", new_callable=AsyncMock
-        ) as mock_save:
-            await camera._update_urls()
+        with patch.object(camera._store, "async_delay_save") as mock_save:
+            await camera._update_urls([])
 
         mock_save.assert_not_called()
         assert camera._urls == {}
 
     @pytest.mark.asyncio
-    async def test_added_to_hass_registers_listener_and_updates_urls(
+    async def test_added_to_hass_listens_for_discovered_photos(
         self, hass: HomeAssistant
     ):
-        """Test async_added_to_hass wires up the coordinator listener and refreshes URLs."""
+        """Test async_added_to_hass subscribes to the photo discovery worker."""
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         coordinator.async_add_listener = MagicMock(return_value=MagicMock())
         camera = UrlCam(coordinator, hass, athlete_id="12345")
 
-        with patch.object(
-            camera, "_update_urls", new_callable=AsyncMock
-        ) as mock_update, patch.object(
-            camera, "async_on_remove", MagicMock()
-        ) as mock_on_remove:
+        with patch.object(camera, "async_on_remove", MagicMock()) as mock_on_remove:
             await camera.async_added_to_hass()
 
-        # CoordinatorEntity's own async_added_to_hass also registers a listener,
-        # so assert our handler was among the calls rather than the only one.
-        registered_callbacks = [
-            call.args[0] for call in coordinator.async_add_listener.call_args_list
-        ]
-        assert camera._handle_coordinator_update in registered_callbacks
-        mock_on_remove.assert_called()
-        mock_update.assert_called_once()
+        coordinator.photo_discovery.async_add_listener.assert_called_once_with(
+            camera._handle_new_photos
+        )
+        mock_on_remove.assert_any_call(
+            coordinator.photo_discovery.async_add_listener.return_value
+        )
 
-    def test_handle_coordinator_update_schedules_refresh(self, hass: HomeAssistant):
-        """Test _handle_coordinator_update schedules an update task and writes state."""
+    def test_handle_new_photos_schedules_update(self, hass: HomeAssistant):
+        """Test _handle_new_photos schedules adding the photos to the rotation."""
         coordinator = MagicMock()
         coordinator.entry = MagicMock(title="Strava: Test User")
         camera = UrlCam(coordinator, hass, athlete_id="12345")
         camera.hass = MagicMock()
-        camera.async_write_ha_state = MagicMock()
 
-        camera._handle_coordinator_update()
+        with patch.object(camera, "_update_urls", MagicMock()) as mock_update:
+            camera._handle_new_photos([{"url": "u"}])
 
-        camera.hass.async_create_task.assert_called_once()
-        camera.async_write_ha_state.assert_called_once()
+        mock_update.assert_called_once_with([{"url": "u"}])
+        camera.hass.async_create_task.assert_called_once_with(mock_update.return_value)
 
     @pytest.mark.asyncio
     async def test_migrate_from_pickle_handles_read_error(
@@ -700,3 +791,209 @@ class TestStravaCamera:
         await camera._migrate_from_pickle()
 
         assert camera._urls == {}
+
+
+def _photo_urls(count):
+    return {
+        f"key{i}": {
+            "date": datetime(2024, 1, i + 1),
+            "url": f"https://example.com/photo{i}.jpg",
+            "activity_id": i,
+        }
+        for i in range(count)
+    }
+
+
+def _requests_for(mocked, url):
+    return len(mocked.requests.get(("GET", URL(url)), []))
+
+
+class TestCameraPrefetch:
+    """Test prefetching the next photos on rotation."""
+
+    def _camera(self, hass, lookahead=2):
+        coordinator = MagicMock()
+        coordinator.entry = MagicMock(title="Strava: Test User", entry_id="entry1")
+        camera = UrlCam(
+            coordinator, hass, athlete_id="12345", prefetch_lookahead=lookahead
+        )
+        camera._urls = PhotoPlaylist(_photo_urls(4))
+        camera.async_write_ha_state = MagicMock()
+        return camera
+
+    @pytest.mark.asyncio
+    async def test_rotation_prefetches_lookahead(self, hass: HomeAssistant):
+        """Test that rotating downloads the next photos so frames are instant."""
+        camera = self._camera(hass, lookahead=2)
+
+        with aioresponses() as mocked:
+            for i in range(4):
+                mocked.get(
+                    f"https://example.com/photo{i}.jpg",
+                    status=200,
+                    body=f"photo{i}".encode(),
+                    repeat=True,
+                )
+            await camera.rotate_img()
+            await hass.async_block_till_done()
+
+            # Photos 2 and 3 are the next two after the new index 1
+            assert _requests_for(mocked, "https://example.com/photo2.jpg") == 1
+            assert _requests_for(mocked, "https://example.com/photo3.jpg") == 1
+            assert _requests_for(mocked, "https://example.com/photo0.jpg") == 0
+
+            await camera.rotate_img()
+            await hass.async_block_till_done()
+            assert await camera.async_camera_image() == b"photo2"
+            assert _requests_for(mocked, "https://example.com/photo2.jpg") == 1
+
+        assert camera.diagnostics == {
+            "photos": 4,
+            "failing_photos": 0,
+            "prefetch_lookahead": 2,
+            "prefetched": 3,
+            "hits": 1,
+            "misses": 0,
+            "hit_rate": 1.0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_no_prefetch_when_disabled(self, hass: HomeAssistant):
+        """Test that a lookahead of 0 fetches only on demand and counts a miss."""
+        camera = self._camera(hass, lookahead=0)
+
+        with aioresponses() as mocked:
+            mocked.get("https://example.com/photo1.jpg", status=200, body=b"photo1")
+            await camera.rotate_img()
+            await hass.async_block_till_done()
+            assert not mocked.requests
+
+            assert await camera.async_camera_image() == b"photo1"
+
+        assert camera.diagnostics["misses"] == 1
+        assert camera.diagnostics["hit_rate"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_frames_share_one_download(self, hass: HomeAssistant):
+        """Test that frames requested mid-download wait on the same request."""
+        camera = self._camera(hass)
+
+        with aioresponses() as mocked:
+            mocked.get("https://example.com/photo0.jpg", status=200, body=b"photo0")
+            images = await asyncio.gather(
+                camera.async_camera_image(), camera.async_camera_image()
+            )
+
+        assert images == [b"photo0", b"photo0"]
+        assert _requests_for(mocked, "https://example.com/photo0.jpg") == 1
+
+    @pytest.mark.asyncio
+    async def test_config_entry_diagnostics(self, hass: HomeAssistant):
+        """Test that prefetch statistics are exposed through diagnostics."""
+        from custom_components.ha_strava.diagnostics import (
+            async_get_config_entry_diagnostics,
+        )
+
+        camera = self._camera(hass)
+        camera.coordinator.async_add_listener = MagicMock(return_value=MagicMock())
+        await camera.async_added_to_hass()
+
+        diagnostics = await async_get_config_entry_diagnostics(
+            hass, camera.coordinator.entry
+        )
+
+        assert diagnostics["camera"]["photos"] == 4
+        assert diagnostics["camera"]["hit_rate"] is None
+
+
+class TestCameraPlaylistPersistence:
+    """Test that playlist changes are saved lazily."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_photos_are_not_saved(self, hass: HomeAssistant):
+        """Test that coordinator updates without new photos skip the save."""
+        coordinator = MagicMock()
+        coordinator.entry = MagicMock(title="Strava: Test User")
+        camera = UrlCam(coordinator, hass, athlete_id="12345")
+        camera.async_write_ha_state = MagicMock()
+        coordinator.data = {
+            "activities": [{"id": 1, "start_date_local": datetime(2024, 1, 2)}],
+        }
+        image = {
+            "activity_id": 1,
+            "url": "https://example.com/a.jpg",
+            "date": datetime(2024, 1, 2),
+        }
+
+        with patch.object(camera._store, "async_delay_save") as mock_save:
+            await camera._update_urls([image])
+            await camera._update_urls([image])
+
+        mock_save.assert_called_once_with(camera._data_to_save, 30)
+        assert camera._data_to_save() == {
+            md5(b"https://example.com/a.jpg").hexdigest(): image
+        }
+
+
+class TestFrameLatency:
+    """Benchmark fetching camera frames over the shared HTTP session."""
+
+    @pytest.mark.asyncio
+    async def test_frames_reuse_shared_session_connections(
+        self, hass: HomeAssistant, socket_enabled, tmp_path
+    ):
+        """Benchmark camera frames against a session-per-frame baseline.
+
+        Every frame is a different photo, so each one is a download. Through
+        Home Assistant's shared session they must all go over a single
+        keep-alive connection, where a session per frame pays a new TCP
+        connection each time.
+        """
+        hass.config.config_dir = str(tmp_path)
+        shared_connections: set = set()
+        server = await _frame_server(shared_connections)
+        urls = [str(server.make_url(f"/photo{index}.png")) for index in range(FRAMES)]
+        try:
+            coordinator = MagicMock()
+            coordinator.entry = MagicMock(title="Strava: Test User")
+            camera = UrlCam(
+                coordinator,
+                hass,
+                athlete_id="12345",
+                prefetch_lookahead=0,
+                rotate_interval=0,
+            )
+            camera._urls = PhotoPlaylist(
+                {
+                    f"photo{index}": {
+                        "date": datetime(2024, 1, 1, minute=index),
+                        "url": url,
+                        "activity_id": index,
+                    }
+                    for index, url in enumerate(urls)
+                }
+            )
+
+            start = time.perf_counter()
+            for _ in range(FRAMES):
+                image = await camera.async_camera_image()
+                assert image is not None and image != PLACEHOLDER
+            shared_per_frame = (time.perf_counter() - start) / FRAMES
+
+            shared_connection_count = len(shared_connections)
+            shared_connections.clear()
+            start = time.perf_counter()
+            for url in urls:
+                async with aiohttp.ClientSession() as session, session.get(
+                    url
+                ) as response:
+                    await response.read()
+            unshared_per_frame = (time.perf_counter() - start) / FRAMES
+        finally:
+            await server.close()
+
+        assert shared_connection_count == 1, (
+            f"shared: {shared_per_frame * 1000:.2f} ms/frame, "
+            f"session per frame: {unshared_per_frame * 1000:.2f} ms/frame"
+        )
+        assert len(shared_connections) == FRAMES
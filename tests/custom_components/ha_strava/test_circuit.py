@@ -0,0 +1,248 @@
+"""Test the Strava API circuit breaker for ha_strava."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.ha_strava.circuit import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from custom_components.ha_strava.const import DOMAIN
+from custom_components.ha_strava.coordinator import StravaDataUpdateCoordinator
+from custom_components.ha_strava.sensor import StravaApiStatusSensor
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: _Clock) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=3, cooldown_seconds=60, max_cooldown_seconds=200, clock=clock
+    )
+
+
+class TestCircuitBreaker:
+    """Test opening, probing and closing the circuit."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens once failures reach the threshold."""
+        breaker = _breaker(_Clock())
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_CLOSED
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+        assert not breaker.allow()
+        assert breaker.retry_in() == 60
+
+    def test_half_open_lets_one_probe_through(self):
+        """Test that a single probe is sent after the cooldown."""
+        clock = _Clock()
+        breaker = _breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now += 61
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CIRCUIT_CLOSED
+        assert breaker.failures == 0
+
+    def test_failed_probe_doubles_cooldown(self):
+        """Test that a failed probe reopens the circuit for longer."""
+        clock = _Clock()
+        breaker = _breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        for cooldown in (120, 200):
+            clock.now += breaker.retry_in() + 1
+            assert breaker.allow()
+            breaker.record_failure()
+            assert breaker.state == CIRCUIT_OPEN
+            assert breaker.retry_in() == cooldown
+
+    @pytest.mark.asyncio
+    async def test_half_open_when_cooldown_ends(self, hass: HomeAssistant):
+        """Test that listeners hear about the cooldown ending without a request."""
+        breaker = CircuitBreaker(hass, failure_threshold=1, cooldown_seconds=60)
+        listener = MagicMock()
+        breaker.async_add_listener(listener)
+
+        breaker.record_failure()
+        assert listener.call_count == 1
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+        await hass.async_block_till_done()
+
+        assert listener.call_count == 2
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        assert breaker.allow()
+
+    def test_listeners_follow_state_changes(self):
+        """Test that listeners hear about the circuit opening and closing."""
+        clock = _Clock()
+        breaker = _breaker(clock)
+        listener = MagicMock()
+        remove = breaker.async_add_listener(listener)
+
+        breaker.record_success()
+        listener.assert_not_called()
+        for _ in range(3):
+            breaker.record_failure()
+        assert listener.call_count == 1
+
+        clock.now += 61
+        breaker.allow()
+        breaker.record_success()
+        assert listener.call_count == 3
+
+        remove()
+        for _ in range(3):
+            breaker.record_failure()
+        assert listener.call_count == 3
+
+
+def _coordinator(hass: HomeAssistant) -> StravaDataUpdateCoordinator:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="12345",
+        data={CONF_CLIENT_ID: "test_client_id", CONF_CLIENT_SECRET: "secret"},
+        title="Strava: Test User",
+    )
+    entry.add_to_hass(hass)
+    with patch("homeassistant.helpers.frame.report_usage"):
+        coordinator = StravaDataUpdateCoordinator(hass, entry=entry)
+    coordinator.api_circuit = _breaker(_Clock())
+    return coordinator
+
+
+class TestCoordinatorCircuit:
+    """Test that the coordinator stops calling a failing API."""
+
+    @pytest.mark.asyncio
+    async def test_server_errors_open_the_circuit(self, hass: HomeAssistant):
+        """Test that requests fail fast after repeated server errors."""
+        coordinator = _coordinator(hass)
+        response = MagicMock()
+        response.status = 503
+
+        with patch.object(
+            coordinator.oauth_session,
+            "async_request",
+            new=AsyncMock(return_value=response),
+        ) as async_request:
+            for _ in range(3):
+                await coordinator._async_request(method="GET", url="https://x")
+            with pytest.raises(CircuitOpenError):
+                await coordinator._async_request(method="GET", url="https://x")
+
+        assert async_request.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_photo_retries(self, hass: HomeAssistant):
+        """Test that photo fetches don't wait out retries while it's open."""
+        coordinator = _coordinator(hass)
+        for _ in range(3):
+            coordinator.api_circuit.record_failure()
+
+        with patch(
+            "custom_components.ha_strava.coordinator.asyncio.sleep",
+            new_callable=AsyncMock,
+        ) as sleep, pytest.raises(CircuitOpenError):
+            await coordinator._fetch_photo_with_retry(1)
+
+        sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_count_as_failures(self, hass: HomeAssistant):
+        """Test that connection errors count against the circuit."""
+        coordinator = _coordinator(hass)
+
+        with patch.object(
+            coordinator.oauth_session,
+            "async_request",
+            new=AsyncMock(side_effect=aiohttp.ClientConnectionError()),
+        ):
+            with pytest.raises(aiohttp.ClientError):
+                await coordinator._async_request(method="GET", url="https://x")
+
+        assert coordinator.api_circuit.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_lets_another_through(self, hass: HomeAssistant):
+        """Test that a probe cancelled mid-request doesn't block the circuit."""
+        coordinator = _coordinator(hass)
+        for _ in range(3):
+            coordinator.api_circuit.record_failure()
+        coordinator.api_circuit._clock.now += 61
+
+        with patch.object(
+            coordinator.oauth_session,
+            "async_request",
+            new=AsyncMock(side_effect=asyncio.CancelledError()),
+        ):
+            with pytest.raises(asyncio.CancelledError):
+                await coordinator._async_request(method="GET", url="https://x")
+
+        assert coordinator.api_circuit.state == CIRCUIT_HALF_OPEN
+        assert coordinator.api_circuit.allow()
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_fails_probe(self, hass: HomeAssistant):
+        """Test that a probe ending in an unexpected error reopens the circuit."""
+        coordinator = _coordinator(hass)
+        for _ in range(3):
+            coordinator.api_circuit.record_failure()
+        coordinator.api_circuit._clock.now += 61
+
+        with patch.object(
+            coordinator.oauth_session,
+            "async_request",
+            new=AsyncMock(side_effect=ValueError("boom")),
+        ):
+            with pytest.raises(ValueError):
+                await coordinator._async_request(method="GET", url="https://x")
+
+        assert coordinator.api_circuit.state == CIRCUIT_OPEN
+        assert coordinator.api_circuit.retry_in() == 120
+
+    @pytest.mark.asyncio
+    async def test_status_sensor(self, hass: HomeAssistant):
+        """Test that the diagnostic sensor reports the circuit's state."""
+        coordinator = _coordinator(hass)
+        sensor = StravaApiStatusSensor(coordinator, athlete_id="12345")
+
+        assert sensor.available
+        assert sensor.native_value == CIRCUIT_CLOSED
+        for _ in range(3):
+            coordinator.api_circuit.record_failure()
+        assert sensor.native_value == CIRCUIT_OPEN
+        assert sensor.extra_state_attributes == {"consecutive_failures": 3}
@@ -10,9 +10,12 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.ha_strava.config_flow import OptionsFlowHandler
 from custom_components.ha_strava.const import (
     CONF_ACTIVITY_TYPES_TO_TRACK,
+    CONF_ATTRIBUTE_SENSORS_TO_CREATE,
+    CONF_COMPACT_SENSORS,
     CONF_GEAR_ENABLED,
     CONF_NUM_GEAR_SENSORS,
     CONF_NUM_RECENT_ACTIVITIES,
+    CONF_SENSOR_DISTANCE,
     DOMAIN,
 )
 
@@ -567,6 +570,109 @@ async def _run_gear_options_save(hass, config_entry, entities, devices, gear_ena
     return entity_registry, device_registry
 
 
+def _entity(unique_id: str) -> MagicMock:
+    entity = MagicMock()
+    entity.entity_id = f"sensor.{unique_id}"
+    entity.unique_id = unique_id
+    return entity
+
+
+async def _run_attribute_options_save(hass, entities, options):
+    """Helper: save options with gear enabled; return the registry mock and options."""
+    config_entry = _make_config_entry()
+    entity_registry = MagicMock()
+    flow = OptionsFlowHandler()
+    flow.hass = hass
+
+    with patch.object(
+        OptionsFlowHandler,
+        "config_entry",
+        new_callable=PropertyMock,
+        return_value=config_entry,
+    ), patch(
+        "custom_components.ha_strava.config_flow.async_get",
+        return_value=entity_registry,
+    ), patch(
+        "custom_components.ha_strava.config_flow.async_entries_for_config_entry",
+        return_value=entities,
+    ), patch(
+        "custom_components.ha_strava.config_flow.dr.async_get",
+        return_value=MagicMock(),
+    ), patch(
+        "custom_components.ha_strava.config_flow.dr.async_entries_for_config_entry",
+        return_value=[],
+    ), patch.object(
+        flow, "async_create_entry"
+    ) as create_entry:
+        await flow.async_step_init(
+            {**_BASE_USER_INPUT, CONF_GEAR_ENABLED: True, **options}
+        )
+
+    return entity_registry, create_entry.call_args.kwargs["data"]
+
+
+class TestAttributeSensorCleanupInOptionsFlow:
+    """Test attribute sensor cleanup when the selected attribute sensors change."""
+
+    @pytest.mark.asyncio
+    async def test_deselected_attribute_sensors_removed(self, hass: HomeAssistant):
+        """Deselected attribute sensors are removed from every device."""
+        entities = [
+            _entity(unique_id)
+            for unique_id in (
+                "strava_12345_run_distance",
+                "strava_12345_run_kudos",
+                "strava_12345_recent_kudos",
+                "strava_12345_recent_distance",
+                "strava_12345_gear_b111111_distance",
+                "strava_12345_stats_all_run_totals_distance",
+            )
+        ]
+        entity_registry, options = await _run_attribute_options_save(
+            hass,
+            entities,
+            {CONF_ATTRIBUTE_SENSORS_TO_CREATE: [CONF_SENSOR_DISTANCE]},
+        )
+
+        removed = {call[0][0] for call in entity_registry.async_remove.call_args_list}
+        assert removed == {
+            "sensor.strava_12345_run_kudos",
+            "sensor.strava_12345_recent_kudos",
+        }
+        assert options[CONF_ATTRIBUTE_SENSORS_TO_CREATE] == [CONF_SENSOR_DISTANCE]
+
+    @pytest.mark.asyncio
+    async def test_compact_mode_removes_attribute_and_gear_sensors(
+        self, hass: HomeAssistant
+    ):
+        """Compact mode removes every attribute and per-activity gear sensor."""
+        entities = [
+            _entity(unique_id)
+            for unique_id in (
+                "strava_12345_run",
+                "strava_12345_run_distance",
+                "strava_12345_run_gear_name",
+                "strava_12345_recent",
+                "strava_12345_recent_2_date",
+                "strava_12345_recent_gear_name",
+                "strava_12345_gear_b111111_name",
+            )
+        ]
+
+        entity_registry, options = await _run_attribute_options_save(
+            hass, entities, {CONF_COMPACT_SENSORS: True}
+        )
+
+        removed = {call[0][0] for call in entity_registry.async_remove.call_args_list}
+        assert removed == {
+            "sensor.strava_12345_run_distance",
+            "sensor.strava_12345_run_gear_name",
+            "sensor.strava_12345_recent_2_date",
+            "sensor.strava_12345_recent_gear_name",
+        }
+        assert options[CONF_COMPACT_SENSORS] is True
+
+
 class TestGearEntityCleanupInOptionsFlow:
     """Test gear entity/device cleanup in options flow after the unique_id migration."""
 
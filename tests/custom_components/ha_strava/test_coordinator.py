@@ -20,8 +20,8 @@ from custom_components.ha_strava.const import (
     CONF_ATTR_SPORT_TYPE,
     CONF_GEAR_ENABLED,
     CONF_NUM_GEAR_SENSORS,
+    CONF_NUM_RECENT_ACTIVITIES,
     CONF_PHOTO_CACHE_HOURS,
-    CONF_PHOTO_FETCH_DELAY_SECONDS,
     CONF_PHOTO_FETCH_INITIAL_LIMIT,
     CONF_PHOTOS,
     CONF_SENSOR_ACTIVITY_TYPE,
@@ -847,7 +847,8 @@ class TestStravaDataUpdateCoordinator:
         # Verify data structure
         assert "activities" in result
         assert "summary_stats" in result
-        assert "images" in result
+        # Photos are discovered in the background, not during the refresh
+        assert "images" not in result
 
         # Verify activities
         assert len(result["activities"]) == len(mock_strava_activities)
@@ -1062,7 +1063,8 @@ class TestStravaDataUpdateCoordinator:
         assert "activities" in result
         assert len(result["activities"]) == 2  # Both activities should be included
         assert "summary_stats" in result
-        assert "images" in result
+        # Photos are discovered in the background, not during the refresh
+        assert "images" not in result
 
     @pytest.mark.asyncio
     async def test_sensor_activity_calories_and_power_processing(
@@ -1369,7 +1371,7 @@ class TestStravaDataUpdateCoordinator:
     async def test_fetch_images_success(
         self, hass: HomeAssistant, mock_config_entry, aioresponses_mock
     ):
-        """Test successful photo fetching with rate limiting."""
+        """Test successful photo fetching."""
         # Create config entry with photos enabled
         config_entry_with_photos = MockConfigEntry(
             domain=DOMAIN,
@@ -1413,9 +1415,7 @@ class TestStravaDataUpdateCoordinator:
             status=200,
         )
 
-        start_time = datetime.now()
         result = await coordinator._fetch_images(activities)
-        end_time = datetime.now()
 
         assert result is not None
         assert len(result) == 2
@@ -1424,10 +1424,6 @@ class TestStravaDataUpdateCoordinator:
         assert result[0]["activity_id"] == 1
         assert result[1]["activity_id"] == 2
 
-        elapsed = (end_time - start_time).total_seconds()
-        min_expected_delay = CONF_PHOTO_FETCH_DELAY_SECONDS
-        assert elapsed >= min_expected_delay, "Rate limiting delay not applied"
-
     @pytest.mark.asyncio
     async def test_fetch_images_initial_limit(
         self, hass: HomeAssistant, mock_config_entry, aioresponses_mock
@@ -2312,3 +2308,78 @@ class TestAsyncRefreshActivity:
             await coordinator.async_refresh_activity(1)
 
         assert coordinator.data == {"activities": []}
+
+
+class TestApplyOptions:
+    """Test bringing the data in line with changed options."""
+
+    @staticmethod
+    def _coordinator(hass: HomeAssistant, options: dict) -> StravaDataUpdateCoordinator:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id="12345",
+            data={CONF_CLIENT_ID: "test_client_id", CONF_CLIENT_SECRET: "secret"},
+            options=options,
+        )
+        entry.add_to_hass(hass)
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=entry)
+        coordinator.async_set_updated_data(
+            {
+                "activities": [
+                    {CONF_SENSOR_ID: 2, CONF_ATTR_SPORT_TYPE: "Ride"},
+                    {CONF_SENSOR_ID: 1, CONF_ATTR_SPORT_TYPE: "Run"},
+                ],
+                "gear": [{"id": "b1"}, {"id": "g2"}],
+            }
+        )
+        return coordinator
+
+    @pytest.mark.asyncio
+    async def test_narrower_options_trim_data(self, hass: HomeAssistant):
+        """Test that deselected types and gear are dropped without API calls."""
+        coordinator = self._coordinator(
+            hass,
+            {
+                CONF_ACTIVITY_TYPES_TO_TRACK: ["Run", "Ride"],
+                CONF_GEAR_ENABLED: True,
+                CONF_NUM_GEAR_SENSORS: 2,
+            },
+        )
+        hass.config_entries.async_update_entry(
+            coordinator.entry,
+            options={
+                CONF_ACTIVITY_TYPES_TO_TRACK: ["Run"],
+                CONF_GEAR_ENABLED: True,
+                CONF_NUM_GEAR_SENSORS: 1,
+            },
+        )
+
+        with patch.object(coordinator, "async_refresh") as async_refresh:
+            await coordinator.async_apply_options()
+
+        async_refresh.assert_not_called()
+        assert coordinator.data["activities"] == [
+            {CONF_SENSOR_ID: 1, CONF_ATTR_SPORT_TYPE: "Run"}
+        ]
+        assert coordinator.data["gear"] == [{"id": "b1"}]
+        assert coordinator.applied_options[CONF_ACTIVITY_TYPES_TO_TRACK] == ["Run"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {CONF_ACTIVITY_TYPES_TO_TRACK: ["Run", "Swim"]},
+            {CONF_ACTIVITY_TYPES_TO_TRACK: ["Run"], CONF_NUM_RECENT_ACTIVITIES: 3},
+            {CONF_ACTIVITY_TYPES_TO_TRACK: ["Run"], CONF_GEAR_ENABLED: True},
+        ],
+    )
+    async def test_wider_options_refresh(self, hass: HomeAssistant, options):
+        """Test that options asking for data not fetched yet refresh it."""
+        coordinator = self._coordinator(hass, {CONF_ACTIVITY_TYPES_TO_TRACK: ["Run"]})
+        hass.config_entries.async_update_entry(coordinator.entry, options=options)
+
+        with patch.object(coordinator, "async_refresh") as async_refresh:
+            await coordinator.async_apply_options()
+
+        async_refresh.assert_awaited_once()
@@ -0,0 +1,337 @@
+"""Test power/heart rate curves, best efforts and curve sensors for ha_strava."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.ha_strava.const import (
+    CONF_ATTR_SPORT_TYPE,
+    CONF_CURVES,
+    CONF_DISTANCE_UNIT_OVERRIDE,
+    CONF_DISTANCE_UNIT_OVERRIDE_METRIC,
+    CONF_SENSOR_ID,
+    CURVE_BEST_EFFORTS,
+    CURVE_HEARTRATE,
+    CURVE_PACE,
+    CURVE_POWER,
+)
+from custom_components.ha_strava.coordinator import StravaDataUpdateCoordinator
+from custom_components.ha_strava.curves import (
+    ActivityCurves,
+    best_efforts,
+    best_pace,
+    compute_activity_curves,
+    mean_maximal,
+    merge_curves,
+)
+from custom_components.ha_strava.sensor import StravaCurveSensor
+
+
+def _brute_force_mean_max(values, duration):
+    return max(
+        sum(values[i : i + duration]) / duration
+        for i in range(len(values) - duration + 1)
+    )
+
+
+class TestMeanMaximal:
+    """Test the sliding-window mean-maximal computation."""
+
+    def test_matches_brute_force(self):
+        """Test the vectorized windows against a naive scan."""
+        rng = np.random.default_rng(1)
+        values = rng.integers(0, 600, size=400).astype(float)
+
+        curve = mean_maximal(values, (1, 5, 30, 120))
+
+        for duration in (1, 5, 30, 120):
+            assert curve[str(duration)] == pytest.approx(
+                _brute_force_mean_max(list(values), duration), abs=0.05
+            )
+
+    def test_skips_windows_longer_than_activity(self):
+        """Test that windows longer than the series are omitted."""
+        curve = mean_maximal(np.full(90, 200.0), (5, 60, 300))
+
+        assert curve == {"5": 200.0, "60": 200.0}
+
+    def test_six_hour_ride(self):
+        """Test a long 1 Hz ride produces a monotonically non-increasing curve."""
+        rng = np.random.default_rng(2)
+        values = rng.normal(220, 60, size=6 * 3600).clip(0)
+
+        curve = mean_maximal(values)
+
+        points = list(curve.values())
+        assert len(points) == 10
+        assert points == sorted(points, reverse=True)
+
+
+class TestBestEfforts:
+    """Test running pace and best effort computation."""
+
+    def test_constant_pace(self):
+        """Test that a steady 4:00/km run yields exact best efforts."""
+        time = np.arange(0, 2401, dtype=float)  # 40 minutes
+        distance = time * (1000 / 240)  # 4:00/km
+
+        efforts = best_efforts(time, distance)
+        pace = best_pace(time, distance)
+
+        assert efforts["1k"] == pytest.approx(240, abs=0.1)
+        assert efforts["5k"] == pytest.approx(1200, abs=0.1)
+        assert "half_marathon" not in efforts
+        assert pace["300"] == pytest.approx(240, abs=0.1)
+
+    def test_finds_fastest_segment(self):
+        """Test that the fastest segment is found and interpolated between samples."""
+        # 1 km at 5:00/km, then 1 km at 3:20/km, sampled every 2 s
+        time = np.arange(0, 501, 2, dtype=float)
+        distance = np.where(
+            time <= 300, time * (1000 / 300), 1000 + (time - 300) * (1000 / 200)
+        )
+
+        efforts = best_efforts(time, distance)
+
+        assert efforts["1k"] == pytest.approx(200, abs=0.1)
+        assert efforts["400m"] == pytest.approx(80, abs=0.1)
+
+
+class TestComputeActivityCurves:
+    """Test curve computation from cached streams."""
+
+    def test_ride_curves(self):
+        """Test that a ride yields power and heart rate curves but no running curves."""
+        streams = {
+            "time": list(range(600)),
+            "distance": [i * 8.0 for i in range(600)],
+            "watts": [250] * 600,
+            "heartrate": [150] * 600,
+        }
+
+        curves = compute_activity_curves(streams, include_running=False)
+
+        assert curves[CURVE_POWER]["300"] == 250
+        assert curves[CURVE_HEARTRATE]["60"] == 150
+        assert CURVE_PACE not in curves
+        assert CURVE_BEST_EFFORTS not in curves
+
+    def test_recording_gaps_count_as_zero_power(self):
+        """Test that an auto-paused gap doesn't extend the last power reading."""
+        streams = {
+            "time": list(range(60)) + list(range(660, 720)),
+            "watts": [400] * 60 + [100] * 60,
+        }
+
+        curves = compute_activity_curves(streams, include_running=False)
+
+        # Without gap handling 400 W would be carried across the 10 min pause
+        assert curves[CURVE_POWER]["600"] < 100
+
+    def test_run_curves(self):
+        """Test that a run yields pace and best efforts."""
+        streams = {
+            "time": list(range(1300)),
+            "distance": [i * 4.0 for i in range(1300)],
+        }
+
+        curves = compute_activity_curves(streams, include_running=True)
+
+        assert curves[CURVE_PACE]["1200"] == 250
+        assert curves[CURVE_BEST_EFFORTS]["5k"] == 1250
+
+    def test_empty_streams(self):
+        """Test that activities without streams produce no curves."""
+        assert compute_activity_curves({}, include_running=True) == {}
+
+
+class TestMergeCurves:
+    """Test folding activity curves into the all-time curve."""
+
+    def test_keeps_best_values(self):
+        """Test that higher power wins and lower best-effort times win."""
+        all_time = {}
+        merge_curves(
+            all_time, {CURVE_POWER: {"60": 300}, CURVE_BEST_EFFORTS: {"5k": 1300}}, 1
+        )
+        improved = merge_curves(
+            all_time, {CURVE_POWER: {"60": 280}, CURVE_BEST_EFFORTS: {"5k": 1250}}, 2
+        )
+
+        assert improved is True
+        assert all_time[CURVE_POWER]["60"] == {"value": 300, "activity_id": 1}
+        assert all_time[CURVE_BEST_EFFORTS]["5k"] == {"value": 1250, "activity_id": 2}
+
+    def test_no_improvement(self):
+        """Test that merging a worse activity reports no improvement."""
+        all_time = {}
+        merge_curves(all_time, {CURVE_POWER: {"60": 300}}, 1)
+
+        assert merge_curves(all_time, {CURVE_POWER: {"60": 250}}, 2) is False
+
+
+class TestActivityCurves:
+    """Test the persistent per-activity curve cache."""
+
+    @pytest.mark.asyncio
+    async def test_add_persist_and_reload(self, hass: HomeAssistant):
+        """Test that cached curves survive a reload."""
+        curves = ActivityCurves(hass, "12345")
+        await curves.async_load()
+        curves.add(1, {CURVE_POWER: {"60": 300}})
+        # Flush the delayed save
+        await curves._store.async_save(curves._data_to_save())
+
+        reloaded = ActivityCurves(hass, "12345")
+        await reloaded.async_load()
+
+        assert 1 in reloaded
+        assert reloaded.all_time[CURVE_POWER]["60"]["value"] == 300
+
+    @pytest.mark.asyncio
+    async def test_remove_rebuilds_all_time(self, hass: HomeAssistant):
+        """Test that removing the record-holding activity falls back to the next best."""
+        curves = ActivityCurves(hass, "12345")
+        curves.add(1, {CURVE_POWER: {"60": 300}})
+        curves.add(2, {CURVE_POWER: {"60": 250}})
+
+        curves.remove(1)
+
+        assert 1 not in curves
+        assert curves.all_time[CURVE_POWER]["60"] == {"value": 250, "activity_id": 2}
+
+
+class TestCoordinatorCurves:
+    """Test the coordinator's background curve backfill."""
+
+    @pytest.mark.asyncio
+    async def test_only_new_activities_are_computed(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """Test that each activity's streams are fetched once across runs."""
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=mock_config_entry)
+        coordinator.async_get_activity_streams = AsyncMock(
+            return_value={"time": list(range(120)), "watts": [200] * 120}
+        )
+        ride = {CONF_SENSOR_ID: 1, CONF_ATTR_SPORT_TYPE: "Ride"}
+        coordinator.data = {"activities": [ride]}
+
+        await coordinator._async_backfill_curves([ride])
+        assert coordinator.data["curves"][CURVE_POWER]["60"]["value"] == 200
+        await coordinator._async_backfill_curves(
+            [ride, {CONF_SENSOR_ID: 2, CONF_ATTR_SPORT_TYPE: "Ride"}]
+        )
+
+        assert coordinator.data["curves"][CURVE_POWER]["60"]["activity_id"] == 1
+        assert coordinator.async_get_activity_streams.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_retried_next_run(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """Test that activities whose streams failed to load aren't cached."""
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=mock_config_entry)
+        coordinator.async_get_activity_streams = AsyncMock(
+            side_effect=UpdateFailed("boom")
+        )
+
+        await coordinator._async_backfill_curves([{CONF_SENSOR_ID: 1}])
+        assert 1 not in coordinator.curves
+
+    @pytest.mark.asyncio
+    async def test_stops_when_out_of_budget(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """Test that the backfill leaves the API budget's reserve alone."""
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=mock_config_entry)
+        coordinator.async_get_activity_streams = AsyncMock(return_value={})
+        coordinator.rate_limit.update(
+            {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "190,500"}
+        )
+
+        await coordinator._async_backfill_curves([{CONF_SENSOR_ID: 1}])
+
+        coordinator.async_get_activity_streams.assert_not_awaited()
+        assert 1 not in coordinator.curves
+
+    @pytest.mark.asyncio
+    async def test_backfill_off_by_default(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """Test that curves are only computed once enabled in the options."""
+        mock_config_entry.add_to_hass(hass)
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=mock_config_entry)
+
+        with patch.object(
+            coordinator, "_async_backfill_curves", new_callable=AsyncMock
+        ) as backfill:
+            coordinator._backfill_curves([{CONF_SENSOR_ID: 1}])
+            hass.config_entries.async_update_entry(
+                mock_config_entry, options={CONF_CURVES: True}
+            )
+            coordinator._backfill_curves([{CONF_SENSOR_ID: 1}])
+            await hass.async_block_till_done()
+
+        backfill.assert_awaited_once()
+
+
+class TestStravaCurveSensor:
+    """Test StravaCurveSensor."""
+
+    def _sensor(self, curve_type, curves, metric=True):
+        coordinator = MagicMock()
+        coordinator.data = {"curves": curves}
+        coordinator.entry.title = "Strava: Test User"
+        coordinator.entry.options = (
+            {CONF_DISTANCE_UNIT_OVERRIDE: CONF_DISTANCE_UNIT_OVERRIDE_METRIC}
+            if metric
+            else {CONF_DISTANCE_UNIT_OVERRIDE: "imperial"}
+        )
+        coordinator.entry.data = {}
+        return StravaCurveSensor(coordinator, curve_type=curve_type, athlete_id="1")
+
+    def test_power_curve(self):
+        """Test the power curve headline and attributes."""
+        sensor = self._sensor(
+            CURVE_POWER,
+            {
+                CURVE_POWER: {
+                    "5": {"value": 900.0, "activity_id": 11},
+                    "1200": {"value": 280.0, "activity_id": 12},
+                }
+            },
+        )
+
+        assert sensor.available
+        assert sensor.native_value == 280.0
+        assert sensor.native_unit_of_measurement == "W"
+        assert sensor.unique_id == "strava_1_curve_power"
+        assert sensor.extra_state_attributes == {
+            "5s": 900.0,
+            "5s_activity_id": "11",
+            "20min": 280.0,
+            "20min_activity_id": "12",
+        }
+
+    def test_pace_converted_to_minutes(self):
+        """Test that pace is reported in decimal minutes per km or mile."""
+        curves = {CURVE_PACE: {"1200": {"value": 240.0, "activity_id": 1}}}
+
+        assert self._sensor(CURVE_PACE, curves).native_value == 4.0
+        imperial = self._sensor(CURVE_PACE, curves, metric=False)
+        assert imperial.native_value == pytest.approx(6.437, abs=0.001)
+        assert imperial.native_unit_of_measurement == "min/mi"
+
+    def test_unavailable_without_headline(self):
+        """Test that the sensor is unavailable until the headline point exists."""
+        sensor = self._sensor(CURVE_BEST_EFFORTS, {})
+
+        assert not sensor.available
+        assert sensor.native_value is None
@@ -0,0 +1,98 @@
+"""Memory benchmark for large numbers of ha_strava sensor entities."""
+
+import gc
+import tracemalloc
+from unittest.mock import MagicMock
+
+from custom_components.ha_strava.const import (
+    CONF_ATTRIBUTE_SENSOR_TYPES,
+    CONF_SENSOR_DATE,
+    CONF_SENSOR_DEVICE_INFO,
+    SUPPORTED_ACTIVITY_TYPES,
+)
+from custom_components.ha_strava.sensor import (
+    StravaActivityMetricSensor,
+    StravaRecentActivityMetricSensor,
+)
+
+NUM_ENTITIES = 1000
+METRIC_TYPES = [
+    metric_type
+    for metric_type in CONF_ATTRIBUTE_SENSOR_TYPES
+    if metric_type not in (CONF_SENSOR_DEVICE_INFO, CONF_SENSOR_DATE)
+]
+
+
+def _build(coordinator) -> list:
+    """Build 1,000 metric sensors over 20 activity types and 10 recent slots."""
+    sensors = []
+    for index in range(NUM_ENTITIES):
+        metric_type = METRIC_TYPES[index % len(METRIC_TYPES)]
+        if index % 2:
+            sensors.append(
+                StravaActivityMetricSensor(
+                    coordinator,
+                    activity_type=SUPPORTED_ACTIVITY_TYPES[index // 2 % 20],
+                    metric_type=metric_type,
+                    athlete_id="12345",
+                )
+            )
+        else:
+            sensors.append(
+                StravaRecentActivityMetricSensor(
+                    coordinator,
+                    metric_type=metric_type,
+                    athlete_id="12345",
+                    activity_index=index // 2 % 10,
+                )
+            )
+    return sensors
+
+
+class TestEntityMemory:
+    """Benchmark the per-entity footprint of attribute sensors."""
+
+    def test_thousand_entities(self):
+        """Test that 1,000 sensors share descriptions and device info."""
+        coordinator = MagicMock()
+        coordinator.device_infos = {}
+        coordinator.entry.title = "Strava: Test User"
+        _build(coordinator)  # warm up imports and shared tables
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            sensors = _build(coordinator)
+            device_infos = [sensor.device_info for sensor in sensors]
+            gc.collect()
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # One device info object per device and one description per metric
+        assert len({id(device_info) for device_info in device_infos}) == 20 + 10
+        assert len({id(sensor.entity_description) for sensor in sensors}) == len(
+            METRIC_TYPES
+        )
+        # Around 1.1 kB per entity when each built its own device info
+        per_entity = retained / NUM_ENTITIES
+        assert per_entity < 600, f"{per_entity:.0f} bytes retained per entity"
+
+    def test_device_info_not_shared_across_coordinators(self):
+        """Test that a reloaded entry builds its device info afresh."""
+        coordinators = []
+        sensors = []
+        for _ in range(2):
+            coordinator = MagicMock()
+            coordinator.device_infos = {}
+            coordinator.entry.title = "Strava: Test User"
+            coordinators.append(coordinator)
+            sensors.append(_build(coordinator)[0])
+
+        assert sensors[0].device_info == sensors[1].device_info
+        assert sensors[0].device_info is not sensors[1].device_info
+        for coordinator, sensor in zip(coordinators, sensors):
+            assert any(
+                device_info is sensor.device_info
+                for device_info in coordinator.device_infos.values()
+            )
@@ -0,0 +1,156 @@
+"""Test applying options changes to live entities for ha_strava."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    MockEntityPlatform,
+)
+
+from custom_components.ha_strava.const import (
+    CONF_ACTIVITY_TYPES_TO_TRACK,
+    CONF_NUM_RECENT_ACTIVITIES,
+    DOMAIN,
+)
+from custom_components.ha_strava.entity_sync import (
+    DATA_ENTITY_SYNC,
+    async_sync_entities,
+)
+from custom_components.ha_strava.sensor import async_setup_entry
+
+
+async def _setup(hass: HomeAssistant, options: dict):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="12345",
+        data={CONF_CLIENT_ID: "test_client_id", CONF_CLIENT_SECRET: "secret"},
+        options=options,
+        title="Strava: Test User",
+    )
+    entry.add_to_hass(hass)
+    coordinator = MagicMock()
+    coordinator.device_infos = {}
+    coordinator.entry = entry
+    coordinator.data = {"activities": []}
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    platform = MockEntityPlatform(hass, domain="sensor", platform_name=DOMAIN)
+    platform.config_entry = entry
+
+    def add_entities(entities):
+        hass.async_create_task(platform.async_add_entities(entities))
+
+    await async_setup_entry(hass, entry, add_entities)
+    await hass.async_block_till_done()
+    return entry, platform
+
+
+class TestEntitySync:
+    """Test keeping sensors in step with the options."""
+
+    @pytest.mark.asyncio
+    async def test_options_change_adds_and_disables(self, hass: HomeAssistant):
+        """Test that only new entities are added and dropped ones disabled."""
+        entry, platform = await _setup(
+            hass,
+            {CONF_ACTIVITY_TYPES_TO_TRACK: ["Run"], CONF_NUM_RECENT_ACTIVITIES: 1},
+        )
+        before = dict(platform.entities)
+        run_sensors = [
+            entity_id
+            for entity_id, entity in before.items()
+            if entity.unique_id.startswith("strava_12345_run")
+        ]
+        assert run_sensors
+
+        hass.config_entries.async_update_entry(
+            entry,
+            options={CONF_ACTIVITY_TYPES_TO_TRACK: [], CONF_NUM_RECENT_ACTIVITIES: 2},
+        )
+        await async_sync_entities(hass, entry)
+        await hass.async_block_till_done()
+
+        registry = er.async_get(hass)
+        unique_ids = {entity.unique_id for entity in platform.entities.values()}
+        assert "strava_12345_recent_2_recent" in unique_ids
+        assert "strava_12345_recent_2_distance" in unique_ids
+        for entity_id in run_sensors:
+            assert entity_id not in platform.entities
+            assert hass.states.get(entity_id) is None
+            assert (
+                registry.async_get(entity_id).disabled_by
+                is er.RegistryEntryDisabler.INTEGRATION
+            )
+        # Entities still configured are kept as they are
+        for entity_id, entity in before.items():
+            if entity_id not in run_sensors:
+                assert platform.entities[entity_id] is entity
+
+    @pytest.mark.asyncio
+    async def test_disabled_entities_enabled_when_configured_again(
+        self, hass: HomeAssistant
+    ):
+        """Test that entities come back with their customisations kept."""
+        options = {CONF_ACTIVITY_TYPES_TO_TRACK: ["Run"], CONF_NUM_RECENT_ACTIVITIES: 1}
+        entry, platform = await _setup(hass, options)
+        registry = er.async_get(hass)
+        entity_id = next(
+            entity_id
+            for entity_id, entity in platform.entities.items()
+            if entity.unique_id == "strava_12345_run"
+        )
+        registry.async_update_entity(entity_id, name="My runs")
+
+        hass.config_entries.async_update_entry(
+            entry, options={**options, CONF_ACTIVITY_TYPES_TO_TRACK: []}
+        )
+        await async_sync_entities(hass, entry)
+        await hass.async_block_till_done()
+        assert entity_id not in platform.entities
+
+        hass.config_entries.async_update_entry(entry, options=options)
+        await async_sync_entities(hass, entry)
+        await hass.async_block_till_done()
+
+        registry_entry = registry.async_get(entity_id)
+        assert registry_entry.disabled_by is None
+        assert registry_entry.name == "My runs"
+        assert entity_id in platform.entities
+        assert hass.states.get(entity_id) is not None
+
+    @pytest.mark.asyncio
+    async def test_user_disabled_entities_stay_disabled(self, hass: HomeAssistant):
+        """Test that entities the user disabled are not enabled again."""
+        options = {CONF_ACTIVITY_TYPES_TO_TRACK: ["Run"], CONF_NUM_RECENT_ACTIVITIES: 1}
+        entry, platform = await _setup(hass, options)
+        registry = er.async_get(hass)
+        entity_id = next(
+            entity_id
+            for entity_id, entity in platform.entities.items()
+            if entity.unique_id == "strava_12345_run"
+        )
+        registry.async_update_entity(
+            entity_id, disabled_by=er.RegistryEntryDisabler.USER
+        )
+        await hass.async_block_till_done()
+
+        await async_sync_entities(hass, entry)
+        await hass.async_block_till_done()
+
+        assert (
+            registry.async_get(entity_id).disabled_by is er.RegistryEntryDisabler.USER
+        )
+        assert entity_id not in platform.entities
+
+    @pytest.mark.asyncio
+    async def test_forgotten_on_unload(self, hass: HomeAssistant):
+        """Test that the entry's syncs are dropped when it unloads."""
+        entry, _ = await _setup(hass, {CONF_ACTIVITY_TYPES_TO_TRACK: ["Run"]})
+        assert len(hass.data[DATA_ENTITY_SYNC][entry.entry_id]) == 1
+
+        await entry._async_process_on_unload(hass)
+
+        assert entry.entry_id not in hass.data[DATA_ENTITY_SYNC]
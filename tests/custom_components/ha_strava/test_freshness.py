@@ -0,0 +1,225 @@
+"""Test per-source freshness of slowly changing data for ha_strava."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.ha_strava.const import CONF_SOURCE_RETRY_SECONDS, DOMAIN
+from custom_components.ha_strava.coordinator import StravaDataUpdateCoordinator
+from custom_components.ha_strava.freshness import (
+    FRESH,
+    MISSING,
+    SOURCE_ACTIVITIES,
+    SOURCE_GEAR,
+    SOURCE_SUMMARY_STATS,
+    SOURCE_WEEKLY_TOTALS,
+    STALE,
+    SourceFreshness,
+)
+
+TTLS = {
+    SOURCE_SUMMARY_STATS: timedelta(hours=1),
+    SOURCE_WEEKLY_TOTALS: timedelta(hours=1),
+    SOURCE_GEAR: timedelta(hours=24),
+}
+
+
+def _later(**kwargs):
+    return patch(
+        "custom_components.ha_strava.freshness.dt_util.utcnow",
+        return_value=dt_util.utcnow() + timedelta(**kwargs),
+    )
+
+
+class TestSourceFreshness:
+    """Test the state of each source."""
+
+    def test_states(self):
+        """Test that a value goes from missing to fresh to stale."""
+        sources = SourceFreshness(TTLS)
+        assert sources.state(SOURCE_SUMMARY_STATS) == MISSING
+
+        sources.set(SOURCE_SUMMARY_STATS, {"all_run_totals": {}})
+        assert sources.state(SOURCE_SUMMARY_STATS) == FRESH
+        with _later(hours=1, minutes=1):
+            assert sources.state(SOURCE_SUMMARY_STATS) == STALE
+            assert sources.state(SOURCE_GEAR) == MISSING
+
+    def test_invalidate(self):
+        """Test that an invalidated source is missing until it is set again."""
+        sources = SourceFreshness(TTLS)
+        sources.set(SOURCE_WEEKLY_TOTALS, {})
+
+        sources.invalidate(SOURCE_WEEKLY_TOTALS, "unknown")
+        assert sources.state(SOURCE_WEEKLY_TOTALS) == MISSING
+        assert sources.get(SOURCE_WEEKLY_TOTALS) == {}
+
+        sources.set(SOURCE_WEEKLY_TOTALS, {})
+        assert sources.state(SOURCE_WEEKLY_TOTALS) == FRESH
+
+    def test_ages(self):
+        """Test that the age of each source is exposed."""
+        sources = SourceFreshness(TTLS)
+        sources.set(SOURCE_GEAR, [], dt_util.utcnow() - timedelta(minutes=5))
+
+        assert sources.ages() == {
+            SOURCE_SUMMARY_STATS: None,
+            SOURCE_WEEKLY_TOTALS: None,
+            SOURCE_GEAR: 300,
+        }
+        assert sources.diagnostics[SOURCE_GEAR]["state"] == FRESH
+        assert sources.diagnostics[SOURCE_GEAR]["ttl_seconds"] == 86400
+
+
+def _coordinator(hass: HomeAssistant) -> StravaDataUpdateCoordinator:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="12345",
+        data={CONF_CLIENT_ID: "test_client_id", CONF_CLIENT_SECRET: "secret"},
+    )
+    entry.add_to_hass(hass)
+    with patch("homeassistant.helpers.frame.report_usage"):
+        coordinator = StravaDataUpdateCoordinator(hass, entry=entry)
+    coordinator.sources = SourceFreshness(TTLS)
+    return coordinator
+
+
+class TestCoordinatorSources:
+    """Test that the coordinator only fetches sources that changed."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_source_is_not_fetched(self, hass: HomeAssistant):
+        """Test that a fresh source is served without a fetch."""
+        coordinator = _coordinator(hass)
+        fetch = AsyncMock(return_value={"count": 1})
+
+        assert await coordinator._refresh_source(SOURCE_SUMMARY_STATS, fetch) == {
+            "count": 1
+        }
+        assert await coordinator._refresh_source(SOURCE_SUMMARY_STATS, fetch) == {
+            "count": 1
+        }
+        fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_source_is_revalidated(self, hass: HomeAssistant):
+        """Test that a stale value is served while it is fetched again."""
+        coordinator = _coordinator(hass)
+        coordinator.data = {"summary_stats": {}}
+        coordinator.sources.set(SOURCE_SUMMARY_STATS, {"count": 1})
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return {"count": 2}
+
+        with _later(hours=2):
+            value = await coordinator._refresh_source(SOURCE_SUMMARY_STATS, fetch)
+            assert value == {"count": 1}
+            # The stale value is served while the fetch is pending
+            assert coordinator.sources.get(SOURCE_SUMMARY_STATS) == {"count": 1}
+
+            release.set()
+            await hass.async_block_till_done()
+
+        assert coordinator.sources.get(SOURCE_SUMMARY_STATS) == {"count": 2}
+        assert coordinator.data["summary_stats"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_webhook_events_invalidate_stats(self, hass: HomeAssistant):
+        """Test that only events changing the stats invalidate them."""
+        coordinator = _coordinator(hass)
+        coordinator.sources.set(SOURCE_SUMMARY_STATS, {})
+        coordinator.sources.set(SOURCE_WEEKLY_TOTALS, {})
+
+        coordinator.invalidate_for_event(
+            {
+                "object_type": "activity",
+                "aspect_type": "update",
+                "updates": {"title": "x"},
+            }
+        )
+        assert coordinator.sources.state(SOURCE_SUMMARY_STATS) == FRESH
+
+        coordinator.invalidate_for_event(
+            {"object_type": "activity", "aspect_type": "create", "updates": {}}
+        )
+        assert coordinator.sources.state(SOURCE_SUMMARY_STATS) == MISSING
+        assert coordinator.sources.state(SOURCE_WEEKLY_TOTALS) == MISSING
+
+
+class TestPartialFailures:
+    """Test that a failing source keeps its last good value."""
+
+    @pytest.mark.asyncio
+    async def test_failed_source_keeps_last_good(self, hass: HomeAssistant):
+        """Test that a failed fetch serves the last value and is retried alone."""
+        coordinator = _coordinator(hass)
+        coordinator.oauth_session = MagicMock()
+        coordinator.oauth_session.async_ensure_token_valid = AsyncMock()
+        coordinator.data = {"summary_stats": {}}
+        coordinator.sources.set(SOURCE_SUMMARY_STATS, {"count": 1})
+        coordinator.sources.set(SOURCE_WEEKLY_TOTALS, {"weekly_run_totals": {}})
+        coordinator.sources.invalidate(SOURCE_SUMMARY_STATS)
+
+        failing = AsyncMock(side_effect=aiohttp.ClientError("Server error"))
+        value = await coordinator._refresh_source(SOURCE_SUMMARY_STATS, failing)
+        assert value == {"count": 1}
+        assert coordinator.sources.failed_sources == {SOURCE_SUMMARY_STATS}
+        assert coordinator._unsub_retry is not None
+
+        failing.side_effect = None
+        failing.return_value = {"count": 2}
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=CONF_SOURCE_RETRY_SECONDS + 1)
+        )
+        await hass.async_block_till_done()
+
+        assert coordinator.sources.failed_sources == set()
+        assert coordinator.data["summary_stats"]["count"] == 2
+        await coordinator.async_shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_source_without_value_raises(self, hass: HomeAssistant):
+        """Test that a source never fetched fails the update."""
+        coordinator = _coordinator(hass)
+        failing = AsyncMock(side_effect=UpdateFailed("Server error"))
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._refresh_source(SOURCE_WEEKLY_TOTALS, failing)
+
+    @pytest.mark.asyncio
+    async def test_failed_activities_keep_last_data(self, hass: HomeAssistant):
+        """Test that failing to fetch activities keeps the activities held."""
+        coordinator = _coordinator(hass)
+        coordinator.oauth_session = MagicMock()
+        coordinator.oauth_session.async_ensure_token_valid = AsyncMock()
+        activities = [{"id": 1, "title": "Morning Run"}]
+        coordinator.data = {"activities": activities, "summary_stats": {}}
+        coordinator.sources.set(SOURCE_SUMMARY_STATS, {"count": 1})
+        coordinator.sources.set(SOURCE_WEEKLY_TOTALS, {})
+        coordinator._weekly_totals_window = coordinator._weekly_activity_window()
+
+        with patch.object(
+            coordinator,
+            "_fetch_activity_list",
+            new_callable=AsyncMock,
+            side_effect=UpdateFailed("Server error"),
+        ):
+            data = await coordinator._async_update_data()
+
+        assert data["activities"] == activities
+        assert data["summary_stats"] == {"count": 1}
+        assert coordinator.sources.failed(SOURCE_ACTIVITIES)
+        await coordinator.async_shutdown()
@@ -1,16 +1,28 @@
 """Test gear sensors for ha_strava."""
 
-from unittest.mock import MagicMock
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.ha_strava.const import (
+    CONF_ACTIVITY_TYPES_TO_TRACK,
     CONF_DISTANCE_UNIT_OVERRIDE,
     CONF_DISTANCE_UNIT_OVERRIDE_METRIC,
+    CONF_GEAR_DETAILS_CACHE_HOURS,
+    CONF_GEAR_ENABLED,
     DOMAIN,
     get_gear_type_label,
 )
+from custom_components.ha_strava.coordinator import StravaDataUpdateCoordinator
+from custom_components.ha_strava.gear import STORAGE_KEY, GearMileage
 from custom_components.ha_strava.sensor import (
     StravaGearDistanceSensor,
     StravaGearNameSensor,
+    async_setup_entry,
 )
 
 
@@ -226,6 +238,208 @@ class TestStravaGearDistanceSensor:
         )
 
 
+class TestGearDiscovery:
+    """Test adding sensors for gear first seen after setup."""
+
+    @pytest.mark.asyncio
+    async def test_new_gear_added_on_update(self, hass: HomeAssistant):
+        """Test that an update with a new bike adds only its sensors."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id="12345",
+            data={CONF_CLIENT_ID: "test_client_id", CONF_CLIENT_SECRET: "secret"},
+            options={CONF_ACTIVITY_TYPES_TO_TRACK: [], CONF_GEAR_ENABLED: True},
+            title="Strava: Test User",
+        )
+        entry.add_to_hass(hass)
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=entry)
+        coordinator.async_set_updated_data({"activities": [], "gear": [GEAR_BIKE]})
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+        added = []
+
+        await async_setup_entry(hass, entry, added.append)
+        coordinator.async_set_updated_data(
+            {"activities": [], "gear": [GEAR_BIKE, GEAR_SHOES]}
+        )
+        coordinator.async_set_updated_data(
+            {"activities": [], "gear": [GEAR_BIKE, GEAR_SHOES]}
+        )
+
+        assert len(added) == 2
+        assert {sensor.unique_id for sensor in added[1]} == {
+            "strava_12345_gear_g222222_name",
+            "strava_12345_gear_g222222_distance",
+        }
+        await entry._async_process_on_unload(hass)
+
+
+def _activity(activity_id, gear_id, distance, start_date):
+    return {
+        "id": activity_id,
+        "gear_id": gear_id,
+        "distance": distance,
+        "start_date": start_date,
+    }
+
+
+ACTIVITIES = [
+    _activity(3, "b111111", 40000.0, "2024-01-03T08:00:00Z"),
+    _activity(2, "g222222", 10000.0, "2024-01-02T08:00:00Z"),
+    _activity(1, "b111111", 30000.0, "2024-01-01T08:00:00Z"),
+]
+
+
+def _distances(mileage: GearMileage) -> dict:
+    return {item["id"]: item["distance"] for item in mileage.gear}
+
+
+class TestGearMileage:
+    """Test keeping gear distances current from the activity list."""
+
+    def _fetched(self, hass: HomeAssistant) -> GearMileage:
+        mileage = GearMileage(hass, "12345")
+        mileage.set_fetched([GEAR_BIKE, GEAR_SHOES], ACTIVITIES, 3)
+        return mileage
+
+    @pytest.mark.asyncio
+    async def test_new_activity_adds_distance(self, hass: HomeAssistant):
+        """Test that a new activity adds its distance to its gear."""
+        mileage = self._fetched(hass)
+
+        mileage.update(
+            [_activity(4, "g222222", 5000.0, "2024-01-04T08:00:00Z"), *ACTIVITIES]
+        )
+
+        assert _distances(mileage) == {"b111111": 8000000.0, "g222222": 3005000.0}
+        assert not mileage.needs_fetch(ACTIVITIES, 3)
+
+    @pytest.mark.asyncio
+    async def test_edited_activity_moves_distance(self, hass: HomeAssistant):
+        """Test that changing an activity's gear moves its distance across."""
+        mileage = self._fetched(hass)
+
+        mileage.update(
+            [_activity(3, "g222222", 40000.0, "2024-01-03T08:00:00Z"), *ACTIVITIES[1:]]
+        )
+
+        assert _distances(mileage) == {"b111111": 7960000.0, "g222222": 3040000.0}
+
+    @pytest.mark.asyncio
+    async def test_deleted_activity_subtracts_distance(self, hass: HomeAssistant):
+        """Test that a deleted activity takes its distance off its gear."""
+        mileage = self._fetched(hass)
+
+        mileage.update([ACTIVITIES[0], ACTIVITIES[2]])
+
+        assert _distances(mileage) == {"b111111": 8000000.0, "g222222": 2990000.0}
+
+    @pytest.mark.asyncio
+    async def test_activity_leaving_the_list_is_kept(self, hass: HomeAssistant):
+        """Test that the oldest activity dropping off the list isn't a deletion."""
+        mileage = self._fetched(hass)
+
+        mileage.update(
+            [_activity(4, "b111111", 5000.0, "2024-01-04T08:00:00Z"), *ACTIVITIES[:2]]
+        )
+
+        assert _distances(mileage) == {"b111111": 8005000.0, "g222222": 3000000.0}
+
+    @pytest.mark.asyncio
+    async def test_new_gear_needs_fetch(self, hass: HomeAssistant):
+        """Test that an activity with unknown gear asks for the gear details."""
+        mileage = self._fetched(hass)
+
+        assert mileage.needs_fetch(
+            [_activity(4, "b999999", 5000.0, "2024-01-04T08:00:00Z")], 3
+        )
+
+    @pytest.mark.asyncio
+    async def test_limit_change_needs_fetch(self, hass: HomeAssistant):
+        """Test that a different number of gear sensors asks for the details."""
+        mileage = self._fetched(hass)
+
+        assert mileage.needs_fetch(ACTIVITIES, 5)
+
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, hass: HomeAssistant, hass_storage):
+        """Test that the fetched gear and counted activities are restored."""
+        mileage = self._fetched(hass)
+        hass_storage[f"{STORAGE_KEY}_12345"] = {
+            "version": 1,
+            "data": mileage._data_to_save(),
+        }
+
+        restored = GearMileage(hass, "12345")
+        await restored.async_load()
+
+        assert restored.gear == [GEAR_BIKE, GEAR_SHOES]
+        assert not restored.needs_fetch(ACTIVITIES, 3)
+        restored.update(ACTIVITIES[1:])
+        assert _distances(restored)["b111111"] == 8000000.0 - 40000.0
+
+    @pytest.mark.asyncio
+    async def test_coordinator_fetches_gear_once(self, hass: HomeAssistant):
+        """Test that later updates use the activities instead of fetching gear."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id="12345",
+            data={CONF_CLIENT_ID: "test_client_id", CONF_CLIENT_SECRET: "secret"},
+            options={CONF_GEAR_ENABLED: True},
+        )
+        entry.add_to_hass(hass)
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=entry)
+
+        with patch.object(
+            coordinator,
+            "_fetch_gear",
+            new_callable=AsyncMock,
+            return_value=[GEAR_BIKE, GEAR_SHOES],
+        ) as fetch_gear:
+            await coordinator._update_gear("12345", ACTIVITIES[1:])
+            gear = await coordinator._update_gear("12345", ACTIVITIES)
+
+        fetch_gear.assert_awaited_once()
+        assert {item["id"]: item["distance"] for item in gear} == {
+            "b111111": 8040000.0,
+            "g222222": 3000000.0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_coordinator_revalidates_old_details(self, hass: HomeAssistant):
+        """Test that details past their TTL are fetched again in the background."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id="12345",
+            data={CONF_CLIENT_ID: "test_client_id", CONF_CLIENT_SECRET: "secret"},
+            options={CONF_GEAR_ENABLED: True},
+        )
+        entry.add_to_hass(hass)
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coordinator = StravaDataUpdateCoordinator(hass, entry=entry)
+        coordinator.data = {"gear": []}
+
+        with patch.object(
+            coordinator,
+            "_fetch_gear",
+            new_callable=AsyncMock,
+            return_value=[GEAR_BIKE, GEAR_SHOES],
+        ) as fetch_gear:
+            await coordinator._update_gear("12345", ACTIVITIES)
+            with patch(
+                "custom_components.ha_strava.freshness.dt_util.utcnow",
+                return_value=coordinator.gear_mileage.fetched
+                + timedelta(hours=CONF_GEAR_DETAILS_CACHE_HOURS, minutes=1),
+            ):
+                gear = await coordinator._update_gear("12345", ACTIVITIES)
+                await hass.async_block_till_done()
+
+        assert gear == [GEAR_BIKE, GEAR_SHOES]
+        assert fetch_gear.await_count == 2
+        assert coordinator.data["gear"] == [GEAR_BIKE, GEAR_SHOES]
+
+
 class TestGetGearTypeLabel:
     """Test get_gear_type_label helper."""
 
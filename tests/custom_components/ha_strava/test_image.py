@@ -0,0 +1,183 @@
+"""Test the recent activity photo image entities for ha_strava."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ha_strava.const import (
+    CONF_NUM_RECENT_ACTIVITIES,
+    CONF_PHOTOS,
+    CONF_SENSOR_ID,
+    DOMAIN,
+)
+from custom_components.ha_strava.image import (
+    STORAGE_KEY,
+    PrimaryPhotos,
+    StravaRecentActivityImage,
+    async_setup_entry,
+)
+
+
+def _photo(activity_id: int, name: str) -> dict:
+    return {
+        "url": f"https://example.com/{name}.jpg",
+        "activity_id": activity_id,
+        "date": datetime(2024, 1, 1),
+    }
+
+
+def _image(hass: HomeAssistant, coordinator, index: int = 0, primary_photos=None):
+    image = StravaRecentActivityImage(
+        coordinator=coordinator,
+        hass=hass,
+        primary_photos=primary_photos or PrimaryPhotos(hass, "12345"),
+        athlete_id="12345",
+        athlete_name="Test User",
+        activity_index=index,
+    )
+    image.async_write_ha_state = MagicMock()
+    return image
+
+
+@pytest.fixture
+def coordinator(mock_coordinator):
+    """Return a coordinator with two recent activities."""
+    mock_coordinator.data = {
+        "activities": [{CONF_SENSOR_ID: 2}, {CONF_SENSOR_ID: 1}],
+    }
+    return mock_coordinator
+
+
+class TestImageSetup:
+    """Test the image platform setup."""
+
+    @pytest.mark.asyncio
+    async def test_one_entity_per_recent_activity(
+        self, hass: HomeAssistant, mock_config_entry, coordinator
+    ):
+        """Test that an image is created for each recent activity slot."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=mock_config_entry.unique_id,
+            data=mock_config_entry.data,
+            options={CONF_PHOTOS: True, CONF_NUM_RECENT_ACTIVITIES: 2},
+            title=mock_config_entry.title,
+        )
+        entry.add_to_hass(hass)
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+        entities = []
+
+        await async_setup_entry(hass, entry, entities.extend)
+
+        assert [entity.unique_id for entity in entities] == [
+            "strava_12345_recent_1_photo",
+            "strava_12345_recent_2_photo",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_no_entities_without_photos(
+        self, hass: HomeAssistant, mock_config_entry, coordinator
+    ):
+        """Test that nothing is created when photos are disabled."""
+        hass.data.setdefault(DOMAIN, {})[mock_config_entry.entry_id] = coordinator
+        entities = []
+
+        await async_setup_entry(hass, mock_config_entry, entities.extend)
+
+        assert entities == []
+
+
+class TestStravaRecentActivityImage:
+    """Test StravaRecentActivityImage."""
+
+    @pytest.mark.asyncio
+    async def test_primary_photo_shown(self, hass: HomeAssistant, coordinator):
+        """Test that the first photo found for the activity is shown."""
+        image = _image(hass, coordinator)
+        assert image.image_url is None
+        assert image.image_last_updated is None
+
+        image._handle_new_photos([_photo(2, "first"), _photo(2, "second")])
+
+        assert image.image_url == "https://example.com/first.jpg"
+        assert image.image_last_updated is not None
+        image.async_write_ha_state.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_photo_not_bumped(self, hass: HomeAssistant, coordinator):
+        """Test that later photos and refreshes leave the image alone."""
+        image = _image(hass, coordinator)
+        image._handle_new_photos([_photo(2, "first")])
+        updated = image.image_last_updated
+        image._cached_image = MagicMock()
+
+        image._handle_new_photos([_photo(2, "second"), _photo(1, "other")])
+        with patch(
+            "homeassistant.helpers.update_coordinator.CoordinatorEntity"
+            "._handle_coordinator_update"
+        ):
+            image._handle_coordinator_update()
+
+        assert image.image_url == "https://example.com/first.jpg"
+        assert image.image_last_updated == updated
+        assert image._cached_image is not None
+        image.async_write_ha_state.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_follows_new_activity(self, hass: HomeAssistant, coordinator):
+        """Test that a new activity moves photos down a slot."""
+        primary_photos = PrimaryPhotos(hass, "12345")
+        first = _image(hass, coordinator, 0, primary_photos)
+        second = _image(hass, coordinator, 1, primary_photos)
+        first._handle_new_photos([_photo(2, "two"), _photo(1, "one")])
+        second._handle_new_photos([_photo(2, "two"), _photo(1, "one")])
+
+        coordinator.data = {
+            "activities": [{CONF_SENSOR_ID: 3}, {CONF_SENSOR_ID: 2}],
+        }
+        with patch(
+            "homeassistant.helpers.update_coordinator.CoordinatorEntity"
+            "._handle_coordinator_update"
+        ):
+            first._handle_coordinator_update()
+            second._handle_coordinator_update()
+
+        assert first.image_url is None
+        assert first.image_last_updated is None
+        assert second.image_url == "https://example.com/two.jpg"
+
+
+class TestPrimaryPhotos:
+    """Test PrimaryPhotos."""
+
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, hass: HomeAssistant, hass_storage):
+        """Test that photos and their timestamps are restored."""
+        primary_photos = PrimaryPhotos(hass, "12345")
+        primary_photos.add([_photo(1, "one")])
+        await primary_photos._store.async_save(primary_photos._data_to_save())
+        updated = primary_photos.get(1)["updated"]
+
+        restored = PrimaryPhotos(hass, "12345")
+        await restored.async_load()
+
+        assert f"{STORAGE_KEY}_12345" in hass_storage
+        assert restored.get(1) == {
+            "url": "https://example.com/one.jpg",
+            "updated": updated,
+        }
+        assert updated.tzinfo == timezone.utc
+
+    @pytest.mark.asyncio
+    async def test_retain(self, hass: HomeAssistant):
+        """Test that photos of activities no longer shown are dropped."""
+        primary_photos = PrimaryPhotos(hass, "12345")
+        primary_photos.add([_photo(1, "one"), _photo(2, "two")])
+
+        primary_photos.retain({2})
+
+        assert primary_photos.get(1) is None
+        assert primary_photos.get(2) is not None
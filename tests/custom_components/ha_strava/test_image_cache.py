@@ -0,0 +1,199 @@
+"""Test the two-tier camera photo cache for ha_strava."""
+
+import io
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aioresponses import aioresponses
+from homeassistant.core import HomeAssistant
+from PIL import Image
+from yarl import URL
+
+from custom_components.ha_strava.image_cache import (
+    ImageCache,
+    scale_image,
+    scaled_size,
+)
+
+# Mock homeassistant.components.camera to avoid turbojpeg dependency
+if "homeassistant.components.camera" not in sys.modules:
+
+    class MockCamera:
+        """Mock Camera class for testing."""
+
+        def __init__(self, *args, **kwargs):
+            """Initialize mock camera."""
+
+    camera_module = MagicMock()
+    camera_module.Camera = MockCamera
+    sys.modules["homeassistant.components.camera"] = camera_module
+
+from custom_components.ha_strava.camera import UrlCam
+from custom_components.ha_strava.playlist import PhotoPlaylist
+
+
+class TestImageCache:
+    """Test ImageCache."""
+
+    @pytest.mark.asyncio
+    async def test_put_and_get(self, hass: HomeAssistant, tmp_path):
+        """Test that stored bytes are served from memory and written to disk."""
+        cache = ImageCache(hass, str(tmp_path))
+
+        await cache.async_put("abc", b"photo")
+
+        assert await cache.async_get("abc") == b"photo"
+        assert await cache.async_get("missing") is None
+        assert (tmp_path / "abc.img").read_bytes() == b"photo"
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_restart(self, hass: HomeAssistant, tmp_path):
+        """Test that a new cache instance serves photos from disk."""
+        await ImageCache(hass, str(tmp_path)).async_put("abc", b"photo")
+
+        assert await ImageCache(hass, str(tmp_path)).async_get("abc") == b"photo"
+
+    @pytest.mark.asyncio
+    async def test_memory_tier_is_bounded(self, hass: HomeAssistant, tmp_path):
+        """Test that only the most recent frames stay in memory."""
+        cache = ImageCache(hass, str(tmp_path), memory_items=2)
+
+        for key in ("a", "b", "c"):
+            await cache.async_put(key, key.encode())
+
+        assert list(cache._memory) == ["b", "c"]
+        # Evicted from memory but still on disk
+        assert await cache.async_get("a") == b"a"
+
+    @pytest.mark.asyncio
+    async def test_disk_evicts_by_count_and_bytes(self, hass: HomeAssistant, tmp_path):
+        """Test that the disk tier evicts least recently used photos."""
+        cache = ImageCache(hass, str(tmp_path), max_items=2, max_bytes=10)
+
+        await cache.async_put("a", b"1234")
+        await cache.async_put("b", b"1234")
+        await cache.async_put("c", b"1234")
+        assert sorted(os.listdir(tmp_path)) == ["b.img", "c.img"]
+
+        await cache.async_put("d", b"12345678")
+        assert sorted(os.listdir(tmp_path)) == ["d.img"]
+
+    @pytest.mark.asyncio
+    async def test_retain_prunes_both_tiers(self, hass: HomeAssistant, tmp_path):
+        """Test that photos which left the rotation are dropped."""
+        cache = ImageCache(hass, str(tmp_path))
+        await cache.async_put("keep", b"1")
+        await cache.async_put("drop", b"2")
+
+        await cache.async_retain(["keep"])
+
+        assert list(cache._memory) == ["keep"]
+        assert os.listdir(tmp_path) == ["keep.img"]
+
+
+class TestCameraImageCache:
+    """Test that the camera downloads each photo once."""
+
+    @pytest.mark.asyncio
+    async def test_photo_downloaded_once(self, hass: HomeAssistant):
+        """Test that repeated frames and a new camera instance hit the cache."""
+        coordinator = MagicMock()
+        coordinator.entry = MagicMock(title="Strava: Test User")
+        urls = {
+            "abc123": {
+                "date": datetime(2024, 1, 1),
+                "url": "https://example.com/photo1.jpg",
+                "activity_id": 1,
+            }
+        }
+        camera = UrlCam(coordinator, hass, athlete_id="12345")
+        camera._urls = PhotoPlaylist(urls)
+
+        with aioresponses() as mocked:
+            mocked.get(
+                "https://example.com/photo1.jpg", status=200, body=b"photo-bytes"
+            )
+            for _ in range(5):
+                assert await camera.async_camera_image() == b"photo-bytes"
+
+            restarted = UrlCam(coordinator, hass, athlete_id="12345")
+            restarted._urls = PhotoPlaylist(urls)
+            assert await restarted.async_camera_image() == b"photo-bytes"
+
+        calls = mocked.requests[("GET", URL("https://example.com/photo1.jpg"))]
+        assert len(calls) == 1
+
+
+def _jpeg(width, height):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 80, 20)).save(output, format="JPEG")
+    return output.getvalue()
+
+
+class TestScaleImage:
+    """Test frame resizing."""
+
+    def test_scaled_size_rounds_up_and_skips_full_size(self):
+        """Test that requested sizes are bucketed and full-size requests pass."""
+        assert scaled_size(None, None) is None
+        assert scaled_size(600, 800) is None
+        assert scaled_size(100, None) == (128, 512)
+        assert scaled_size(130, 70) == (192, 128)
+
+    def test_scale_keeps_aspect_ratio(self):
+        """Test that photos shrink to fit and are re-encoded as JPEG."""
+        scaled = scale_image(_jpeg(512, 384), (128, 512))
+
+        with Image.open(io.BytesIO(scaled)) as image:
+            assert image.format == "JPEG"
+            assert image.size == (128, 96)
+
+    def test_never_upscales(self):
+        """Test that small photos are returned untouched."""
+        data = _jpeg(100, 80)
+
+        assert scale_image(data, (128, 128)) is data
+
+    def test_undecodable_data_returned_unchanged(self):
+        """Test that bytes PIL can't read are served as is."""
+        assert scale_image(b"not an image", (64, 64)) == b"not an image"
+
+
+class TestCameraScaling:
+    """Test that the camera honours the requested frame size."""
+
+    @pytest.mark.asyncio
+    async def test_thumbnail_requests_get_small_cached_frames(
+        self, hass: HomeAssistant
+    ):
+        """Test that resized frames are smaller and only computed once per size."""
+        coordinator = MagicMock()
+        coordinator.entry = MagicMock(title="Strava: Test User")
+        camera = UrlCam(coordinator, hass, athlete_id="12345")
+        camera._urls = PhotoPlaylist(
+            {
+                "abc123": {
+                    "date": datetime(2024, 1, 1),
+                    "url": "https://example.com/photo1.jpg",
+                    "activity_id": 1,
+                }
+            }
+        )
+        original = _jpeg(512, 384)
+
+        with aioresponses() as mocked, patch(
+            "custom_components.ha_strava.image_cache.scale_image",
+            side_effect=scale_image,
+        ) as mock_scale:
+            mocked.get("https://example.com/photo1.jpg", status=200, body=original)
+            thumbnail = await camera.async_camera_image(width=120)
+            again = await camera.async_camera_image(width=100)
+            full = await camera.async_camera_image()
+
+        assert thumbnail is again
+        assert len(thumbnail) < len(original)
+        assert full == original
+        mock_scale.assert_called_once()
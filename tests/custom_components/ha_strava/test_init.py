@@ -13,9 +13,15 @@ from custom_components.ha_strava import (
     async_setup,
     async_setup_entry,
     async_unload_entry,
+    async_update_options,
     renew_webhook_subscription,
 )
-from custom_components.ha_strava.const import CONF_WEBHOOK_ID, DOMAIN
+from custom_components.ha_strava.const import (
+    CONF_DISTANCE_UNIT_OVERRIDE,
+    CONF_PHOTOS,
+    CONF_WEBHOOK_ID,
+    DOMAIN,
+)
 
 
 class TestStravaWebhookView:
@@ -74,6 +80,30 @@ class TestStravaWebhookView:
 
         assert response.status == 200
 
+    @pytest.mark.asyncio
+    async def test_webhook_view_post_delete_forgets_curves(
+        self, hass, mock_webhook_data, mock_coordinator
+    ):
+        """Test that a deleted activity's curves are forgotten."""
+        view = StravaWebhookView(hass)
+        request = MagicMock()
+        request.json = AsyncMock(
+            return_value={**mock_webhook_data, "aspect_type": "delete"}
+        )
+        request.headers.get.return_value = "example.com"
+        mock_coordinator.invalidate_for_event = MagicMock()
+        mock_coordinator.curves = MagicMock(async_load=AsyncMock())
+        mock_coordinator.spatial_index = MagicMock()
+
+        mock_entry = MockConfigEntry(domain=DOMAIN, unique_id="12345")
+        mock_entry.add_to_hass(hass)
+        hass.data[DOMAIN] = {mock_entry.entry_id: mock_coordinator}
+
+        response = await view.post(request)
+
+        assert response.status == 200
+        mock_coordinator.curves.remove.assert_called_once_with(12345)
+
     @pytest.mark.asyncio
     async def test_webhook_view_post_invalid_json(self, hass: HomeAssistant):
         """Test POST request with invalid JSON."""
@@ -583,6 +613,7 @@ class TestUpdateListenerRegistration:
         # Mock the entry's add_update_listener method
         mock_entry = MagicMock()
         mock_entry.entry_id = mock_config_entry.entry_id
+        mock_entry.options = {}
         mock_entry.add_update_listener = MagicMock()
         mock_entry.async_on_unload = MagicMock()
 
@@ -611,7 +642,7 @@ class TestUpdateListenerRegistration:
 
                             # Verify update listener was registered
                             mock_entry.add_update_listener.assert_called_once_with(
-                                async_reload_entry
+                                async_update_options
                             )
                             mock_entry.async_on_unload.assert_called_once()
 
@@ -619,10 +650,12 @@ class TestUpdateListenerRegistration:
     async def test_update_listener_called_on_options_save(
         self, hass, mock_config_entry, mock_coordinator
     ):
-        """Test that reload is triggered when options are saved."""
+        """Test that reload is triggered when photo options are saved."""
         # Mock the entry's add_update_listener method
         mock_entry = MagicMock()
         mock_entry.entry_id = mock_config_entry.entry_id
+        mock_entry.options = {}
+        mock_coordinator.applied_options = {CONF_PHOTOS: False}
         mock_entry.add_update_listener = MagicMock()
         mock_entry.async_on_unload = MagicMock()
 
@@ -654,24 +687,52 @@ class TestUpdateListenerRegistration:
                             ][0]
 
                             # Call the update listener (simulating options save)
+                            mock_entry.options = {CONF_PHOTOS: True}
                             await update_listener(hass, mock_entry)
 
                             # Verify reload was called
                             mock_reload.assert_called_once_with(mock_entry.entry_id)
 
+    @pytest.mark.asyncio
+    async def test_update_listener_applies_live_options(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that sensor options are applied without a reload."""
+        mock_config_entry.add_to_hass(hass)
+        hass.data[DOMAIN] = {mock_config_entry.entry_id: mock_coordinator}
+        mock_coordinator.applied_options = {CONF_DISTANCE_UNIT_OVERRIDE: "metric"}
+        hass.config_entries.async_update_entry(
+            mock_config_entry,
+            options={CONF_DISTANCE_UNIT_OVERRIDE: "imperial"},
+        )
+
+        with patch.object(
+            hass.config_entries, "async_reload", new_callable=AsyncMock
+        ) as mock_reload, patch(
+            "custom_components.ha_strava.async_sync_entities", new_callable=AsyncMock
+        ) as mock_sync:
+            await async_update_options(hass, mock_config_entry)
+
+        mock_reload.assert_not_called()
+        mock_coordinator.async_apply_options.assert_awaited_once()
+        mock_sync.assert_awaited_once_with(hass, mock_config_entry)
+
     @pytest.mark.asyncio
     async def test_update_listener_with_multiple_entries(self, hass, mock_coordinator):
         """Test update listener works with multiple config entries."""
         # Create multiple mock entries
         entry1 = MagicMock()
         entry1.entry_id = "entry_1"
+        entry1.options = {}
         entry1.add_update_listener = MagicMock()
         entry1.async_on_unload = MagicMock()
 
         entry2 = MagicMock()
         entry2.entry_id = "entry_2"
+        entry2.options = {}
         entry2.add_update_listener = MagicMock()
         entry2.async_on_unload = MagicMock()
+        mock_coordinator.applied_options = {CONF_PHOTOS: False}
 
         # Mock the reload method
         with patch.object(
@@ -700,13 +761,15 @@ class TestUpdateListenerRegistration:
 
                             # Verify both entries have update listeners registered
                             entry1.add_update_listener.assert_called_once_with(
-                                async_reload_entry
+                                async_update_options
                             )
                             entry2.add_update_listener.assert_called_once_with(
-                                async_reload_entry
+                                async_update_options
                             )
 
-                            # Test reloading entry1
+                            # Test reloading entry1 after enabling photos
+                            entry1.options = {CONF_PHOTOS: True}
+                            entry2.options = {CONF_PHOTOS: True}
                             update_listener1 = entry1.add_update_listener.call_args[0][
                                 0
                             ]
@@ -728,6 +791,7 @@ class TestUpdateListenerRegistration:
         # Mock the entry
         mock_entry = MagicMock()
         mock_entry.entry_id = mock_config_entry.entry_id
+        mock_entry.options = {}
         mock_entry.add_update_listener = MagicMock()
         mock_entry.async_on_unload = MagicMock()
 
@@ -0,0 +1,328 @@
+"""Test the activity photo library and media source for ha_strava."""
+
+import hashlib
+import io
+import os
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from aioresponses import aioresponses
+from homeassistant.components.media_source import MediaSourceItem, Unresolvable
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from PIL import Image
+from yarl import URL
+
+from custom_components.ha_strava.const import (
+    CONF_MEDIA_THUMBNAIL_SIZE,
+    DOMAIN,
+    IMAGE_CACHE_DIR,
+    PHOTO_URLS_STORAGE_KEY,
+)
+from custom_components.ha_strava.library import (
+    DATA_LIBRARIES,
+    STORAGE_KEY,
+    PhotoLibrary,
+    async_remove_library,
+    async_setup_library,
+)
+from custom_components.ha_strava.media_source import async_get_media_source
+
+
+def _jpeg(color: str, size: tuple[int, int] = (1024, 768)) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, format="JPEG")
+    return output.getvalue()
+
+
+RED = _jpeg("red")
+BLUE = _jpeg("blue")
+
+
+def _image(url: str, activity_id: int, date: datetime) -> dict:
+    return {"url": url, "activity_id": activity_id, "date": date}
+
+
+async def _library(hass: HomeAssistant, aioresponses_mock) -> PhotoLibrary:
+    """Return a library with two photos on one activity and one on another."""
+    aioresponses_mock.get("https://example.com/a.jpg", body=RED)
+    aioresponses_mock.get("https://example.com/b.jpg", body=BLUE)
+    aioresponses_mock.get("https://example.com/c.jpg", body=RED)
+    library = PhotoLibrary(hass, "12345", "Strava: Test User")
+    await library.async_load()
+    await library.async_add(
+        [
+            _image("https://example.com/a.jpg", 1, datetime(2024, 1, 5, 9, 0)),
+            _image("https://example.com/b.jpg", 1, datetime(2024, 1, 5, 10, 0)),
+        ]
+    )
+    await library.async_add(
+        [_image("https://example.com/c.jpg", 2, datetime(2024, 2, 1, 8, 0))]
+    )
+    return library
+
+
+def _item(hass: HomeAssistant, identifier: str) -> MediaSourceItem:
+    return MediaSourceItem(hass, DOMAIN, identifier, None)
+
+
+class TestPhotoLibrary:
+    """Test PhotoLibrary."""
+
+    @pytest.mark.asyncio
+    async def test_photos_stored_once_by_content(
+        self, hass: HomeAssistant, aioresponses_mock
+    ):
+        """Test that identical photos from different URLs share one file."""
+        library = await _library(hass, aioresponses_mock)
+        red = hashlib.sha256(RED).hexdigest()
+
+        assert len(library) == 2
+        assert sorted(os.listdir(library.directory)) == sorted(
+            f"{digest}{suffix}"
+            for digest in (red, hashlib.sha256(BLUE).hexdigest())
+            for suffix in (".jpg", "_thumb.jpg")
+        )
+        with open(library.path(red), "rb") as file:
+            assert file.read() == RED
+        with Image.open(library.path(red, thumbnail=True)) as thumbnail:
+            assert max(thumbnail.size) == CONF_MEDIA_THUMBNAIL_SIZE
+        # The duplicate keeps the activity it was first seen on
+        assert library.activities() == [1]
+
+    @pytest.mark.asyncio
+    async def test_known_urls_not_downloaded_again(
+        self, hass: HomeAssistant, aioresponses_mock
+    ):
+        """Test that each photo URL is downloaded once."""
+        library = await _library(hass, aioresponses_mock)
+
+        await library.async_add(
+            [_image("https://example.com/a.jpg", 1, datetime(2024, 1, 5, 9, 0))]
+        )
+
+        assert (
+            len(aioresponses_mock.requests[("GET", URL("https://example.com/a.jpg"))])
+            == 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_download_retried_later(
+        self, hass: HomeAssistant, aioresponses_mock
+    ):
+        """Test that a failed download isn't recorded as known."""
+        aioresponses_mock.get("https://example.com/a.jpg", status=404)
+        library = PhotoLibrary(hass, "12345", "Strava: Test User")
+
+        await library.async_add(
+            [_image("https://example.com/a.jpg", 1, datetime(2024, 1, 5))]
+        )
+
+        assert len(library) == 0
+        assert library._data_to_save()["urls"] == {}
+
+    @pytest.mark.asyncio
+    async def test_browse_index_survives_restart(
+        self, hass: HomeAssistant, aioresponses_mock, hass_storage
+    ):
+        """Test that the index is saved and rebuilt on load."""
+        library = await _library(hass, aioresponses_mock)
+        await library._store.async_save(library._data_to_save())
+
+        restored = PhotoLibrary(hass, "12345", "Strava: Test User")
+        await restored.async_load()
+
+        assert restored.activities() == library.activities()
+        assert restored.months() == ["2024-01"]
+        assert restored.activity_photos(1) == library.activity_photos(1)
+        assert restored.month_photos("2024-01") == [
+            hashlib.sha256(BLUE).hexdigest(),
+            hashlib.sha256(RED).hexdigest(),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_seeded_from_camera_history(
+        self, hass: HomeAssistant, aioresponses_mock, hass_storage, tmp_path
+    ):
+        """Test that photos found before the library listened are added.
+
+        Photos still in the camera's disk cache are not downloaded again.
+        """
+        cached_url = "https://example.com/a.jpg"
+        cached_key = hashlib.md5(cached_url.encode()).hexdigest()
+        hass.config.config_dir = str(tmp_path)
+        cache_dir = hass.config.path(IMAGE_CACHE_DIR, "12345")
+        os.makedirs(cache_dir)
+        with open(os.path.join(cache_dir, f"{cached_key}.img"), "wb") as file:
+            file.write(RED)
+        aioresponses_mock.get("https://example.com/b.jpg", body=BLUE)
+        hass_storage[f"{PHOTO_URLS_STORAGE_KEY}_12345"] = {
+            "version": 1,
+            "key": f"{PHOTO_URLS_STORAGE_KEY}_12345",
+            "data": {
+                cached_key: {
+                    "url": cached_url,
+                    "activity_id": 1,
+                    "date": "2024-01-05T09:00:00",
+                },
+                "other": {
+                    "url": "https://example.com/b.jpg",
+                    "activity_id": 2,
+                    "date": "2024-02-01T08:00:00",
+                },
+                "broken": {"url": "https://example.com/c.jpg"},
+            },
+        }
+        library = PhotoLibrary(hass, "12345", "Strava: Test User")
+        await library.async_load()
+
+        await library.async_seed()
+
+        assert len(library) == 2
+        assert library.activities() == [2, 1]
+        assert hashlib.sha256(RED).hexdigest() in library
+        assert list(aioresponses_mock.requests) == [
+            ("GET", URL("https://example.com/b.jpg"))
+        ]
+
+    @pytest.mark.asyncio
+    async def test_remove_library(
+        self, hass: HomeAssistant, aioresponses_mock, hass_storage
+    ):
+        """Test that removing a library deletes its files and index."""
+        library = await _library(hass, aioresponses_mock)
+        await library._store.async_save(library._data_to_save())
+
+        await async_remove_library(hass, "12345")
+
+        assert not os.path.exists(library.directory)
+        assert f"{STORAGE_KEY}_12345" not in hass_storage
+
+
+class TestStravaMediaSource:
+    """Test StravaMediaSource."""
+
+    @pytest.mark.asyncio
+    async def test_browse(self, hass: HomeAssistant, aioresponses_mock):
+        """Test browsing by athlete, activity and month."""
+        await async_setup_component(hass, "http", {})
+        library = await _library(hass, aioresponses_mock)
+        hass.data[DATA_LIBRARIES] = {"12345": library}
+        coordinator = MagicMock()
+        coordinator.entry.unique_id = "12345"
+        coordinator.data = {"activities": [{"id": 1, "title": "Morning Run"}]}
+        hass.data[DOMAIN] = {"entry": coordinator}
+        source = await async_get_media_source(hass)
+
+        root = await source.async_browse_media(_item(hass, ""))
+        athlete = await source.async_browse_media(_item(hass, "12345"))
+        activities = await source.async_browse_media(_item(hass, "12345/activity"))
+        photos = await source.async_browse_media(_item(hass, "12345/activity/1"))
+        months = await source.async_browse_media(_item(hass, "12345/month"))
+
+        assert [child.title for child in root.children] == ["Strava: Test User"]
+        assert [child.identifier for child in athlete.children] == [
+            "12345/activity",
+            "12345/month",
+        ]
+        assert [child.title for child in activities.children] == ["Morning Run"]
+        assert photos.title == "Morning Run"
+        assert [child.title for child in photos.children] == [
+            "2024-01-05 10:00",
+            "2024-01-05 09:00",
+        ]
+        digest = hashlib.sha256(BLUE).hexdigest()
+        assert photos.children[0].identifier == f"12345/photo/{digest}"
+        assert photos.children[0].can_play
+        assert photos.children[0].thumbnail.startswith(
+            f"/api/ha_strava/photos/12345/{digest}_thumb.jpg?authSig="
+        )
+        assert [child.title for child in months.children] == ["2024-01"]
+
+    @pytest.mark.asyncio
+    async def test_resolve(self, hass: HomeAssistant, aioresponses_mock):
+        """Test resolving a photo to the URL serving it."""
+        await async_setup_component(hass, "http", {})
+        hass.data[DATA_LIBRARIES] = {"12345": await _library(hass, aioresponses_mock)}
+        source = await async_get_media_source(hass)
+        digest = hashlib.sha256(RED).hexdigest()
+
+        media = await source.async_resolve_media(_item(hass, f"12345/photo/{digest}"))
+
+        assert media.url.startswith(
+            f"/api/ha_strava/photos/12345/{digest}.jpg?authSig="
+        )
+        assert media.mime_type == "image/jpeg"
+        with pytest.raises(Unresolvable):
+            await source.async_resolve_media(_item(hass, "12345/photo/unknown"))
+        with pytest.raises(Unresolvable):
+            await source.async_browse_media(_item(hass, "99999"))
+
+
+class TestStravaPhotoView:
+    """Test StravaPhotoView."""
+
+    @pytest.mark.asyncio
+    async def test_serves_photos_from_disk(self, hass: HomeAssistant, hass_client):
+        """Test that stored photos are served and anything else is not."""
+        await async_setup_component(hass, "http", {})
+        coordinator = MagicMock()
+        coordinator.entry.unique_id = "12345"
+        coordinator.entry.title = "Strava: Test User"
+        unload = await async_setup_library(hass, coordinator)
+        library = hass.data[DATA_LIBRARIES]["12345"]
+        with aioresponses() as mocked:
+            mocked.get("https://example.com/a.jpg", body=RED)
+            await library.async_add(
+                [_image("https://example.com/a.jpg", 1, datetime(2024, 1, 5))]
+            )
+        digest = hashlib.sha256(RED).hexdigest()
+        client = await hass_client()
+
+        photo = await client.get(f"/api/ha_strava/photos/12345/{digest}.jpg")
+        thumbnail = await client.get(f"/api/ha_strava/photos/12345/{digest}_thumb.jpg")
+        other = await client.get("/api/ha_strava/photos/12345/secrets.yaml")
+        unknown = await client.get(f"/api/ha_strava/photos/99999/{digest}.jpg")
+
+        assert photo.status == 200
+        assert await photo.read() == RED
+        assert thumbnail.status == 200
+        assert len(await thumbnail.read()) < len(RED)
+        assert other.status == 404
+        assert unknown.status == 404
+        unload()
+        coordinator.photo_discovery.async_add_listener.return_value.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_signed_urls_served_without_auth_header(
+        self, hass: HomeAssistant, hass_client_no_auth
+    ):
+        """Test that the media browser's signed URLs load and bare ones don't."""
+        await async_setup_component(hass, "http", {})
+        coordinator = MagicMock()
+        coordinator.entry.unique_id = "12345"
+        coordinator.entry.title = "Strava: Test User"
+        unload = await async_setup_library(hass, coordinator)
+        await hass.async_block_till_done()
+        library = hass.data[DATA_LIBRARIES]["12345"]
+        with aioresponses() as mocked:
+            mocked.get("https://example.com/a.jpg", body=RED)
+            await library.async_add(
+                [_image("https://example.com/a.jpg", 1, datetime(2024, 1, 5))]
+            )
+        digest = hashlib.sha256(RED).hexdigest()
+        source = await async_get_media_source(hass)
+        media = await source.async_resolve_media(_item(hass, f"12345/photo/{digest}"))
+        photos = await source.async_browse_media(_item(hass, "12345/activity/1"))
+        client = await hass_client_no_auth()
+
+        photo = await client.get(media.url)
+        thumbnail = await client.get(photos.children[0].thumbnail)
+        unsigned = await client.get(f"/api/ha_strava/photos/12345/{digest}.jpg")
+
+        assert photo.status == 200
+        assert await photo.read() == RED
+        assert thumbnail.status == 200
+        assert unsigned.status == 401
+        unload()
@@ -26,6 +26,7 @@ from custom_components.ha_strava.sensor import (
 
 def _make_coordinator(athlete_title, gear_list=None):
     coordinator = MagicMock()
+    coordinator.device_infos = {}
     coordinator.data = {"activities": [], "gear": gear_list or []}
     coordinator.entry = MagicMock()
     coordinator.entry.title = athlete_title
@@ -182,6 +182,7 @@ class TestStravaRecentActivitySensor:
     def test_device_info_with_index(self):
         """Test device_info property includes correct index."""
         coordinator = MagicMock()
+        coordinator.device_infos = {}
         coordinator.entry = MagicMock()
         coordinator.entry.title = "Strava: Test User"
 
@@ -222,6 +223,7 @@ class TestStravaRecentActivityAttributeSensor:
     def test_device_info_with_index(self):
         """Test device_info property includes correct index."""
         coordinator = MagicMock()
+        coordinator.device_infos = {}
         coordinator.entry = MagicMock()
         coordinator.entry.title = "Strava: Test User"
 
@@ -357,6 +359,7 @@ class TestSensorSetupWithMultipleActivities:
 
         # Mock coordinator
         coordinator = MagicMock()
+        coordinator.device_infos = {}
         coordinator.data = {
             "activities": [
                 {"id": 1, "name": "Morning Run", "type": "Run"},
@@ -6,7 +6,7 @@ import pytest
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
-from custom_components.ha_strava import async_reload_entry, async_setup_entry
+from custom_components.ha_strava import async_setup_entry, async_update_options
 from custom_components.ha_strava.config_flow import OptionsFlowHandler
 from custom_components.ha_strava.const import (
     CONF_ACTIVITY_TYPES_TO_TRACK,
@@ -104,7 +104,7 @@ class TestOptionsFlowReload:
 
                             # Verify update listener was registered
                             mock_entry.add_update_listener.assert_called_once_with(
-                                async_reload_entry
+                                async_update_options
                             )
 
                             # Create options flow handler
@@ -0,0 +1,186 @@
+"""Test background photo discovery for ha_strava."""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ha_strava.const import CONF_PHOTOS, CONF_SENSOR_ID, DOMAIN
+from custom_components.ha_strava.coordinator import StravaDataUpdateCoordinator
+from custom_components.ha_strava.photos import STORAGE_KEY, PhotoFetchLog
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant, mock_config_entry):
+    """Return a coordinator with photos enabled and two activities."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=mock_config_entry.unique_id,
+        data=mock_config_entry.data,
+        options={CONF_PHOTOS: True},
+        title=mock_config_entry.title,
+    )
+    with patch("homeassistant.helpers.frame.report_usage"):
+        coordinator = StravaDataUpdateCoordinator(hass, entry=entry)
+    coordinator.data = {
+        "activities": [
+            {CONF_SENSOR_ID: 1, "start_date_local": datetime(2024, 1, 2)},
+            {CONF_SENSOR_ID: 2, "start_date_local": datetime(2024, 1, 1)},
+        ]
+    }
+    return coordinator
+
+
+class TestPhotoDiscovery:
+    """Test PhotoDiscovery."""
+
+    @pytest.mark.asyncio
+    async def test_photos_pushed_per_activity(
+        self, hass: HomeAssistant, coordinator, aioresponses_mock
+    ):
+        """Test that each activity's photos reach listeners as they are found."""
+        for activity_id in (1, 2):
+            aioresponses_mock.get(
+                f"https://www.strava.com/api/v3/activities/{activity_id}/photos?size=512",
+                payload=[
+                    {
+                        "created_at_local": "2024-01-01T10:00:00Z",
+                        "urls": {"512": f"https://example.com/{activity_id}.jpg"},
+                    }
+                ],
+            )
+        listener = MagicMock()
+
+        with patch(
+            "custom_components.ha_strava.coordinator.asyncio.sleep", AsyncMock()
+        ), patch.object(coordinator.oauth_session, "async_ensure_token_valid"):
+            remove = coordinator.photo_discovery.async_add_listener(listener)
+            await hass.async_block_till_done(wait_background_tasks=True)
+        remove()
+
+        assert [call.args[0][0]["url"] for call in listener.call_args_list] == [
+            "https://example.com/1.jpg",
+            "https://example.com/2.jpg",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_runs_after_each_coordinator_update(
+        self, hass: HomeAssistant, coordinator
+    ):
+        """Test that new coordinator data triggers a discovery run."""
+        coordinator._fetch_images = AsyncMock(return_value=[])
+        remove = coordinator.photo_discovery.async_add_listener(MagicMock())
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        coordinator.async_set_updated_data(coordinator.data)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        remove()
+
+        assert coordinator._fetch_images.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_requests_during_a_run_are_coalesced(
+        self, hass: HomeAssistant, coordinator
+    ):
+        """Test that updates arriving mid-run cause exactly one follow-up run."""
+        release = asyncio.Event()
+
+        async def slow_fetch(activities, on_images=None):
+            await release.wait()
+            return []
+
+        coordinator._fetch_images = AsyncMock(side_effect=slow_fetch)
+        discovery = coordinator.photo_discovery
+        remove = discovery.async_add_listener(MagicMock())
+        await asyncio.sleep(0)
+        for _ in range(3):
+            discovery.async_schedule()
+        release.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        remove()
+
+        assert coordinator._fetch_images.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stops_with_last_listener(self, hass: HomeAssistant, coordinator):
+        """Test that removing the last listener cancels and unsubscribes."""
+
+        async def never_finishes(activities, on_images=None):
+            await asyncio.Event().wait()
+
+        coordinator._fetch_images = AsyncMock(side_effect=never_finishes)
+        discovery = coordinator.photo_discovery
+        remove = discovery.async_add_listener(MagicMock())
+        await asyncio.sleep(0)
+        task = discovery._task
+
+        remove()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert task.cancelled()
+        assert discovery._unsub == []
+        coordinator.async_set_updated_data(coordinator.data)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert coordinator._fetch_images.await_count == 1
+
+
+class TestPhotoFetchLog:
+    """Test PhotoFetchLog."""
+
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, hass: HomeAssistant, hass_storage):
+        """Test that fetch times are saved and read back by a new log."""
+        fetched = datetime(2024, 1, 1, 12, 0)
+        log = PhotoFetchLog(hass, "12345")
+        await log.async_load()
+        log[1] = fetched
+        await log._store.async_save(log._data_to_save())
+
+        assert hass_storage[f"{STORAGE_KEY}_12345"]["data"] == {
+            "1": fetched.isoformat()
+        }
+        restored = PhotoFetchLog(hass, "12345")
+        await restored.async_load()
+        assert restored.get(1) == fetched
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_fetched(self, hass: HomeAssistant):
+        """Test that the log stays within its bound."""
+        log = PhotoFetchLog(hass, "12345", max_entries=2)
+        await log.async_load()
+        now = datetime.now()
+        log[1] = now
+        log[2] = now
+        log[1] = now + timedelta(hours=1)
+        log[3] = now
+
+        assert len(log) == 2
+        assert 2 not in log
+        assert 1 in log and 3 in log
+
+    @pytest.mark.asyncio
+    async def test_zero_photo_activities_skipped(
+        self, hass: HomeAssistant, coordinator, aioresponses_mock
+    ):
+        """Test that activities reporting no photos are never queried."""
+        aioresponses_mock.get(
+            "https://www.strava.com/api/v3/activities/2/photos?size=512",
+            payload=[],
+        )
+        activities = [
+            {CONF_SENSOR_ID: 1, "total_photo_count": 0},
+            {CONF_SENSOR_ID: 2, "total_photo_count": 3},
+        ]
+
+        with patch(
+            "custom_components.ha_strava.coordinator.asyncio.sleep", AsyncMock()
+        ), patch.object(coordinator.oauth_session, "async_ensure_token_valid"):
+            await coordinator._fetch_images(activities)
+
+        assert [str(key[1]) for key in aioresponses_mock.requests] == [
+            "https://www.strava.com/api/v3/activities/2/photos?size=512"
+        ]
+        assert 1 not in coordinator.image_updates
@@ -0,0 +1,57 @@
+"""Test the camera photo playlist for ha_strava."""
+
+from datetime import datetime
+
+from custom_components.ha_strava.playlist import PhotoPlaylist
+
+
+def _img(day):
+    return {"date": datetime(2024, 1, day), "url": f"u{day}", "activity_id": day}
+
+
+class TestPhotoPlaylist:
+    """Test PhotoPlaylist."""
+
+    def test_keeps_newest_photos_on_load(self):
+        """Test that loading more photos than fit keeps the newest, oldest first."""
+        playlist = PhotoPlaylist({f"k{day}": _img(day) for day in (3, 1, 4, 2)}, 3)
+
+        assert list(playlist) == ["k2", "k3", "k4"]
+        assert playlist.peek() == ("k2", _img(2))
+
+    def test_peek_and_advance_wrap(self):
+        """Test O(1) access to the current and upcoming photos."""
+        playlist = PhotoPlaylist({"a": _img(1), "b": _img(2)})
+
+        assert playlist.peek(1)[0] == "b"
+        assert playlist.peek(2)[0] == "a"
+        playlist.advance()
+        playlist.advance()
+        assert playlist.position == 0
+
+    def test_empty(self):
+        """Test an empty playlist."""
+        playlist = PhotoPlaylist()
+        playlist.advance()
+
+        assert playlist.peek() is None
+        assert playlist == {}
+
+    def test_add_overwrites_oldest_in_place(self):
+        """Test that a new photo replaces the oldest without reordering the rest."""
+        playlist = PhotoPlaylist({"a": _img(1), "b": _img(2), "c": _img(3)}, 3)
+        playlist.advance()
+
+        assert playlist.add("d", _img(4)) is True
+        assert list(playlist) == ["d", "b", "c"]
+        assert "a" not in playlist
+        # The photo on screen doesn't jump
+        assert playlist.peek()[0] == "b"
+
+    def test_add_rejects_duplicates_and_stale_photos(self):
+        """Test that known or too-old photos don't change a full playlist."""
+        playlist = PhotoPlaylist({"b": _img(2), "c": _img(3)}, 2)
+
+        assert playlist.add("b", _img(2)) is False
+        assert playlist.add("a", _img(1)) is False
+        assert playlist == {"b": _img(2), "c": _img(3)}
@@ -0,0 +1,285 @@
+"""Test adaptive rate-limit pacing for ha_strava."""
+
+import asyncio
+import time
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ha_strava.const import (
+    CONF_PHOTO_FETCH_INITIAL_LIMIT,
+    CONF_PHOTOS,
+    CONF_SENSOR_ID,
+    DOMAIN,
+)
+from custom_components.ha_strava.coordinator import StravaDataUpdateCoordinator
+from custom_components.ha_strava.ratelimit import RateLimitThrottle
+
+LATENCY = 0.1
+
+
+class _RateLimitedServer:
+    """Local stand-in for the Strava photos API that enforces its limits.
+
+    Usage starts at `used` in every window and each request adds one; once it
+    passes the short-term limit requests are refused with 429.
+    """
+
+    def __init__(self, short_limit: int, used: int = 0, window: float = 900):
+        self.short_limit = short_limit
+        self.used = used
+        self.window = window
+        self.served: Counter = Counter()
+        self.rejected = 0
+        self.server: TestServer | None = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        bucket = int(time.time() // self.window)
+        self.served[bucket] += 1
+        usage = self.used + self.served[bucket]
+        headers = {
+            "X-RateLimit-Limit": f"{self.short_limit},1000",
+            "X-RateLimit-Usage": f"{usage},{usage}",
+        }
+        await asyncio.sleep(LATENCY)
+        if usage > self.short_limit:
+            self.rejected += 1
+            return web.json_response(
+                {"message": "Rate Limit Exceeded"}, status=429, headers=headers
+            )
+        activity_id = request.match_info["activity_id"]
+        return web.json_response(
+            [
+                {
+                    "created_at_local": "2024-01-01T10:00:00Z",
+                    "urls": {"512": f"https://example.com/{activity_id}.jpg"},
+                }
+            ],
+            headers=headers,
+        )
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/api/v3/activities/{activity_id}/photos", self.handle)
+        self.server = TestServer(app, host="127.0.0.1")
+        await self.server.start_server()
+        return f"{self.server.make_url('/api/v3/activities')}/%s/photos"
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant, mock_config_entry):
+    """Return a coordinator with photos enabled."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=mock_config_entry.unique_id,
+        data=mock_config_entry.data,
+        options={CONF_PHOTOS: True},
+        title=mock_config_entry.title,
+    )
+    with patch("homeassistant.helpers.frame.report_usage"):
+        return StravaDataUpdateCoordinator(hass, entry=entry)
+
+
+async def _discover(coordinator, server: _RateLimitedServer) -> tuple[list, float]:
+    url = await server.start()
+    activities = [
+        {CONF_SENSOR_ID: activity_id}
+        for activity_id in range(1, CONF_PHOTO_FETCH_INITIAL_LIMIT + 1)
+    ]
+    try:
+        with patch(
+            "custom_components.ha_strava.coordinator._PHOTOS_URL_TEMPLATE", url
+        ), patch.object(coordinator.oauth_session, "async_ensure_token_valid"):
+            start = time.perf_counter()
+            result = await coordinator._fetch_images(activities)
+            elapsed = time.perf_counter() - start
+    finally:
+        await server.server.close()
+    return result, elapsed
+
+
+class TestRateLimitThrottle:
+    """Test RateLimitThrottle."""
+
+    def test_no_delay_before_usage_is_known(self):
+        """Test that requests go out immediately until a response is seen."""
+        assert RateLimitThrottle().delay() == 0.0
+
+    def test_no_delay_with_plenty_of_budget(self):
+        """Test that requests are not paced below the free fraction."""
+        throttle = RateLimitThrottle(clock=lambda: 0)
+        throttle.update(
+            {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "50,500"}
+        )
+
+        assert throttle.delay() == 0.0
+        assert throttle.usage == (50, 500)
+        assert throttle.limit == (200, 2000)
+
+    def test_remaining_budget_spread_over_window(self):
+        """Test that near the limit the reserve-adjusted budget is spread out."""
+        # 300 s into the 15-minute window, 600 s left
+        throttle = RateLimitThrottle(clock=lambda: 300)
+        throttle.update(
+            {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "150,500"}
+        )
+
+        # 200 - 150 - 20 reserved leaves 30 requests for 600 s
+        assert throttle.delay() == pytest.approx(20.0)
+
+    def test_out_of_budget_inside_reserve(self):
+        """Test that the reserve is left for the coordinator's refreshes."""
+        throttle = RateLimitThrottle(clock=lambda: 0)
+        throttle.update(
+            {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "180,500"}
+        )
+
+        assert throttle.delay() is None
+
+    def test_daily_limit(self):
+        """Test that an exhausted daily budget stops requests."""
+        throttle = RateLimitThrottle(clock=lambda: 0)
+        throttle.update(
+            {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "0,1990"}
+        )
+
+        assert throttle.delay() is None
+
+    def test_malformed_headers_ignored(self):
+        """Test that missing or malformed headers leave the state unchanged."""
+        throttle = RateLimitThrottle()
+        throttle.update({"X-RateLimit-Limit": "200", "X-RateLimit-Usage": "x,y"})
+        throttle.update({})
+
+        assert throttle.usage is None
+        assert throttle.delay() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_requests_sent_count_toward_usage(self):
+        """Test that requests still in flight are counted before their reply."""
+        # 200 - 178 - 20 reserved leaves 2
+        throttle = RateLimitThrottle(clock=lambda: 0)
+        throttle.update(
+            {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "178,500"}
+        )
+
+        with patch("custom_components.ha_strava.ratelimit.asyncio.sleep"):
+            async with throttle.async_slot() as first, throttle.async_slot() as second:
+                assert first and second
+                async with throttle.async_slot() as third:
+                    assert not third
+
+    @pytest.mark.asyncio
+    async def test_slot_released_when_request_fails(self):
+        """Test that a failed or cancelled request gives its slot back."""
+        throttle = RateLimitThrottle(clock=lambda: 0)
+        throttle.update(
+            {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "178,500"}
+        )
+
+        with patch("custom_components.ha_strava.ratelimit.asyncio.sleep"):
+            for error in (ValueError, asyncio.CancelledError):
+                with pytest.raises(error):
+                    async with throttle.async_slot() as allowed:
+                        assert allowed
+                        raise error
+
+            async with throttle.async_slot() as first, throttle.async_slot() as second:
+                assert first and second
+
+    @pytest.mark.asyncio
+    async def test_retries_release_one_slot(self):
+        """Test that several responses to one slot don't free other slots."""
+        throttle = RateLimitThrottle(clock=lambda: 0)
+        headers = {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "178,500"}
+        throttle.update(headers)
+
+        with patch("custom_components.ha_strava.ratelimit.asyncio.sleep"):
+            async with throttle.async_slot(), throttle.async_slot():
+                # A retried request reports its usage twice
+                throttle.update(headers)
+                throttle.update(headers)
+                async with throttle.async_slot() as allowed:
+                    assert not allowed
+
+    @pytest.mark.asyncio
+    async def test_pending_reset_by_new_window(self):
+        """Test that requests from the last window aren't counted in the next."""
+        clock = [0]
+        throttle = RateLimitThrottle(clock=lambda: clock[0])
+        throttle.update(
+            {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "178,500"}
+        )
+
+        with patch("custom_components.ha_strava.ratelimit.asyncio.sleep"):
+            async with throttle.async_slot(), throttle.async_slot():
+                clock[0] = 900
+                throttle.update(
+                    {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "178,502"}
+                )
+                async with throttle.async_slot() as allowed:
+                    assert allowed
+            # The slots taken before the window rolled over free nothing
+            async with throttle.async_slot() as first, throttle.async_slot() as second:
+                assert first and second
+                async with throttle.async_slot() as third:
+                    assert not third
+
+
+class TestAdaptivePhotoDiscovery:
+    """Benchmark photo discovery against a rate-limited local server."""
+
+    @pytest.mark.asyncio
+    async def test_fast_with_plenty_of_budget(
+        self, hass: HomeAssistant, coordinator, socket_enabled
+    ):
+        """Test that photo lists are fetched concurrently when budget allows.
+
+        The old loop paid the server latency plus a fixed 0.75 s sleep per
+        activity; the throttled pipeline must beat the bare sequential
+        latency by at least half.
+        """
+        server = _RateLimitedServer(short_limit=600)
+
+        result, elapsed = await _discover(coordinator, server)
+
+        sequential = CONF_PHOTO_FETCH_INITIAL_LIMIT * LATENCY
+        assert [img["activity_id"] for img in result] == list(
+            range(1, CONF_PHOTO_FETCH_INITIAL_LIMIT + 1)
+        )
+        assert server.rejected == 0
+        assert elapsed < sequential / 2, (
+            f"{CONF_PHOTO_FETCH_INITIAL_LIMIT / elapsed:.1f} req/s, "
+            f"sequential {1 / LATENCY:.1f} req/s"
+        )
+
+    @pytest.mark.asyncio
+    async def test_slows_and_stops_near_the_limit(
+        self, hass: HomeAssistant, coordinator, socket_enabled
+    ):
+        """Test that discovery never trips the limit and leaves the reserve.
+
+        Activities that didn't fit in the budget stay unrecorded so the next
+        run picks them up.
+        """
+        server = _RateLimitedServer(short_limit=20, used=12, window=2)
+        coordinator.rate_limit = RateLimitThrottle(window_seconds=2)
+
+        result, _ = await _discover(coordinator, server)
+
+        assert server.rejected == 0
+        assert all(
+            server.used + served <= server.short_limit - 2
+            for served in server.served.values()
+        )
+        assert 0 < len(result) < CONF_PHOTO_FETCH_INITIAL_LIMIT
+        fetched = {img["activity_id"] for img in result}
+        for activity_id in range(1, CONF_PHOTO_FETCH_INITIAL_LIMIT + 1):
+            assert (activity_id in coordinator.image_updates) == (
+                activity_id in fetched
+            )
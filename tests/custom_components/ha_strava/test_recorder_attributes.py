@@ -0,0 +1,126 @@
+"""Test that bulky activity attributes are kept out of the recorder."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockEntityPlatform
+
+from custom_components.ha_strava import async_setup_entry
+from custom_components.ha_strava.const import (
+    CONF_ATTR_KOM_SEGMENTS,
+    CONF_ATTR_POLYLINE,
+    CONF_ATTR_PR_SEGMENTS,
+    CONF_SENSOR_DATE,
+    CONF_SENSOR_ID,
+    CONF_SENSOR_TITLE,
+    DOMAIN,
+    SERVICE_GET_ACTIVITY_DETAILS,
+)
+from custom_components.ha_strava.sensor import StravaRecentActivitySensor
+
+# About the size of an hour-long ride's summary polyline
+LONG_POLYLINE = "_p~iF~ps|U_ulLnnqC_mqNvxq`@" * 100
+PR_SEGMENTS = [f"Climb number {index}" for index in range(30)]
+KOM_SEGMENTS = [f"Sprint number {index}" for index in range(5)]
+
+ACTIVITY = {
+    CONF_SENSOR_ID: 12345,
+    CONF_SENSOR_TITLE: "Morning Ride",
+    CONF_SENSOR_DATE: datetime(2024, 1, 5, 9, 0),
+    CONF_ATTR_POLYLINE: LONG_POLYLINE,
+    CONF_ATTR_PR_SEGMENTS: PR_SEGMENTS,
+    CONF_ATTR_KOM_SEGMENTS: KOM_SEGMENTS,
+}
+
+
+async def _setup(hass: HomeAssistant, mock_config_entry, mock_coordinator) -> None:
+    mock_coordinator.data = {"activities": [ACTIVITY]}
+    with patch(
+        "custom_components.ha_strava.StravaDataUpdateCoordinator",
+        return_value=mock_coordinator,
+    ):
+        with patch(
+            "custom_components.ha_strava.renew_webhook_subscription",
+            new_callable=AsyncMock,
+        ):
+            with patch.object(hass, "http", MagicMock()):
+                with patch.object(
+                    hass.config_entries,
+                    "async_forward_entry_setups",
+                    new_callable=AsyncMock,
+                ):
+                    await async_setup_entry(hass, mock_config_entry)
+
+
+class TestUnrecordedAttributes:
+    """Test the recorded size of activity sensor states."""
+
+    @pytest.mark.asyncio
+    async def test_recorded_attributes_shrink(self, hass: HomeAssistant):
+        """Test that polylines and segment lists are left out of the database."""
+        coordinator = MagicMock()
+        coordinator.entry.title = "Strava: Test User"
+        coordinator.data = {"activities": [ACTIVITY]}
+        sensor = StravaRecentActivitySensor(coordinator, "12345", 0)
+        await MockEntityPlatform(hass).async_add_entities([sensor])
+        state = hass.states.get(sensor.entity_id)
+        event = Event(EVENT_STATE_CHANGED, {"new_state": state})
+
+        recorded = StateAttributes.shared_attrs_bytes_from_event(event, None)
+        with patch.dict(state.state_info, {"unrecorded_attributes": frozenset()}):
+            unfiltered = StateAttributes.shared_attrs_bytes_from_event(event, None)
+
+        # The attributes are still on the live state
+        assert state.attributes[CONF_ATTR_POLYLINE] == LONG_POLYLINE
+        assert state.attributes[CONF_ATTR_PR_SEGMENTS] == PR_SEGMENTS
+        assert LONG_POLYLINE.encode() not in recorded
+        assert b"Climb number" not in recorded
+        assert len(recorded) * 10 < len(
+            unfiltered
+        ), f"recorded {len(recorded)} bytes per state, {len(unfiltered)} before"
+
+
+class TestGetActivityDetailsService:
+    """Test the get_activity_details service."""
+
+    @pytest.mark.asyncio
+    async def test_returns_unrecorded_attributes(
+        self, hass: HomeAssistant, mock_config_entry, mock_coordinator
+    ):
+        """Test that the service returns the polyline and segment names."""
+        await _setup(hass, mock_config_entry, mock_coordinator)
+
+        result = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_ACTIVITY_DETAILS,
+            {"activity_id": "12345"},
+            blocking=True,
+            return_response=True,
+        )
+
+        assert result == {
+            CONF_ATTR_POLYLINE: LONG_POLYLINE,
+            CONF_ATTR_PR_SEGMENTS: PR_SEGMENTS,
+            CONF_ATTR_KOM_SEGMENTS: KOM_SEGMENTS,
+        }
+
+    @pytest.mark.asyncio
+    async def test_unknown_activity(
+        self, hass: HomeAssistant, mock_config_entry, mock_coordinator
+    ):
+        """Test that an untracked activity raises ServiceValidationError."""
+        await _setup(hass, mock_config_entry, mock_coordinator)
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_GET_ACTIVITY_DETAILS,
+                {"activity_id": "99999"},
+                blocking=True,
+                return_response=True,
+            )
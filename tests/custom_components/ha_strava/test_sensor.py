@@ -13,11 +13,18 @@ from custom_components.ha_strava.const import (
     CONF_ACTIVITY_TYPES_TO_TRACK,
     CONF_ATTR_ACTIVITY_ID,
     CONF_ATTR_KOM_SEGMENTS,
+    CONF_ATTR_METRICS,
     CONF_ATTR_PR_SEGMENTS,
+    CONF_ATTRIBUTE_SENSORS_TO_CREATE,
+    CONF_COMPACT_SENSORS,
+    CONF_CURVES,
     CONF_DISTANCE_UNIT_OVERRIDE,
     CONF_DISTANCE_UNIT_OVERRIDE_DEFAULT,
     CONF_DISTANCE_UNIT_OVERRIDE_IMPERIAL,
     CONF_DISTANCE_UNIT_OVERRIDE_METRIC,
+    CONF_NUM_RECENT_ACTIVITIES,
+    CONF_SENSOR_DATE,
+    CONF_SENSOR_DISTANCE,
     CONF_SENSOR_PR_COUNT,
     DOMAIN,
 )
@@ -25,7 +32,9 @@ from custom_components.ha_strava.sensor import (
     StravaActivityGearSensor,
     StravaActivityMetricSensor,
     StravaActivityTypeSensor,
+    StravaRecentActivitySensor,
     StravaSummaryStatsSensor,
+    _is_metric_entry,
     async_setup_entry,
 )
 
@@ -771,7 +780,7 @@ class TestStravaSummaryStatsSensor:
 
     @pytest.mark.asyncio
     async def test_is_metric_from_options_metric(self, hass: HomeAssistant):
-        """Test _is_metric() returns True when metric is configured in options."""
+        """Test _is_metric_entry() returns True when metric is configured in options."""
         summary_stats = {
             "ytd_run_totals": {
                 "distance": 5000.0,
@@ -797,11 +806,11 @@ class TestStravaSummaryStatsSensor:
             athlete_id="12345",
         )
 
-        assert sensor._is_metric() is True
+        assert _is_metric_entry(sensor.hass, coordinator.entry) is True
 
     @pytest.mark.asyncio
     async def test_is_metric_from_data_metric(self, hass: HomeAssistant):
-        """Test _is_metric() returns True when metric is configured in data."""
+        """Test _is_metric_entry() returns True when metric is configured in data."""
         summary_stats = {
             "ytd_run_totals": {
                 "distance": 5000.0,
@@ -827,11 +836,11 @@ class TestStravaSummaryStatsSensor:
             athlete_id="12345",
         )
 
-        assert sensor._is_metric() is True
+        assert _is_metric_entry(sensor.hass, coordinator.entry) is True
 
     @pytest.mark.asyncio
     async def test_is_metric_from_options_imperial(self, hass: HomeAssistant):
-        """Test _is_metric() returns False when imperial is configured in options."""
+        """Test _is_metric_entry() is False when imperial is set in options."""
         summary_stats = {
             "ytd_run_totals": {
                 "distance": 5000.0,
@@ -857,11 +866,11 @@ class TestStravaSummaryStatsSensor:
             athlete_id="12345",
         )
 
-        assert sensor._is_metric() is False
+        assert _is_metric_entry(sensor.hass, coordinator.entry) is False
 
     @pytest.mark.asyncio
     async def test_is_metric_from_data_imperial(self, hass: HomeAssistant):
-        """Test _is_metric() returns False when imperial is configured in data."""
+        """Test _is_metric_entry() returns False when imperial is configured in data."""
         summary_stats = {
             "ytd_run_totals": {
                 "distance": 5000.0,
@@ -887,11 +896,11 @@ class TestStravaSummaryStatsSensor:
             athlete_id="12345",
         )
 
-        assert sensor._is_metric() is False
+        assert _is_metric_entry(sensor.hass, coordinator.entry) is False
 
     @pytest.mark.asyncio
     async def test_is_metric_from_options_default(self):
-        """Test _is_metric() uses HA system units when default is configured in options."""
+        """Test _is_metric_entry() uses HA units when default is set in options."""
         mock_hass = MagicMock()
         mock_hass.config.units = METRIC_SYSTEM
         summary_stats = {
@@ -920,11 +929,11 @@ class TestStravaSummaryStatsSensor:
         )
         sensor.hass = mock_hass
 
-        assert sensor._is_metric() is True
+        assert _is_metric_entry(sensor.hass, coordinator.entry) is True
 
     @pytest.mark.asyncio
     async def test_is_metric_from_data_default(self):
-        """Test _is_metric() uses HA system units when default is configured in data."""
+        """Test _is_metric_entry() uses HA units when default is set in data."""
         mock_hass = MagicMock()
         mock_hass.config.units = METRIC_SYSTEM
         summary_stats = {
@@ -953,11 +962,11 @@ class TestStravaSummaryStatsSensor:
         )
         sensor.hass = mock_hass
 
-        assert sensor._is_metric() is True
+        assert _is_metric_entry(sensor.hass, coordinator.entry) is True
 
     @pytest.mark.asyncio
     async def test_is_metric_no_config_fallback(self):
-        """Test _is_metric() falls back to HA system units when no config is set."""
+        """Test _is_metric_entry() falls back to HA units when nothing is set."""
         mock_hass = MagicMock()
         mock_hass.config.units = METRIC_SYSTEM
         summary_stats = {
@@ -984,13 +993,13 @@ class TestStravaSummaryStatsSensor:
         )
         sensor.hass = mock_hass
 
-        assert sensor._is_metric() is True
+        assert _is_metric_entry(sensor.hass, coordinator.entry) is True
 
     @pytest.mark.asyncio
     async def test_is_metric_options_takes_precedence_over_data(
         self, hass: HomeAssistant
     ):
-        """Test _is_metric() prioritizes options over data when both are set."""
+        """Test _is_metric_entry() prioritizes options over data when both are set."""
         summary_stats = {
             "ytd_run_totals": {
                 "distance": 5000.0,
@@ -1020,7 +1029,7 @@ class TestStravaSummaryStatsSensor:
         )
 
         # Options should take precedence
-        assert sensor._is_metric() is True
+        assert _is_metric_entry(sensor.hass, coordinator.entry) is True
 
     @pytest.mark.asyncio
     async def test_ytd_distance_metric_from_data(self, hass: HomeAssistant):
@@ -1123,9 +1132,10 @@ class TestSensorPlatform:
             # + recent activity sensors
             # 4 activity types × (1 main + 16 attribute + 1 gear)
             # + 35 existing summary stats + 11 weekly summary stats
+            # + 1 API status sensor
             # + 1 recent activity device (1 main + 16 attribute + 1 gear)
-            # = 72 + 35 + 11 + 18 = 136 sensors total
-            expected_sensor_count = 136
+            # = 72 + 35 + 11 + 1 + 18 = 137 sensors total
+            expected_sensor_count = 137
             assert len(call_args) == expected_sensor_count
 
             weekly_sensors = [
@@ -1153,6 +1163,114 @@ class TestSensorPlatform:
             assert "StravaRecentActivityDateSensor" in sensor_types
             assert "StravaRecentActivityMetricSensor" in sensor_types
 
+    @pytest.mark.asyncio
+    async def test_async_setup_entry_selected_attribute_sensors(
+        self, hass: HomeAssistant
+    ):
+        """Test that only the selected attribute sensors are built."""
+        config_entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id="12345",
+            data={
+                CONF_CLIENT_ID: "test_client_id",
+                CONF_CLIENT_SECRET: "test_client_secret",
+            },
+            options={
+                CONF_ACTIVITY_TYPES_TO_TRACK: ["Run", "Ride"],
+                CONF_NUM_RECENT_ACTIVITIES: 3,
+                CONF_ATTRIBUTE_SENSORS_TO_CREATE: [
+                    CONF_SENSOR_DISTANCE,
+                    CONF_SENSOR_DATE,
+                ],
+            },
+            title="Strava: Test User",
+        )
+        coordinator = MagicMock()
+        coordinator.data = {"activities": []}
+        hass.data[DOMAIN] = {config_entry.entry_id: coordinator}
+        async_add_entities_mock = MagicMock()
+
+        await async_setup_entry(hass, config_entry, async_add_entities_mock)
+
+        unique_ids = {
+            sensor.unique_id for sensor in async_add_entities_mock.call_args[0][0]
+        }
+        # 2 activity types and 3 recent activities, each with a main sensor,
+        # a gear sensor and the 2 selected attribute sensors
+        # + 46 summary stats + the API status sensor
+        assert len(unique_ids) == 5 * 4 + 46 + 1
+        assert "strava_12345_run_date" in unique_ids
+        assert "strava_12345_recent_3_distance" in unique_ids
+        assert "strava_12345_run_moving_time" not in unique_ids
+        assert "strava_12345_recent_device_info" not in unique_ids
+
+    @pytest.mark.asyncio
+    async def test_async_setup_entry_compact_sensors(self, hass: HomeAssistant):
+        """Test that compact mode builds one sensor per activity device."""
+        config_entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id="12345",
+            data={
+                CONF_CLIENT_ID: "test_client_id",
+                CONF_CLIENT_SECRET: "test_client_secret",
+            },
+            options={
+                CONF_ACTIVITY_TYPES_TO_TRACK: ["Run", "Ride"],
+                CONF_NUM_RECENT_ACTIVITIES: 3,
+                CONF_COMPACT_SENSORS: True,
+            },
+            title="Strava: Test User",
+        )
+        coordinator = MagicMock()
+        coordinator.data = {"activities": []}
+        hass.data[DOMAIN] = {config_entry.entry_id: coordinator}
+        async_add_entities_mock = MagicMock()
+
+        await async_setup_entry(hass, config_entry, async_add_entities_mock)
+
+        sensor_types = [
+            type(sensor).__name__ for sensor in async_add_entities_mock.call_args[0][0]
+        ]
+        # 2 activity sensors + 3 recent activity sensors
+        # + 46 summary stats + the API status sensor
+        assert len(sensor_types) == 5 + 46 + 1
+        assert sensor_types.count("StravaActivityTypeSensor") == 2
+        assert sensor_types.count("StravaRecentActivitySensor") == 3
+        assert "StravaActivityMetricSensor" not in sensor_types
+        assert "StravaRecentActivityGearSensor" not in sensor_types
+
+    @pytest.mark.asyncio
+    async def test_async_setup_entry_curve_sensors(self, hass: HomeAssistant):
+        """Test that curve sensors are only built when curves are enabled."""
+        config_entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id="12345",
+            data={
+                CONF_CLIENT_ID: "test_client_id",
+                CONF_CLIENT_SECRET: "test_client_secret",
+            },
+            options={
+                CONF_ACTIVITY_TYPES_TO_TRACK: [],
+                CONF_COMPACT_SENSORS: True,
+                CONF_CURVES: True,
+            },
+            title="Strava: Test User",
+        )
+        coordinator = MagicMock()
+        coordinator.data = {"activities": []}
+        hass.data[DOMAIN] = {config_entry.entry_id: coordinator}
+        async_add_entities_mock = MagicMock()
+
+        await async_setup_entry(hass, config_entry, async_add_entities_mock)
+
+        sensor_types = [
+            type(sensor).__name__ for sensor in async_add_entities_mock.call_args[0][0]
+        ]
+        # 1 recent activity sensor + 46 summary stats + 4 curve sensors
+        # + the API status sensor
+        assert len(sensor_types) == 1 + 46 + 4 + 1
+        assert sensor_types.count("StravaCurveSensor") == 4
+
     @pytest.mark.asyncio
     async def test_async_setup_entry_with_activity_types(
         self, hass: HomeAssistant, mock_config_entry
@@ -1288,8 +1406,9 @@ class TestSensorPlatform:
 
         # Should only create summary stats sensors + recent activity sensors (no activity type sensors)
         # 35 existing summary stats + 11 weekly summary stats
-        # + 1 recent activity device (1 main + 16 attribute + 1 gear) = 35 + 11 + 18 = 64 sensors
-        expected_sensor_count = 64
+        # + 1 API status sensor
+        # + 1 recent activity device (1 main + 16 attribute + 1 gear) = 35 + 11 + 1 + 18 = 65 sensors
+        expected_sensor_count = 65
         assert len(call_args) == expected_sensor_count
 
         # Verify no activity type sensors are created
@@ -1432,8 +1551,10 @@ class TestStravaActivityGearSensor:
             athlete_id="12345",
         )
 
-        # Mock the _is_metric method to return True
-        sensor._is_metric = MagicMock(return_value=True)
+        coordinator.entry.options = {
+            CONF_DISTANCE_UNIT_OVERRIDE: CONF_DISTANCE_UNIT_OVERRIDE_METRIC
+        }
+        coordinator.entry.data = {}
 
         attributes = sensor.extra_state_attributes
         assert isinstance(attributes, dict)
@@ -1518,8 +1639,9 @@ class TestStravaActivityGearSensor:
 
         # Should only create summary stats sensors + recent activity sensors (no activity type sensors)
         # 35 existing summary stats + 11 weekly summary stats
-        # + 1 recent activity device (1 main + 16 attribute + 1 gear) = 35 + 11 + 18 = 64 sensors
-        expected_sensor_count = 64
+        # + 1 API status sensor
+        # + 1 recent activity device (1 main + 16 attribute + 1 gear) = 35 + 11 + 1 + 18 = 65 sensors
+        expected_sensor_count = 65
         assert len(call_args) == expected_sensor_count
 
         # Verify no activity type sensors are created
@@ -1559,9 +1681,10 @@ class TestStravaActivityGearSensor:
 
         # Should create sensors for Run and Swim (2 activity types × 18 sensors each)
         # + 35 existing summary stats + 11 weekly summary stats
+        # + 1 API status sensor
         # + 1 recent activity device (18 sensors)
-        # = 36 + 35 + 11 + 18 = 100 sensors
-        expected_sensor_count = 100
+        # = 36 + 35 + 11 + 1 + 18 = 101 sensors
+        expected_sensor_count = 101
         assert len(call_args) == expected_sensor_count
 
         # Verify activity type sensors are created for Run and Swim
@@ -1569,3 +1692,82 @@ class TestStravaActivityGearSensor:
         assert "strava_12345_run" in sensor_unique_ids
         assert "strava_12345_swim" in sensor_unique_ids
         assert "strava_12345_ride" not in sensor_unique_ids  # Not selected
+
+
+class TestCompactSensors:
+    """Test the compact metrics payload of the main activity sensors."""
+
+    @pytest.fixture
+    def sensor(self, hass: HomeAssistant):
+        """Return a compact recent activity sensor with metric units."""
+        coordinator = MagicMock()
+        coordinator.entry.title = "Strava: Test User"
+        coordinator.entry.options = {
+            CONF_DISTANCE_UNIT_OVERRIDE: CONF_DISTANCE_UNIT_OVERRIDE_METRIC,
+            CONF_COMPACT_SENSORS: True,
+            CONF_ATTRIBUTE_SENSORS_TO_CREATE: [
+                CONF_SENSOR_DISTANCE,
+                "pace",
+                "device_info",
+                "kudos",
+            ],
+        }
+        coordinator.data = {
+            "activities": [
+                {
+                    "id": 1,
+                    "title": "Morning Run",
+                    "sport_type": "Run",
+                    "distance": 5000.0,
+                    "moving_time": 1500,
+                    "device_name": "Garmin Forerunner 945",
+                    "gear_name": "Running Shoes",
+                    "kudos": -1,
+                }
+            ]
+        }
+        sensor = StravaRecentActivitySensor(coordinator, "12345", 0)
+        sensor.hass = hass
+        return sensor
+
+    def test_metrics_payload(self, sensor):
+        """Test that metrics are unit converted like the metric sensors."""
+        assert sensor.extra_state_attributes[CONF_ATTR_METRICS] == {
+            "distance": {"value": 5.0, "unit": "km"},
+            "pace": {"value": 5.0, "unit": "min/km"},
+            "device_info": {"value": "Garmin Forerunner 945", "unit": None},
+            "kudos": {"value": None, "unit": None},
+            "gear_name": {"value": "Running Shoes", "unit": None},
+        }
+
+    def test_compact_mode_follows_options(self, sensor):
+        """Test that compact mode and its metrics can be changed live."""
+        options = sensor.coordinator.entry.options
+
+        options[CONF_COMPACT_SENSORS] = False
+        assert CONF_ATTR_METRICS not in sensor.extra_state_attributes
+
+        options[CONF_COMPACT_SENSORS] = True
+        options[CONF_ATTRIBUTE_SENSORS_TO_CREATE] = [CONF_SENSOR_DISTANCE]
+        assert sensor.extra_state_attributes[CONF_ATTR_METRICS] == {
+            "distance": {"value": 5.0, "unit": "km"},
+            "gear_name": {"value": "Running Shoes", "unit": None},
+        }
+
+    def test_metrics_computed_once_per_update(self, sensor):
+        """Test that the payload is only rebuilt after a coordinator update."""
+        with patch(
+            "custom_components.ha_strava.sensor._compact_metrics",
+            return_value={},
+        ) as compact_metrics:
+            sensor.extra_state_attributes
+            sensor.extra_state_attributes
+            assert compact_metrics.call_count == 1
+
+            with patch(
+                "homeassistant.helpers.update_coordinator.CoordinatorEntity"
+                "._handle_coordinator_update"
+            ):
+                sensor._handle_coordinator_update()
+            sensor.extra_state_attributes
+            assert compact_metrics.call_count == 2
@@ -0,0 +1,305 @@
+"""Test the activity spatial index and find_activities_near service for ha_strava."""
+
+import random
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.ha_strava import (
+    StravaWebhookView,
+    async_setup_entry,
+    async_unload_entry,
+)
+from custom_components.ha_strava.const import (
+    CONF_ATTR_END_LATLONG,
+    CONF_ATTR_SPORT_TYPE,
+    CONF_ATTR_START_LATLONG,
+    CONF_SENSOR_DATE,
+    CONF_SENSOR_ID,
+    CONF_SENSOR_TITLE,
+    DOMAIN,
+    SERVICE_FIND_ACTIVITIES_NEAR,
+)
+from custom_components.ha_strava.spatial import ActivitySpatialIndex, haversine_meters
+
+LONDON = (51.5074, -0.1278)
+
+
+def _activity(activity_id, start, end=None, title="Run"):
+    return {
+        CONF_SENSOR_ID: activity_id,
+        CONF_SENSOR_TITLE: title,
+        CONF_ATTR_SPORT_TYPE: "Run",
+        CONF_SENSOR_DATE: datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc),
+        CONF_ATTR_START_LATLONG: list(start) if start else None,
+        CONF_ATTR_END_LATLONG: list(end or start) if (end or start) else None,
+    }
+
+
+class TestHaversine:
+    """Test the haversine distance helper."""
+
+    def test_zero_distance(self):
+        """Test that identical points are 0 m apart."""
+        assert haversine_meters(*LONDON, *LONDON) == 0
+
+    def test_one_degree_latitude(self):
+        """Test that one degree of latitude is roughly 111 km."""
+        assert haversine_meters(0, 0, 1, 0) == pytest.approx(111_195, rel=1e-3)
+
+
+class TestActivitySpatialIndex:
+    """Test ActivitySpatialIndex behaviour."""
+
+    def test_query_returns_nearest_first(self):
+        """Test that matches are sorted by distance and filtered by radius."""
+        index = ActivitySpatialIndex()
+        index.update(
+            [
+                _activity(1, (51.5080, -0.1278)),  # ~67 m
+                _activity(2, (51.5075, -0.1278)),  # ~11 m
+                _activity(3, (51.6000, -0.1278)),  # ~10 km
+            ]
+        )
+
+        results = index.query(*LONDON, 500)
+
+        assert [r["activity_id"] for r in results] == [2, 1]
+        assert results[0]["title"] == "Run"
+        assert results[0]["point"] == "start"
+
+    def test_query_end_point(self):
+        """Test that end-point queries ignore start points."""
+        index = ActivitySpatialIndex()
+        index.upsert(_activity(1, (40.0, -3.0), end=LONDON))
+
+        assert index.query(*LONDON, 100, point="start") == []
+        results = index.query(*LONDON, 100, point="end")
+        assert [r["activity_id"] for r in results] == [1]
+        assert results[0]["point"] == "end"
+
+    def test_query_any_reports_activity_once(self):
+        """Test that 'any' yields each activity once with its closer point."""
+        index = ActivitySpatialIndex()
+        index.upsert(_activity(1, (51.5080, -0.1278), end=LONDON))
+
+        results = index.query(*LONDON, 500, point="any")
+
+        assert len(results) == 1
+        assert results[0]["point"] == "end"
+        assert results[0]["distance_m"] == 0
+
+    def test_activities_without_latlng_are_not_matched(self):
+        """Test that indoor activities (no latlng) are indexed but never matched."""
+        index = ActivitySpatialIndex()
+        index.upsert(_activity(1, None))
+
+        assert 1 in index
+        assert index.query(*LONDON, 100_000, point="any") == []
+
+    def test_upsert_moves_point_between_cells(self):
+        """Test that a changed start point is re-bucketed."""
+        index = ActivitySpatialIndex()
+        index.upsert(_activity(1, LONDON))
+        assert index.upsert(_activity(1, (48.8566, 2.3522))) is True
+
+        assert index.query(*LONDON, 1000) == []
+        assert len(index.query(48.8566, 2.3522, 1000)) == 1
+
+    def test_upsert_unchanged_points_returns_false(self):
+        """Test that re-upserting identical points is a no-op but refreshes the title."""
+        index = ActivitySpatialIndex()
+        index.upsert(_activity(1, LONDON))
+
+        assert index.upsert(_activity(1, LONDON, title="Renamed")) is False
+        assert index.query(*LONDON, 10)[0]["title"] == "Renamed"
+
+    def test_update_keeps_activities_missing_from_batch(self):
+        """Test that older activities stay indexed after leaving the batch."""
+        index = ActivitySpatialIndex()
+        index.update([_activity(1, LONDON)])
+        index.update([_activity(2, LONDON)])
+
+        assert len(index) == 2
+
+    def test_remove(self):
+        """Test that removed activities are no longer returned."""
+        index = ActivitySpatialIndex()
+        index.upsert(_activity(1, LONDON))
+        index.remove(1)
+
+        assert 1 not in index
+        assert index.query(*LONDON, 10) == []
+
+    def test_large_radius_crosses_many_cells(self):
+        """Test that a radius spanning thousands of cells still finds matches."""
+        index = ActivitySpatialIndex()
+        index.upsert(_activity(1, (48.8566, 2.3522)))
+
+        results = index.query(*LONDON, 400_000)
+
+        assert [r["activity_id"] for r in results] == [1]
+
+    def test_10k_activities_matches_brute_force(self):
+        """Test the index against a linear scan over 10k activities."""
+        rng = random.Random(42)
+        activities = [
+            _activity(
+                i,
+                (
+                    LONDON[0] + rng.uniform(-0.5, 0.5),
+                    LONDON[1] + rng.uniform(-0.5, 0.5),
+                ),
+            )
+            for i in range(10_000)
+        ]
+        index = ActivitySpatialIndex()
+        assert index.update(activities) == 10_000
+
+        for radius in (250, 1000, 5000):
+            expected = sorted(
+                (
+                    haversine_meters(*LONDON, *a[CONF_ATTR_START_LATLONG]),
+                    a[CONF_SENSOR_ID],
+                )
+                for a in activities
+                if haversine_meters(*LONDON, *a[CONF_ATTR_START_LATLONG]) <= radius
+            )
+            results = index.query(*LONDON, radius)
+            assert [r["activity_id"] for r in results] == [i for _, i in expected]
+
+        # A 1 km query should only have to examine a small fraction of the points
+        candidates = list(index._candidates(*LONDON, 1000, "start"))
+        assert len(candidates) < 200
+
+
+class TestFindActivitiesNearService:
+    """Test find_activities_near service registration and handling."""
+
+    async def _setup(self, hass, mock_config_entry, mock_coordinator):
+        with patch(
+            "custom_components.ha_strava.StravaDataUpdateCoordinator",
+            return_value=mock_coordinator,
+        ):
+            with patch(
+                "custom_components.ha_strava.renew_webhook_subscription",
+                new_callable=AsyncMock,
+            ):
+                with patch.object(hass, "http", MagicMock()):
+                    with patch.object(
+                        hass.config_entries,
+                        "async_forward_entry_setups",
+                        new_callable=AsyncMock,
+                    ):
+                        assert await async_setup_entry(hass, mock_config_entry)
+
+    @pytest.mark.asyncio
+    async def test_service_returns_nearby_activities(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that the service returns serialisable matches, nearest first."""
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        mock_coordinator.spatial_index.update(
+            [
+                _activity(12345, (51.5080, -0.1278), title="Far"),
+                _activity(67890, (51.5075, -0.1278), title="Near"),
+            ]
+        )
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        result = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_ACTIVITIES_NEAR,
+            {"latitude": LONDON[0], "longitude": LONDON[1], "radius": 500},
+            blocking=True,
+            return_response=True,
+        )
+
+        activities = result["activities"]
+        assert [a["activity_id"] for a in activities] == ["67890", "12345"]
+        assert activities[0]["title"] == "Near"
+        assert activities[0]["date"] == "2024-01-01T08:00:00+00:00"
+        assert activities[0]["distance_m"] == pytest.approx(11.1, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_service_applies_limit(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that the limit option truncates the response."""
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        mock_coordinator.spatial_index.update([_activity(i, LONDON) for i in range(10)])
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        result = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_ACTIVITIES_NEAR,
+            {"latitude": LONDON[0], "longitude": LONDON[1], "limit": 3},
+            blocking=True,
+            return_response=True,
+        )
+
+        assert len(result["activities"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_service_rejects_invalid_point(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that an unknown point value is rejected by the schema."""
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        with pytest.raises(Exception):  # voluptuous.Invalid
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_FIND_ACTIVITIES_NEAR,
+                {"latitude": LONDON[0], "longitude": LONDON[1], "point": "middle"},
+                blocking=True,
+                return_response=True,
+            )
+
+    @pytest.mark.asyncio
+    async def test_service_removed_on_last_entry_unload(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that the service is removed when the last config entry is unloaded."""
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        await self._setup(hass, mock_config_entry, mock_coordinator)
+
+        assert hass.services.has_service(DOMAIN, SERVICE_FIND_ACTIVITIES_NEAR)
+        assert await async_unload_entry(hass, mock_config_entry)
+        assert not hass.services.has_service(DOMAIN, SERVICE_FIND_ACTIVITIES_NEAR)
+
+
+class TestWebhookDelete:
+    """Test that deleted activities leave the index."""
+
+    @pytest.mark.asyncio
+    async def test_deleted_activity_not_found(
+        self, hass, mock_config_entry, mock_coordinator
+    ):
+        """Test that an activity deleted on Strava is no longer matched."""
+        mock_coordinator.invalidate_for_event = MagicMock()
+        mock_coordinator.curves = MagicMock(async_load=AsyncMock())
+        mock_coordinator.spatial_index = ActivitySpatialIndex()
+        mock_coordinator.spatial_index.update(
+            [_activity(1, LONDON), _activity(2, LONDON)]
+        )
+        mock_config_entry.add_to_hass(hass)
+        hass.data[DOMAIN] = {mock_config_entry.entry_id: mock_coordinator}
+        request = MagicMock()
+        request.json = AsyncMock(
+            return_value={
+                "object_type": "activity",
+                "object_id": 1,
+                "aspect_type": "delete",
+                "owner_id": 12345,
+            }
+        )
+
+        await StravaWebhookView(hass).post(request)
+
+        assert 1 not in mock_coordinator.spatial_index
+        assert [
+            r["activity_id"] for r in mock_coordinator.spatial_index.query(*LONDON, 10)
+        ] == [2]